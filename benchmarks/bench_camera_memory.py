@@ -0,0 +1,55 @@
+"""
+Compares the memory and construction time of Camera and CompactCamera over a whole catalog.
+
+Usage:
+    python benchmarks/bench_camera_memory.py [db_path]
+
+db_path defaults to the bundled cameras_db.db.
+"""
+import sqlite3
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from cameras_db.models.Camera import Camera
+from cameras_db.models.CompactCamera import CompactCamera
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parents[1] / "src" / "cameras_db" / "cameras_db.db"
+
+
+def load_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.execute("SELECT * FROM cameras")
+    columns = [column[0] for column in cursor.description]
+    rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    conn.close()
+    return rows
+
+
+def measure(camera_class, rows):
+    # Timed apart from tracemalloc, which slows allocations down
+    start = time.perf_counter()
+    cameras = [camera_class(**row) for row in rows]
+    elapsed = time.perf_counter() - start
+    del cameras
+
+    tracemalloc.start()
+    cameras = [camera_class(**row) for row in rows]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del cameras
+    return allocated / len(rows), elapsed / len(rows)
+
+
+def main(db_path=DEFAULT_DB_PATH):
+    rows = load_rows(db_path)
+    print(f"{len(rows)} cameras from {db_path}")
+    print(f"{'class':<16}{'bytes/camera':>14}{'us/camera':>12}")
+    for camera_class in (Camera, CompactCamera):
+        bytes_per_camera, seconds_per_camera = measure(camera_class, rows)
+        print(f"{camera_class.__name__:<16}{bytes_per_camera:>14.0f}{seconds_per_camera * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,74 @@
+"""
+Measures the import of a synthetic feed in rows per second, through the former JSON round trip with one INSERT per
+row and through the streaming, batched import of CameraDBFiller.stream_csv_and_insert. Both include building the
+full-text and B-tree indexes. Parsing alone is timed too, as the ceiling of any import.
+
+Usage:
+    python benchmarks/bench_import.py [rows] [batch_size]
+
+rows defaults to 20000 and batch_size to DEFAULT_IMPORT_BATCH_SIZE.
+"""
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from cameras_db.setup.CameraCSVProcessor import CameraCSVProcessor
+from cameras_db.setup.CameraDBFiller import CameraDBFiller, DEFAULT_IMPORT_BATCH_SIZE
+from synthetic_feed import write_feed
+
+
+def new_filler(db_path, csv_path):
+    filler = CameraDBFiller(str(db_path), "cameras", str(csv_path))
+    filler.connect_db()
+    filler.create_camera_table()
+    filler.create_child_tables()
+    return filler
+
+
+def parse_only(csv_path, db_path, batch_size):
+    for _ in CameraCSVProcessor(str(csv_path)).iter_rows():
+        pass
+
+
+def json_round_trip(csv_path, db_path, batch_size):
+    processor = CameraCSVProcessor(str(csv_path))
+    processor.open_csv()
+    camera_data = json.loads(processor.convert_to_json())
+
+    filler = new_filler(db_path, csv_path)
+    filler.create_fts_table()
+    filler.read_json_and_insert(camera_data)
+    filler.create_indexes()
+    filler.close_db()
+
+
+def streaming(csv_path, db_path, batch_size):
+    filler = new_filler(db_path, csv_path)
+    filler.stream_csv_and_insert(batch_size)
+    filler.create_fts_table()
+    filler.create_indexes()
+    filler.close_db()
+
+
+def main(rows=20000, batch_size=DEFAULT_IMPORT_BATCH_SIZE):
+    rows, batch_size = int(rows), int(batch_size)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = write_feed(Path(tmp_dir) / "feed.csv", rows)
+        print(f"{rows} rows, batches of {batch_size}")
+        print(f"{'import':<18}{'seconds':>10}{'rows/s':>12}")
+        for function in (parse_only, json_round_trip, streaming):
+            db_path = Path(tmp_dir) / f"{function.__name__}.db"
+            start = time.perf_counter()
+            # The fillers report every step, keep the table readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                function(csv_path, db_path, batch_size)
+            elapsed = time.perf_counter() - start
+            print(f"{function.__name__:<18}{elapsed:>10.2f}{rows / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
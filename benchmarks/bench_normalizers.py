@@ -0,0 +1,71 @@
+"""
+Measures the field normalizers of CameraCSVProcessor column by column, on a synthetic feed spelled like the vendor
+CSV, and the whole normalize_row per row.
+
+Usage:
+    python benchmarks/bench_normalizers.py [rows] [repeat]
+
+rows defaults to the number of cameras of the bundled database, repeat, the best of which is kept, to 5.
+"""
+import csv
+import sqlite3
+import sys
+import tempfile
+import time
+from html import unescape
+from pathlib import Path
+
+from cameras_db.setup.CameraCSVProcessor import CameraCSVProcessor, build_normalizers
+from synthetic_feed import DEFAULT_DB_PATH, write_feed
+
+
+def best_time(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(rows=None, repeat=5):
+    if rows is None:
+        with sqlite3.connect(DEFAULT_DB_PATH) as conn:
+            rows = conn.execute("SELECT COUNT(*) FROM cameras").fetchone()[0]
+    rows, repeat = int(rows), int(repeat)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = write_feed(Path(tmp_dir) / "feed.csv", rows)
+        with open(csv_path, mode="r", encoding="utf-8") as csvfile:
+            csv_rows = list(csv.DictReader(csvfile, delimiter=";"))
+
+    processor = CameraCSVProcessor(str(csv_path))
+    processor.fieldnames = [field.lower().replace(" ", "_") for field in csv_rows[0]]
+    columns, normalizers = build_normalizers(processor.fieldnames)
+    values = {
+        column: [unescape(value.strip()) if value else None for value in column_values]
+        for column, column_values in zip(columns, zip(*(row.values() for row in csv_rows)))
+    }
+
+    print(f"{rows} rows, best of {repeat}")
+    print(f"{'column':<26}{'normalizer':<22}{'us/value':>10}")
+    total = 0.0
+    for column, normalize in normalizers:
+        column_values = values[column]
+
+        def run():
+            new_row = {}
+            for value in column_values:
+                normalize(new_row, value)
+
+        elapsed = best_time(run, repeat)
+        total += elapsed
+        print(f"{column:<26}{normalize.__qualname__.split('.')[0]:<22}{elapsed / rows * 1e6:>10.2f}")
+
+    print(f"{'all normalizers':<48}{total / rows * 1e6:>10.2f}")
+    elapsed = best_time(lambda: [processor.normalize_row(row) for row in csv_rows], repeat)
+    print(f"{'normalize_row':<48}{elapsed / rows * 1e6:>10.2f}  ({rows / elapsed:.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
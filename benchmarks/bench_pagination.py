@@ -0,0 +1,51 @@
+"""
+Compares keyset pagination through CamerasController.get_page with LIMIT/OFFSET pagination, reading the first page
+and a deep page of a catalog sorted by (brand, model). The time of an OFFSET page grows with its depth, a keyset
+page reads the same rows whatever its depth.
+
+Usage:
+    python benchmarks/bench_pagination.py [catalog] [page_size] [depth]
+
+catalog is bundled, 100k or 1m as in bench_suite.py, bundled by default, page_size defaults to 50 and depth, the
+number of the deep page, to 1000 or the last page.
+"""
+import sys
+
+from bench_suite import DEFAULT_CACHE_DIR, best_time, catalog_path
+from cameras_db.controllers import CamerasController
+
+REPEAT = 5
+
+
+def main(catalog="bundled", page_size=50, depth=1000):
+    page_size, depth = int(page_size), int(depth)
+    controller = CamerasController(str(catalog_path(catalog, DEFAULT_CACHE_DIR)))
+    try:
+        count = controller.conn.execute("SELECT COUNT(*) FROM cameras").fetchone()[0]
+        depth = max(1, min(depth, (count - 1) // page_size))
+        print(f"{count} cameras, pages of {page_size}, deep page {depth}")
+
+        # The token of the deep page, from the last camera of the page before it
+        page = controller.get_page(limit=page_size * (depth - 1)) if depth > 1 else None
+        token = page.next_token if page is not None else None
+
+        offset_query = "SELECT cameras.* FROM cameras ORDER BY brand, model, rowid LIMIT ? OFFSET ?"
+        runs = (
+            ("keyset, first page", lambda: len(controller.get_page(limit=page_size))),
+            ("keyset, deep page", lambda: len(controller.get_page(limit=page_size, after=token))),
+            ("offset, first page", lambda: len(controller.fetch_cameras(offset_query, [page_size, 0]))),
+            (
+                "offset, deep page",
+                lambda: len(controller.fetch_cameras(offset_query, [page_size, page_size * (depth - 1)])),
+            ),
+        )
+        print(f"{'pagination':<22}{'ms':>10}{'rows':>8}")
+        for name, function in runs:
+            seconds, rows = best_time(function, REPEAT)
+            print(f"{name:<22}{seconds * 1000:>10.3f}{rows:>8}")
+    finally:
+        controller.close()
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,56 @@
+"""
+Measures CSV normalization throughput in rows per second, serially with CameraCSVProcessor.iter_rows and across
+processes with CameraCSVProcessor.iter_rows_parallel for several worker counts, on a synthetic feed.
+
+Usage:
+    python benchmarks/bench_parse.py [rows] [workers,...] [chunk_size]
+
+rows defaults to 50000, workers to 1,2,4 and the CPU count, and chunk_size to DEFAULT_CHUNK_SIZE.
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from cameras_db.setup.CameraCSVProcessor import CameraCSVProcessor, DEFAULT_CHUNK_SIZE
+from synthetic_feed import write_feed
+
+
+def consume(rows):
+    count = 0
+    for _ in rows:
+        count += 1
+    return count
+
+
+def main(rows=50000, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    rows, chunk_size = int(rows), int(chunk_size)
+    worker_counts = (
+        [int(count) for count in workers.split(",")] if workers
+        else sorted({1, 2, 4, os.cpu_count() or 1})
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = str(write_feed(Path(tmp_dir) / "feed.csv", rows))
+        size = os.path.getsize(csv_path)
+        print(f"{rows} rows, {size / 1e6:.1f} MB, chunks of {chunk_size} bytes, {os.cpu_count()} CPUs")
+        print(f"{'parser':<22}{'seconds':>10}{'rows/s':>12}{'MB/s':>8}")
+
+        runs = [("iter_rows", lambda: CameraCSVProcessor(csv_path).iter_rows())]
+        runs += [
+            (f"parallel, {count} workers", lambda count=count: CameraCSVProcessor(csv_path).iter_rows_parallel(
+                workers=count, chunk_size=chunk_size
+            ))
+            for count in worker_counts
+        ]
+        for name, rows_of in runs:
+            start = time.perf_counter()
+            count = consume(rows_of())
+            elapsed = time.perf_counter() - start
+            assert count == rows, (name, count)
+            print(f"{name:<22}{elapsed:>10.2f}{count / elapsed:>12.0f}{size / 1e6 / elapsed:>8.1f}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
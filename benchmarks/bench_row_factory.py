@@ -0,0 +1,61 @@
+"""
+Measures full-table materialization in rows per second, building Camera objects per row with an intermediate
+dict (the former row_to_camera) and with the compiled row factory of CamerasController.
+
+Usage:
+    python benchmarks/bench_row_factory.py [db_path] [repeat]
+
+db_path defaults to the bundled cameras_db.db.
+"""
+import sys
+import time
+from pathlib import Path
+
+from cameras_db.controllers import CamerasController
+from cameras_db.models.Camera import Camera
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parents[1] / "src" / "cameras_db" / "cameras_db.db"
+QUERY = "SELECT * FROM cameras"
+
+
+def dict_rows(controller):
+    controller.cursor.execute(QUERY)
+    rows = controller.cursor.fetchall()
+    columns = [column[0] for column in controller.cursor.description]
+    cameras = []
+    for row in rows:
+        row_dict = {}
+        for column_name, value in zip(columns, row):
+            row_dict[column_name] = value
+        cameras.append(Camera(**row_dict))
+    return cameras
+
+
+def row_factory(controller):
+    return controller.fetch_cameras(QUERY, [])
+
+
+def rows_per_second(function, controller, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cameras = function(controller)
+        best = min(best, time.perf_counter() - start)
+    return len(cameras) / best
+
+
+def main(db_path=DEFAULT_DB_PATH, repeat=10):
+    controller = CamerasController.snapshot(db_path)
+    repeat = int(repeat)
+    before = rows_per_second(dict_rows, controller, repeat)
+    after = rows_per_second(row_factory, controller, repeat)
+    controller.close()
+
+    print(f"{'materialization':<20}{'rows/s':>12}")
+    print(f"{'dict per row':<20}{before:>12.0f}")
+    print(f"{'row factory':<20}{after:>12.0f}")
+    print(f"speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,59 @@
+"""
+Measures the startup cost of cameras_db in fresh interpreters: the time to `import cameras_db`, to import
+CamerasController, to create a controller over the packaged database and to run its first query, the latency a
+CLI or a worker process pays before its first answer.
+
+Usage:
+    python benchmarks/bench_startup.py [runs]
+
+runs defaults to 20, the median of every step is reported, as the first runs also pay for a cold file cache.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Run in a fresh interpreter, printing the seconds of every step as JSON
+STEPS_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import cameras_db
+imported = time.perf_counter()
+from cameras_db import CamerasController
+controller_imported = time.perf_counter()
+controller = CamerasController()
+created = time.perf_counter()
+controller.get_by_field("brand", "Canon")
+queried = time.perf_counter()
+print(json.dumps({
+    "import cameras_db": imported - start,
+    "import CamerasController": controller_imported - imported,
+    "CamerasController()": created - controller_imported,
+    "first query": queried - created,
+    "total": queried - start,
+}))
+"""
+
+
+def run_steps():
+    output = subprocess.run(
+        [sys.executable, "-c", STEPS_SCRIPT],
+        check=True,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    ).stdout
+    return json.loads(output)
+
+
+def main(runs=20):
+    runs = [run_steps() for _ in range(int(runs))]
+    print(f"{'step':<28}{'median ms':>10}{'min ms':>10}")
+    for step in runs[0]:
+        seconds = [run[step] for run in runs]
+        print(f"{step:<28}{statistics.median(seconds) * 1000:>10.2f}{min(seconds) * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,253 @@
+"""
+Runs the benchmark suite: every get_by_* query of CamerasController, full-table materialization and the
+CSV to database import of setup_db.main_workflow, against the bundled cameras_db.db and against synthetic
+catalogs of 100k and 1M cameras. Results are written as JSON and compared with a baseline, a former result file,
+flagging the benchmarks that got slower.
+
+Synthetic catalogs are imported from synthetic feeds through main_workflow once and kept in the cache directory,
+under a name that changes with the schema, so later runs only time the queries.
+
+Usage:
+    python benchmarks/bench_suite.py [--catalogs bundled,100k,1m] [--import-rows 20000] [--repeat 3]
+                                     [--output results.json] [--baseline benchmarks/baseline.json]
+                                     [--tolerance 0.25] [--cache-dir DIR]
+
+Exits with status 1 when a benchmark is slower than the baseline by more than the tolerance, 0.25 being 25%.
+Fast benchmarks are called until they took half a second and timings below a millisecond are compared to the
+millisecond, as their noise is larger than any tolerance.
+Write a new baseline with --output benchmarks/baseline.json on the reference machine.
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from cameras_db import CREATE_CAMERA_TABLE_QUERY, CREATE_CAMERA_CHILD_TABLES_QUERY, CREATE_CAMERA_INDEXES_QUERY
+from cameras_db.controllers import CamerasController
+from synthetic_feed import DEFAULT_DB_PATH, write_feed
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "cameras_db" / "setup"))
+from setup_db import main_workflow  # noqa: E402, setup_db imports its siblings as top-level modules
+
+CATALOG_SIZES = {"100k": 100_000, "1m": 1_000_000}
+DEFAULT_CATALOGS = "bundled,100k,1m"
+DEFAULT_IMPORT_ROWS = 20_000
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_CACHE_DIR = Path(tempfile.gettempdir()) / "cameras_db_bench"
+# Rows materialized one at a time by the row_to_camera benchmark
+ROW_TO_CAMERA_ROWS = 10_000
+# Fast benchmarks are called until they took this many seconds, at most MAX_CALLS times, keeping the best call
+MIN_DURATION = 0.5
+MAX_CALLS = 1000
+# Timings are compared to at least this many seconds
+NOISE_FLOOR = 0.001
+
+# The name and function of every query benchmark, returning the number of rows it read
+QUERIES = (
+    ("get_by_field", lambda controller: len(controller.get_by_field("brand", "Canon"))),
+    (
+        "get_by_field[fields]",
+        lambda controller: len(controller.get_by_field("brand", "Canon", ("brand", "model"))),
+    ),
+    ("get_by_field_like", lambda controller: len(controller.get_by_field_like("model", "EOS"))),
+    (
+        "get_by_fields_like_and",
+        lambda controller: len(controller.get_by_fields_like_and({"brand": "Canon", "model": "EOS"})),
+    ),
+    (
+        "get_by_fields_like_or",
+        lambda controller: len(controller.get_by_fields_like_or({"brand": "Leica", "model": "EOS"})),
+    ),
+    (
+        "get_by_fields_with_operators",
+        lambda controller: len(
+            controller.get_by_fields_with_operators([("year", ">=", 2015), ("brand", "=", "Sony")])
+        ),
+    ),
+    ("get_by_iso_range", lambda controller: len(controller.get_by_iso_range(6400, 12800))),
+    ("get_by_storage_type", lambda controller: len(controller.get_by_storage_type("SDXC"))),
+    ("search", lambda controller: len(controller.search("canon eos", limit=100))),
+    ("get_page", lambda controller: len(controller.get_page([("brand", "=", "Canon")], limit=50))),
+    ("facets", lambda controller: uncached_facets(controller)["count"]),
+)
+
+
+def uncached_facets(controller):
+    controller.facet_cache = None
+    return controller.facets()
+
+
+def materialize_all(controller):
+    return sum(1 for _ in controller.iter_cameras("SELECT * FROM cameras", []))
+
+
+def row_to_camera(controller):
+    cursor = controller.conn.execute(f"SELECT * FROM cameras LIMIT {ROW_TO_CAMERA_ROWS}")
+    columns = [column[0] for column in cursor.description]
+    return len([CamerasController.row_to_camera(row, columns) for row in cursor])
+
+
+MATERIALIZATIONS = (
+    ("materialize_all", materialize_all),
+    ("row_to_camera", row_to_camera),
+)
+
+
+def best_time(function, repeat):
+    """
+    Returns the best time of at least `repeat` calls of `function`, repeated until they took MIN_DURATION, and
+    what the last one returned.
+    """
+    best, result, calls, total = float("inf"), None, 0, 0.0
+    while calls < repeat or (total < MIN_DURATION and calls < MAX_CALLS):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best, calls, total = min(best, elapsed), calls + 1, total + elapsed
+    return best, result
+
+
+def result(seconds, rows):
+    return {"seconds": seconds, "rows": rows, "rows_per_s": rows / seconds if seconds else None}
+
+
+def import_feed(csv_path, db_path):
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        main_workflow(str(csv_path), str(db_path), "cameras")
+
+
+def catalog_path(name, cache_dir):
+    """
+    Returns the path of a catalog, importing the synthetic ones into `cache_dir` when missing.
+    """
+    if name == "bundled":
+        return DEFAULT_DB_PATH
+
+    schema = hashlib.blake2b(
+        (CREATE_CAMERA_TABLE_QUERY + CREATE_CAMERA_CHILD_TABLES_QUERY + CREATE_CAMERA_INDEXES_QUERY).encode(),
+        digest_size=6,
+    ).hexdigest()
+    db_path = Path(cache_dir) / f"catalog_{name}_{schema}.db"
+    if not db_path.exists():
+        print(f"importing the {name} catalog into {db_path}", file=sys.stderr)
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = write_feed(Path(tmp_dir) / "feed.csv", CATALOG_SIZES[name])
+            partial_path = db_path.with_suffix(".partial")
+            import_feed(csv_path, partial_path)
+            os.replace(partial_path, db_path)
+    return db_path
+
+
+def run_catalog(name, cache_dir, repeat):
+    """
+    Returns the results of the query and materialization benchmarks over one catalog, by benchmark name.
+    """
+    results = {}
+    controller = CamerasController(str(catalog_path(name, cache_dir)))
+    try:
+        for benchmark, function in QUERIES + MATERIALIZATIONS:
+            try:
+                seconds, rows = best_time(lambda: function(controller), repeat)
+            except sqlite3.OperationalError as e:
+                results[f"{name}/{benchmark}"] = {"skipped": str(e)}
+                continue
+            results[f"{name}/{benchmark}"] = result(seconds, rows)
+    finally:
+        controller.close()
+    return results
+
+
+def run_import(rows, repeat):
+    """
+    Returns the result of importing a synthetic feed of `rows` cameras with main_workflow, indexes included.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = write_feed(Path(tmp_dir) / "feed.csv", rows)
+        db_path = Path(tmp_dir) / "cameras_db.db"
+        seconds, _ = best_time(lambda: import_feed(csv_path, db_path), repeat)
+    return {f"import/main_workflow[{rows}]": result(seconds, rows)}
+
+
+def regressions(results, baseline, tolerance):
+    """
+    Returns the (benchmark, baseline seconds, seconds) of the benchmarks slower than in `baseline` by more than
+    `tolerance`.
+    """
+    slower = []
+    for benchmark, current in results.items():
+        former = baseline.get("results", {}).get(benchmark, {})
+        if "seconds" not in current or "seconds" not in former:
+            continue
+        if max(current["seconds"], NOISE_FLOOR) > max(former["seconds"], NOISE_FLOOR) * (1 + tolerance):
+            slower.append((benchmark, former["seconds"], current["seconds"]))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Runs the cameras_db benchmark suite.")
+    parser.add_argument("--catalogs", default=DEFAULT_CATALOGS, help="bundled, 100k and 1m, comma-separated")
+    parser.add_argument("--import-rows", type=int, default=DEFAULT_IMPORT_ROWS, help="0 skips the import")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--output", help="the JSON file results are written to")
+    parser.add_argument("--baseline", help="a former JSON result file to compare with")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in filter(None, args.catalogs.split(",")):
+        if name != "bundled" and name not in CATALOG_SIZES:
+            parser.error(f"unknown catalog: {name}")
+        results.update(run_catalog(name, args.cache_dir, args.repeat))
+    if args.import_rows:
+        results.update(run_import(args.import_rows, args.repeat))
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, mode="w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    print(f"{'benchmark':<44}{'seconds':>10}{'rows':>10}{'rows/s':>12}")
+    for benchmark, current in results.items():
+        if "skipped" in current:
+            print(f"{benchmark:<44}{'skipped, ' + current['skipped']:>32}")
+        else:
+            seconds, rows, rows_per_s = current["seconds"], current["rows"], current["rows_per_s"] or 0
+            print(f"{benchmark:<44}{seconds:>10.4f}{rows:>10}{rows_per_s:>12.0f}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, mode="r", encoding="utf-8") as f:
+        slower = regressions(results, json.load(f), args.tolerance)
+    for benchmark, former, current in slower:
+        print(f"REGRESSION {benchmark}: {former:.4f}s -> {current:.4f}s ({current / former - 1:+.0%})")
+    if not slower:
+        print(f"no regression beyond {args.tolerance:.0%} against {args.baseline}")
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
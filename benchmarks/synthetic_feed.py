@@ -0,0 +1,83 @@
+"""
+Writes synthetic vendor feeds, CSV files in the format setup_db.py reads, for the import benchmarks.
+
+Rows cycle through the cameras of the bundled database, numbering the model of every repeated (brand, model) so
+that each one stays unique, and turning the stored values back into their CSV spelling.
+
+Usage:
+    python benchmarks/synthetic_feed.py csv_path [rows] [db_path]
+"""
+import csv
+import sqlite3
+import sys
+from collections import Counter
+from itertools import cycle, islice
+from pathlib import Path
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parents[1] / "src" / "cameras_db" / "cameras_db.db"
+
+# Columns computed by CameraCSVProcessor.treat_fields rather than read from the feed
+COMPUTED_COLUMNS = (
+    "sensor_size_w", "sensor_size_h", "sensor_px_w", "sensor_px_h", "weight_g", "screen_size_in", "min_shutter_s",
+    "max_shutter_s", "max_aperture_wide", "max_aperture_tele", "dimensions_w_mm", "dimensions_h_mm",
+    "dimensions_d_mm",
+)
+
+# Feed headers that do not read as their column name capitalized, with underscores as spaces
+HEADERS = {
+    "url": "URL",
+    "image_url": "Image URL",
+    "iso": "ISO",
+    "usb": "USB",
+    "hdmi": "HDMI",
+    "gps": "GPS",
+    "max_aperture": "Max. aperture",
+    "focal_length_35mm_equiv": "Focal length (35mm equiv.)",
+    "max_aperture_35mm_equiv": "Max. aperture (35mm equiv.)",
+}
+
+BOOLEAN_COLUMNS = frozenset({
+    "raw_support", "manual_focus", "aperture_priority", "shutter_priority", "built_in_flash", "external_flash",
+    "video_capture", "hdmi", "wireless",
+})
+
+
+def csv_value(column, value):
+    if value is None:
+        return ""
+    if column in BOOLEAN_COLUMNS:
+        return "Yes" if value else "No"
+    return str(value)
+
+
+def write_feed(csv_path, rows, db_path=DEFAULT_DB_PATH):
+    """
+    Writes a feed of `rows` cameras to `csv_path` and returns its path.
+    """
+    conn = sqlite3.connect(db_path)
+    cursor = conn.execute("SELECT * FROM cameras ORDER BY rowid")
+    columns = [column[0] for column in cursor.description]
+    cameras = cursor.fetchall()
+    conn.close()
+
+    feed_columns = [column for column in columns if column not in COMPUTED_COLUMNS]
+    indexes = [columns.index(column) for column in feed_columns]
+    brand_index, model_index = columns.index("brand"), columns.index("model")
+    repetitions = Counter()
+
+    with open(csv_path, mode="w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(HEADERS.get(column, column.replace("_", " ").capitalize()) for column in feed_columns)
+        for camera in islice(cycle(cameras), rows):
+            values = list(camera)
+            repetition = repetitions[values[brand_index], values[model_index]]
+            repetitions[values[brand_index], values[model_index]] += 1
+            if repetition:
+                values[model_index] = f"{values[model_index]} #{repetition}"
+            writer.writerow(csv_value(columns[index], values[index]) for index in indexes)
+    return Path(csv_path)
+
+
+if __name__ == "__main__":
+    csv_path, *args = sys.argv[1:]
+    write_feed(csv_path, *(int(arg) if index == 0 else arg for index, arg in enumerate(args)))
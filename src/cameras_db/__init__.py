@@ -1,2 +1,71 @@
-from .controllers import CamerasController
-from .constants import CREATE_CAMERA_TABLE_QUERY
+"""
+A SQLite database of DSLR and mirror-less cameras and the controllers to query it.
+
+The names below are imported lazily, on first access, so `import cameras_db` does not load sqlite3, asyncio or
+the models until they are used.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# The submodule defining every public name
+_EXPORTS = {
+    "CamerasController": ".controllers",
+    "CamerasControllerPool": ".pool",
+    "PooledCamerasController": ".pool",
+    "AsyncCamerasController": ".async_controllers",
+    "ResultCache": ".result_cache",
+    "QueryEvent": ".instrumentation",
+    "QueryMetrics": ".instrumentation",
+    "Page": ".pagination",
+    "default_db_path": ".paths",
+    "CREATE_CAMERA_TABLE_QUERY": ".constants",
+    "CAMERA_COLUMNS": ".constants",
+    "CAMERA_NUMERIC_COLUMNS": ".constants",
+    "CAMERA_COLUMN_TYPES": ".constants",
+    "CREATE_CAMERA_FTS_TABLE_QUERY": ".constants",
+    "CREATE_CAMERA_FTS_TRIGGERS_QUERY": ".constants",
+    "REBUILD_CAMERA_FTS_QUERY": ".constants",
+    "CREATE_CAMERA_CHILD_TABLES_QUERY": ".constants",
+    "REMOVE_DUPLICATE_CAMERAS_QUERY": ".constants",
+    "CREATE_CAMERA_UNIQUE_KEY_QUERY": ".constants",
+    "CREATE_CAMERA_INDEXES_QUERY": ".constants",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    # Cached as a module attribute, so __getattr__ only runs on first access
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .controllers import CamerasController
+    from .pool import CamerasControllerPool, PooledCamerasController
+    from .async_controllers import AsyncCamerasController
+    from .result_cache import ResultCache
+    from .instrumentation import QueryEvent, QueryMetrics
+    from .pagination import Page
+    from .paths import default_db_path
+    from .constants import (
+        CREATE_CAMERA_TABLE_QUERY,
+        CAMERA_COLUMNS,
+        CAMERA_NUMERIC_COLUMNS,
+        CAMERA_COLUMN_TYPES,
+        CREATE_CAMERA_FTS_TABLE_QUERY,
+        CREATE_CAMERA_FTS_TRIGGERS_QUERY,
+        REBUILD_CAMERA_FTS_QUERY,
+        CREATE_CAMERA_CHILD_TABLES_QUERY,
+        REMOVE_DUPLICATE_CAMERAS_QUERY,
+        CREATE_CAMERA_UNIQUE_KEY_QUERY,
+        CREATE_CAMERA_INDEXES_QUERY,
+    )
@@ -0,0 +1,83 @@
+from array import array
+from math import hypot, nan
+from typing import Any, Mapping, Sequence
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover, depends on the environment
+    numpy = None
+
+# Diagonal of a 36 x 24 mm full frame sensor, the reference of crop factors
+FULL_FRAME_DIAGONAL_MM = hypot(36, 24)
+
+
+def column_array(values: Sequence[Any], numeric: bool) -> Any:
+    """
+    Returns the array of one column.
+
+    With NumPy, a float64 ndarray when it is `numeric`, or else an object ndarray. Without it, an array.array("d")
+    or a tuple. NULL numbers, and text left in numeric columns by older imports such as "6,02", are NaN and
+    propagate through the sensor math below, which runs as NumPy expressions over ndarrays and as Python loops
+    over array.array.
+    """
+    if numeric:
+        values = [value if isinstance(value, (int, float)) else nan for value in values]
+        return numpy.array(values, dtype=float) if numpy is not None else array("d", values)
+    return numpy.array(values, dtype=object) if numpy is not None else tuple(values)
+
+
+def diagonal_size_mm(arrays: Mapping[str, Any]) -> Any:
+    """
+    The diagonal sizes of the sensors in millimeters, as Camera.diagonal_size_mm().
+    """
+    return _hypot(arrays["sensor_size_w"], arrays["sensor_size_h"])
+
+
+def diagonal_size_px(arrays: Mapping[str, Any]) -> Any:
+    """
+    The diagonal sizes of the sensors in pixels, as Camera.diagonal_size_px().
+    """
+    return _hypot(arrays["sensor_px_w"], arrays["sensor_px_h"])
+
+
+def pixel_pitch_um(arrays: Mapping[str, Any]) -> Any:
+    """
+    The distances between the centers of two pixels in micrometers, sensor width over pixel width.
+    """
+    return _divide(arrays["sensor_size_w"], arrays["sensor_px_w"], 1000)
+
+
+def megapixels(arrays: Mapping[str, Any]) -> Any:
+    """
+    The sensor resolutions in megapixels, from the pixel width and height.
+    """
+    if numpy is not None and isinstance(arrays["sensor_px_w"], numpy.ndarray):
+        return arrays["sensor_px_w"] * arrays["sensor_px_h"] / 1e6
+    return array("d", [width * height / 1e6 for width, height in zip(arrays["sensor_px_w"], arrays["sensor_px_h"])])
+
+
+def crop_factor(arrays: Mapping[str, Any]) -> Any:
+    """
+    The crop factors of the sensors, the full frame diagonal over their diagonal.
+    """
+    diagonals = diagonal_size_mm(arrays)
+    if numpy is not None and isinstance(diagonals, numpy.ndarray):
+        return _divide(numpy.full_like(diagonals, FULL_FRAME_DIAGONAL_MM), diagonals)
+    return _divide(array("d", [FULL_FRAME_DIAGONAL_MM]) * len(diagonals), diagonals)
+
+
+def _hypot(a: Any, b: Any) -> Any:
+    if numpy is not None and isinstance(a, numpy.ndarray):
+        return numpy.hypot(a, b)
+    return array("d", map(hypot, a, b))
+
+
+def _divide(numerators: Any, denominators: Any, scale: float = 1) -> Any:
+    # A zero denominator, as a missing sensor size stored as 0, gives NaN rather than an error or infinity
+    if numpy is not None and isinstance(numerators, numpy.ndarray):
+        result = numpy.full(numerators.shape, nan)
+        return numpy.divide(numerators * scale, denominators, out=result, where=denominators != 0)
+    return array("d", [
+        numerator * scale / denominator if denominator else nan
+        for numerator, denominator in zip(numerators, denominators)
+    ])
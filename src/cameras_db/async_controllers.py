@@ -0,0 +1,221 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from cameras_db.controllers import DEFAULT_FACET_FIELDS, DEFAULT_RANGE_FIELDS, CamerasController
+from cameras_db.instrumentation import QueryMetrics
+from cameras_db.pagination import DEFAULT_ORDER_BY, DEFAULT_PAGE_SIZE, Page
+from cameras_db.paths import default_db_path
+from cameras_db.models.Camera import Camera
+
+
+class AsyncCamerasController:
+    """
+    An asyncio front end for CamerasController.
+
+    Every query runs on a dedicated thread pool, where each worker thread keeps its own CamerasController and
+    connection, so the event loop is never blocked by `execute`, `fetchall` or building Camera objects.
+
+    Example:
+        async with AsyncCamerasController("cameras_db.db") as controller:
+            cameras = await controller.get_by_field("brand", "Canon")
+            async for camera in controller.stream("get_by_field_like", "model", ""):
+                ...
+    """
+
+    STREAMABLE_METHODS = (
+        "get_by_field",
+        "get_by_field_like",
+        "get_by_fields_like_and",
+        "get_by_fields_like_or",
+        "get_by_fields_with_operators",
+        "get_by_iso_range",
+        "get_by_storage_type",
+        "search",
+    )
+
+    def __init__(self, db_path: Optional[str] = None, max_workers: int = 4, metrics: Optional[QueryMetrics] = None):
+        self.db_path = db_path if db_path is not None else default_db_path()
+        # Shared by the controllers of every worker thread
+        self.metrics = metrics
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cameras_db")
+        self._local = threading.local()
+        self._controllers: List[CamerasController] = []
+        self._lock = threading.Lock()
+
+    def thread_controller(self) -> CamerasController:
+        """
+        Returns the CamerasController of the calling worker thread, creating it on first use.
+        """
+        controller = getattr(self._local, "controller", None)
+        if controller is None:
+            # Only used from this thread, but closed from whichever thread calls close()
+            controller = CamerasController(self.db_path, check_same_thread=False, metrics=self.metrics)
+            self._local.controller = controller
+            with self._lock:
+                self._controllers.append(controller)
+        return controller
+
+    async def run(self, method_name: str, *args, **kwargs):
+        """
+        Runs a CamerasController method on the executor and returns its result.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, lambda: getattr(self.thread_controller(), method_name)(*args, **kwargs)
+        )
+
+    async def get_by_field(
+            self, field: str, value: Union[str, int, float], fields: Optional[Sequence[str]] = None
+    ) -> List[Camera]:
+        return await self.run("get_by_field", field, value, fields=fields)
+
+    async def get_by_field_like(self, field: str, value: str, fields: Optional[Sequence[str]] = None) -> List[Camera]:
+        return await self.run("get_by_field_like", field, value, fields=fields)
+
+    async def get_by_fields_like_and(
+            self, field_value_dict: Dict[str, str], fields: Optional[Sequence[str]] = None
+    ) -> List[Camera]:
+        return await self.run("get_by_fields_like_and", field_value_dict, fields=fields)
+
+    async def get_by_fields_like_or(
+            self, field_value_dict: Dict[str, str], fields: Optional[Sequence[str]] = None
+    ) -> List[Camera]:
+        return await self.run("get_by_fields_like_or", field_value_dict, fields=fields)
+
+    async def get_by_fields_with_operators(
+            self, conditions, fields: Optional[Sequence[str]] = None, order_by: Optional[Sequence[str]] = None
+    ) -> List[Camera]:
+        return await self.run("get_by_fields_with_operators", conditions, fields=fields, order_by=order_by)
+
+    async def facets(
+            self,
+            filters=(),
+            facet_fields: Sequence[str] = DEFAULT_FACET_FIELDS,
+            range_fields: Sequence[str] = DEFAULT_RANGE_FIELDS,
+            separator: str = "AND",
+            limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        return await self.run("facets", list(filters), facet_fields, range_fields, separator, limit)
+
+    async def get_page(
+            self,
+            conditions=(),
+            order_by: Sequence[str] = DEFAULT_ORDER_BY,
+            limit: int = DEFAULT_PAGE_SIZE,
+            after: Optional[str] = None,
+            separator: str = "AND",
+            fields: Optional[Sequence[str]] = None,
+    ) -> Page:
+        return await self.run("get_page", list(conditions), order_by, limit, after, separator, fields=fields)
+
+    async def get_by_iso_range(
+            self, min_iso: Optional[int] = None, max_iso: Optional[int] = None, fields: Optional[Sequence[str]] = None
+    ) -> List[Camera]:
+        return await self.run("get_by_iso_range", min_iso, max_iso, fields=fields)
+
+    async def get_by_storage_type(self, storage_type: str, fields: Optional[Sequence[str]] = None) -> List[Camera]:
+        return await self.run("get_by_storage_type", storage_type, fields=fields)
+
+    async def search(self, text: str, limit: int = 20, fields: Optional[Sequence[str]] = None) -> List[Camera]:
+        return await self.run("search", text, limit, fields=fields)
+
+    async def resolve_many(
+            self, pairs: Iterable[Tuple[str, str]], fields: Optional[Sequence[str]] = None
+    ) -> Dict[Tuple[str, str], List[Camera]]:
+        return await self.run("resolve_many", list(pairs), fields=fields)
+
+    async def resolve_exif(
+            self,
+            make: Optional[str],
+            model: Optional[str],
+            limit: int = 5,
+            cutoff: float = 0.6,
+            fields: Optional[Sequence[str]] = None,
+    ) -> List[Camera]:
+        return await self.run("resolve_exif", make, model, limit, cutoff, fields=fields)
+
+    async def similar_to(
+            self,
+            camera,
+            k: int = 10,
+            weights: Optional[Dict[str, float]] = None,
+            fields: Optional[Sequence[str]] = None,
+    ) -> List[Camera]:
+        return await self.run("similar_to", camera, k, weights, fields=fields)
+
+    async def to_arrays(self, fields: Optional[Sequence[str]] = None, conditions=()) -> Dict[str, Any]:
+        return await self.run("to_arrays", fields, list(conditions))
+
+    async def stream(
+            self, method_name: str, *args, batch_size: int = 100, fields: Optional[Sequence[str]] = None
+    ) -> AsyncIterator[Camera]:
+        """
+        Streams the cameras returned by a CamerasController query method.
+
+        Rows are fetched lazily through the matching `iter_*` method and handed over in batches of `batch_size`,
+        going back to the event loop between batches, so a wide query neither holds up other requests nor
+        materializes all its results at once. Each stream uses its own connection.
+
+        Args:
+            method_name (str): One of STREAMABLE_METHODS.
+            *args: The arguments of that method.
+            batch_size (int): The number of cameras fetched per executor call.
+            fields (Optional[Sequence[str]]): The columns to read, every column by default.
+
+        Yields:
+            Camera: The matching cameras.
+        """
+        if method_name not in self.STREAMABLE_METHODS:
+            raise ValueError(f"{method_name} can not be streamed")
+
+        loop = asyncio.get_running_loop()
+        batches = self.stream_batches(method_name, args, batch_size, fields)
+        try:
+            while True:
+                batch = await loop.run_in_executor(self.executor, next, batches, None)
+                if batch is None:
+                    break
+                for camera in batch:
+                    yield camera
+        finally:
+            await loop.run_in_executor(self.executor, batches.close)
+
+    def stream_batches(
+            self, method_name: str, args: tuple, batch_size: int, fields: Optional[Sequence[str]]
+    ) -> Iterator[List[Camera]]:
+        """
+        Runs on the executor threads, one step at a time, on a connection owned by the stream.
+        """
+        iter_name = "iter_search" if method_name == "search" else method_name.replace("get_by_", "iter_by_", 1)
+        controller = CamerasController(self.db_path, check_same_thread=False, metrics=self.metrics)
+        try:
+            cameras = getattr(controller, iter_name)(*args, batch_size=batch_size, fields=fields)
+            batch = list(islice(cameras, batch_size))
+            while batch:
+                yield batch
+                batch = list(islice(cameras, batch_size))
+        finally:
+            controller.close()
+
+    async def close(self) -> None:
+        """
+        Waits for the running queries, then shuts the executor down and closes every connection.
+
+        Returns:
+            None
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.executor.shutdown)
+        with self._lock:
+            for controller in self._controllers:
+                controller.close()
+            self._controllers.clear()
+
+    async def __aenter__(self) -> "AsyncCamerasController":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
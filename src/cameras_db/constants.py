@@ -1,3 +1,5 @@
+import re
+
 CREATE_CAMERA_TABLE_QUERY = f"""
     CREATE TABLE cameras (
         url TEXT,
@@ -50,6 +52,107 @@ CREATE_CAMERA_TABLE_QUERY = f"""
         sensor_size_w REAL,
         sensor_size_h REAL,
         sensor_px_w INTEGER,
-        sensor_px_h INTEGER
+        sensor_px_h INTEGER,
+        weight_g REAL,
+        screen_size_in REAL,
+        min_shutter_s REAL,
+        max_shutter_s REAL,
+        max_aperture_wide REAL,
+        max_aperture_tele REAL,
+        dimensions_w_mm REAL,
+        dimensions_h_mm REAL,
+        dimensions_d_mm REAL,
+        content_hash TEXT
     )
     """
+
+CAMERA_COLUMNS = tuple(re.findall(r"^\s+(\w+) (?:TEXT|INTEGER|REAL)", CREATE_CAMERA_TABLE_QUERY, re.MULTILINE))
+
+CAMERA_NUMERIC_COLUMNS = frozenset(re.findall(r"^\s+(\w+) (?:INTEGER|REAL)", CREATE_CAMERA_TABLE_QUERY, re.MULTILINE))
+
+CAMERA_COLUMN_TYPES = dict(re.findall(r"^\s+(\w+) (TEXT|INTEGER|REAL)", CREATE_CAMERA_TABLE_QUERY, re.MULTILINE))
+
+CREATE_CAMERA_FTS_TABLE_QUERY = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS cameras_fts USING fts5(
+        brand,
+        model,
+        also_known_as,
+        content='cameras',
+        content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """
+
+CREATE_CAMERA_FTS_TRIGGERS_QUERY = """
+    CREATE TRIGGER IF NOT EXISTS cameras_fts_ai AFTER INSERT ON cameras BEGIN
+        INSERT INTO cameras_fts (rowid, brand, model, also_known_as)
+        VALUES (new.rowid, new.brand, new.model, new.also_known_as);
+    END;
+    CREATE TRIGGER IF NOT EXISTS cameras_fts_ad AFTER DELETE ON cameras BEGIN
+        INSERT INTO cameras_fts (cameras_fts, rowid, brand, model, also_known_as)
+        VALUES ('delete', old.rowid, old.brand, old.model, old.also_known_as);
+    END;
+    CREATE TRIGGER IF NOT EXISTS cameras_fts_au AFTER UPDATE ON cameras BEGIN
+        INSERT INTO cameras_fts (cameras_fts, rowid, brand, model, also_known_as)
+        VALUES ('delete', old.rowid, old.brand, old.model, old.also_known_as);
+        INSERT INTO cameras_fts (rowid, brand, model, also_known_as)
+        VALUES (new.rowid, new.brand, new.model, new.also_known_as);
+    END;
+    """
+
+REBUILD_CAMERA_FTS_QUERY = "INSERT INTO cameras_fts (cameras_fts) VALUES ('rebuild')"
+
+CREATE_CAMERA_CHILD_TABLES_QUERY = """
+    CREATE TABLE IF NOT EXISTS camera_iso (
+        camera_id INTEGER NOT NULL,
+        iso_min INTEGER,
+        iso_max INTEGER,
+        is_auto INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS camera_storage (
+        camera_id INTEGER NOT NULL,
+        type TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS camera_aliases (
+        camera_id INTEGER NOT NULL,
+        alias TEXT NOT NULL,
+        priority INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TRIGGER IF NOT EXISTS cameras_children_ad AFTER DELETE ON cameras BEGIN
+        DELETE FROM camera_iso WHERE camera_id = old.rowid;
+        DELETE FROM camera_storage WHERE camera_id = old.rowid;
+        DELETE FROM camera_aliases WHERE camera_id = old.rowid;
+    END;
+    """
+
+# Keeps the first imported row of every (brand, model), so the unique key can be created
+REMOVE_DUPLICATE_CAMERAS_QUERY = """
+    DELETE FROM cameras WHERE rowid NOT IN (SELECT MIN(rowid) FROM cameras GROUP BY brand, model)
+    """
+
+CREATE_CAMERA_UNIQUE_KEY_QUERY = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_cameras_brand_model_key ON cameras (brand, model)"
+)
+
+CREATE_CAMERA_INDEXES_QUERY = """
+    DROP INDEX IF EXISTS idx_cameras_brand_model;
+    CREATE INDEX IF NOT EXISTS idx_cameras_year ON cameras (year);
+    CREATE INDEX IF NOT EXISTS idx_cameras_megapixels ON cameras (megapixels);
+    CREATE INDEX IF NOT EXISTS idx_cameras_crop_factor ON cameras (crop_factor);
+    CREATE INDEX IF NOT EXISTS idx_cameras_weight_g ON cameras (weight_g);
+    CREATE INDEX IF NOT EXISTS idx_cameras_screen_size_in ON cameras (screen_size_in);
+    CREATE INDEX IF NOT EXISTS idx_cameras_min_shutter_s ON cameras (min_shutter_s);
+    CREATE INDEX IF NOT EXISTS idx_cameras_max_shutter_s ON cameras (max_shutter_s);
+    CREATE INDEX IF NOT EXISTS idx_cameras_max_aperture_wide ON cameras (max_aperture_wide);
+    CREATE INDEX IF NOT EXISTS idx_cameras_max_aperture_tele ON cameras (max_aperture_tele);
+    CREATE INDEX IF NOT EXISTS idx_cameras_dimensions_w_mm ON cameras (dimensions_w_mm);
+    CREATE INDEX IF NOT EXISTS idx_cameras_dimensions_h_mm ON cameras (dimensions_h_mm);
+    CREATE INDEX IF NOT EXISTS idx_cameras_dimensions_d_mm ON cameras (dimensions_d_mm);
+    CREATE INDEX IF NOT EXISTS idx_camera_iso_range ON camera_iso (iso_max, iso_min, camera_id);
+    CREATE INDEX IF NOT EXISTS idx_camera_iso_camera_id ON camera_iso (camera_id);
+    CREATE INDEX IF NOT EXISTS idx_camera_storage_type ON camera_storage (type COLLATE NOCASE, camera_id);
+    CREATE INDEX IF NOT EXISTS idx_camera_storage_camera_id ON camera_storage (camera_id);
+    CREATE INDEX IF NOT EXISTS idx_camera_aliases_alias ON camera_aliases (alias, priority, camera_id);
+    CREATE INDEX IF NOT EXISTS idx_camera_aliases_camera_id ON camera_aliases (camera_id);
+    ANALYZE;
+    """
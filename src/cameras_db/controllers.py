@@ -1,24 +1,195 @@
+import inspect
+from copy import copy
+from difflib import SequenceMatcher
+from functools import lru_cache
+from pathlib import Path
 from sqlite3 import Connection, Cursor
 import sqlite3
-from typing import List, Union, Dict, Optional
+from time import perf_counter
+from typing import (
+    Any, Callable, FrozenSet, Hashable, Iterable, Iterator, List, Union, Dict, Optional, Sequence, Tuple, Type
+)
 
+from cameras_db.arrays import column_array
+from cameras_db.constants import CAMERA_NUMERIC_COLUMNS
+from cameras_db.exif import brand_keys, exif_key
+from cameras_db.instrumentation import QueryEvent, QueryMetrics
 from cameras_db.models.Camera import Camera
+from cameras_db.models.CameraProjection import camera_projection
+from cameras_db.models.CompactCamera import CompactCamera
+from cameras_db.pagination import (
+    DEFAULT_ORDER_BY,
+    DEFAULT_PAGE_SIZE,
+    Page,
+    decode_page_token,
+    encode_page_token,
+    query_digest,
+    sort_key,
+)
+from cameras_db.paths import default_db_path
+from cameras_db.query_builder import QueryBuilder
+from cameras_db.result_cache import MISSING, ResultCache, file_version
+from cameras_db.similarity import SpecIndex, build_spec_index, spec_index_key, spec_index_values
+
+
+DEFAULT_BATCH_SIZE = 100
+
+# The columns facets() counts cameras by and those it returns the range of, by default
+DEFAULT_FACET_FIELDS = ("brand", "year", "sensor_type", "sensor_size")
+DEFAULT_RANGE_FIELDS = ("megapixels",)
+# The facet results kept per controller, for the unfiltered and most frequent filters
+FACET_CACHE_SIZE = 64
+
+STATEMENT_CACHE_SIZE = 256
+# The spec indexes and brand keys kept, one of each per database file and version in use
+INDEX_CACHE_SIZE = 16
+# The db_path values sqlite3 opens as a private database of the connection rather than a file
+PRIVATE_DB_PATHS = (":memory:", "")
 
 
 class CamerasController:
-    cursor: Cursor
-    conn: Connection
+    camera_class: Type[Union[Camera, CompactCamera]] = Camera
+    db_path: Optional[str] = None
+    result_cache: Optional[ResultCache] = None
+    # Records the timings and row counts of every query when set, see QueryMetrics
+    metrics: Optional[QueryMetrics] = None
+    # The facets() results, keyed by filters and fields and checked against db_version(), created on first use
+    facet_cache: Optional[ResultCache] = None
+    # The database file a snapshot was copied from and its file_version() at the time, see snapshot()
+    source_path: Optional[str] = None
+    _source_version: Optional[tuple] = None
+    # Stands for a private in-memory database in the result cache keys, created on first use
+    _private_source: Optional[object] = None
+    # Opened on first use by the conn and cursor properties
+    _conn: Optional[Connection] = None
+    _cursor: Optional[Cursor] = None
+    check_same_thread: bool = True
+
+    # Shared by every controller, see QueryBuilder.stats() for its hit and miss counters
+    query_builder: QueryBuilder = QueryBuilder(cache_size=STATEMENT_CACHE_SIZE)
+    # The SpecIndex of similar_to and the brand keys of resolve_exif, keyed by cache_source() and what they are and
+    # checked against db_version(), shared by every controller so that they are built once per database version
+    index_cache: ResultCache = ResultCache(max_size=INDEX_CACHE_SIZE)
+
+    def __init__(
+            self,
+            db_path: Optional[str] = None,
+            cursor: Optional[Cursor] = None,
+            check_same_thread: bool = True,
+            camera_class: Optional[Type[Union[Camera, CompactCamera]]] = None,
+            result_cache: Optional[ResultCache] = None,
+            metrics: Optional[QueryMetrics] = None,
+    ):
+        """
+        Creates a controller over the database at `db_path`, the cameras_db.db packaged with cameras_db by default.
+
+        The connection is only opened by the first query, or the first use of `conn` or `cursor`, so creating a
+        controller that never queries costs nothing.
+        """
+        self.db_path = db_path if db_path is not None else default_db_path()
+        self.check_same_thread = check_same_thread
+        if cursor is not None:
+            self.cursor = cursor
+        if camera_class is not None:
+            # CompactCamera keeps large result sets in about a third of the memory
+            self.camera_class = camera_class
+        self.result_cache = result_cache
+        self.metrics = metrics
+
+    @property
+    def conn(self) -> Connection:
+        """
+        The connection to the database, opened on first use.
+        """
+        if self._conn is None:
+            self._conn = sqlite3.connect(
+                self.db_path, check_same_thread=self.check_same_thread, cached_statements=STATEMENT_CACHE_SIZE
+            )
+        return self._conn
+
+    @conn.setter
+    def conn(self, conn: Connection) -> None:
+        self._conn = conn
+
+    @property
+    def cursor(self) -> Cursor:
+        """
+        The cursor of the queries returning lists, opened on first use.
+        """
+        if self._cursor is None:
+            self._cursor = self.conn.cursor()
+        return self._cursor
+
+    @cursor.setter
+    def cursor(self, cursor: Cursor) -> None:
+        self._cursor = cursor
+
+    @classmethod
+    def snapshot(cls, db_path: Optional[str] = None, **kwargs) -> "CamerasController":
+        """
+        Creates a controller serving every query from an in-memory copy of the database at `db_path`.
+
+        The file is opened read-only and immutable through a URI, so no locks are taken on it, copied once into
+        a `:memory:` connection with the sqlite backup API and closed again. The copy is query only, writes raise
+        sqlite3.OperationalError.
+
+        Args:
+            db_path (Optional[str]): The path to the database file, the packaged cameras_db.db by default.
+            **kwargs: Passed on to the constructor, such as camera_class or result_cache.
 
-    def __init__(self, db_path: str, cursor: Optional[Cursor] = None):
-        self.conn = sqlite3.connect(db_path)
-        self.cursor = cursor if cursor is not None else self.conn.cursor()
+        Returns:
+            CamerasController: A controller over the in-memory snapshot.
+        """
+        source_path = str(Path(db_path if db_path is not None else default_db_path()).resolve())
+        source_version = file_version(source_path)
+        source = sqlite3.connect(f"{Path(source_path).as_uri()}?mode=ro&immutable=1", uri=True)
+        controller = cls(":memory:", **kwargs)
+        try:
+            source.backup(controller.conn)
+        finally:
+            source.close()
+        controller.conn.execute("PRAGMA query_only = ON")
+        if source_version is not None:
+            # Results are cached under the file, shared with the controllers and snapshots of the same version
+            controller.source_path = source_path
+            controller._source_version = source_version
+        return controller
 
     @staticmethod
-    def row_to_camera(row=None, columns=None, row_dict=None) -> Camera:
+    @lru_cache(maxsize=128)
+    def camera_row_factory(
+            camera_class: Type[Union[Camera, CompactCamera]], columns: Tuple[str, ...]
+    ) -> Callable[[Optional[Cursor], tuple], Camera]:
+        """
+        Compiles a row factory building `camera_class` objects from rows with the given column layout.
+
+        The factory passes every column positionally, in the order of the `camera_class` constructor, without
+        building an intermediate dict. Columns the constructor does not know are ignored and missing ones are
+        passed as None. Factories are cached per camera class and column layout.
+
+        Args:
+            camera_class (Type[Union[Camera, CompactCamera]]): The class to build.
+            columns (Tuple[str, ...]): The column names of the rows, in order.
+
+        Returns:
+            Callable[[Optional[Cursor], tuple], Camera]: A function usable as a cursor row_factory.
+        """
+        column_indexes = {column: index for index, column in enumerate(columns)}
+        args = [
+            f"row[{column_indexes[parameter]}]" if parameter in column_indexes else "None"
+            for parameter in inspect.signature(camera_class).parameters
+        ]
+        while args and args[-1] == "None":
+            args.pop()
+
+        namespace = {"camera_class": camera_class}
+        exec(f"def camera_row_factory(cursor, row):\n    return camera_class({', '.join(args)})", namespace)
+        return namespace["camera_row_factory"]
+
+    @staticmethod
+    def row_to_camera(row=None, columns=None, row_dict=None, camera_class=Camera) -> Camera:
         if row_dict is None:
-            row_dict = {}
-            for column_name, value in zip(columns, row):
-                row_dict[column_name] = value
+            return CamerasController.camera_row_factory(camera_class, tuple(columns))(None, row)
         else:
             corrected_row_dict = {}
             for column_tuple in columns:
@@ -27,90 +198,894 @@ class CamerasController:
 
             row_dict = corrected_row_dict
 
-        return Camera(**row_dict)
-
-    def get_by_field(self, field: str, value: Union[str, int, float]) -> List[Camera]:
-        query = f"SELECT * FROM cameras WHERE {field} = ?"
-        self.cursor.execute(
-            query,
-            (value,),
-        )
-        rows = self.cursor.fetchall()
-        columns = [desc[0] for desc in self.cursor.description]
-        cameras = [CamerasController.row_to_camera(row, columns) for row in rows]
-        return cameras if cameras else []
-
-    def get_by_field_like(self, field: str, value: str) -> List[Camera]:
-        query = f"SELECT * FROM cameras WHERE {field} LIKE ?"
-        self.cursor.execute(
-            query,
-            (
-                "%{}%".format(value),
-            ),  # Pass only one value with the % wildcard characters
-        )
-        rows = self.cursor.fetchall()
-        columns = [desc[0] for desc in self.cursor.description]
-        cameras = [CamerasController.row_to_camera(row, columns) for row in rows]
-        return cameras if cameras else []
-
-    def get_by_fields_like_and(self, field_value_dict: Dict[str, str]) -> List[Camera]:
-        query_fields = [
-            f"{field} LIKE ? COLLATE NOCASE" for field in field_value_dict.keys()
-        ]
-        query = "SELECT * FROM cameras WHERE " + " AND ".join(query_fields)
-        params = [f"%{value}%" for value in field_value_dict.values()]
+        return camera_class(**row_dict)
+
+    def fetch_cameras(
+            self, query: str, params: Sequence, camera_class: Optional[Type] = None, method: str = "fetch_cameras"
+    ) -> List[Camera]:
+        """
+        Runs a SELECT over the cameras table and returns every row as a Camera, or as `camera_class` when given.
+
+        With a result cache, results are looked up by database file, SQL text, parameters and result class, and
+        only read from the database on a miss or after it changed. Every call returns cameras of its own, so
+        changing one leaves the cache and other callers alone.
+
+        With metrics, the query is recorded as a QueryEvent of `method`, the public method the query runs for,
+        cache hits included.
+        """
+        camera_class = camera_class or self.camera_class
+        metrics = self.metrics
+        key = None
+        if self.result_cache is not None:
+            key = (self.cache_source(), query, tuple(params), camera_class)
+            try:
+                hash(key)
+            except TypeError:
+                key = None
+
+        if key is not None:
+            version = self.db_version()
+            if version is None:
+                key = None
+
+        if key is not None:
+            cameras = self.result_cache.get(key, version)
+            if cameras is not MISSING:
+                if metrics is not None:
+                    metrics.record(self.conn, QueryEvent(method, query, len(params), rows=len(cameras), cached=True))
+                return CamerasController._copy_cameras(cameras)
+
+        if metrics is None:
+            self.cursor.execute(query, params)
+            columns = tuple(column[0] for column in self.cursor.description)
+
+            row_factory = self.cursor.row_factory
+            self.cursor.row_factory = CamerasController.camera_row_factory(camera_class, columns)
+            try:
+                cameras = self.cursor.fetchall()
+            finally:
+                self.cursor.row_factory = row_factory
+        else:
+            cameras = self._fetch_rows(
+                query,
+                params,
+                lambda columns, rows: CamerasController.materialize(camera_class, columns, rows),
+                self.cursor,
+                method,
+            )
+
+        if key is not None:
+            self.result_cache.put(key, version, tuple(cameras))
+            return CamerasController._copy_cameras(cameras)
+        return cameras
+
+    @staticmethod
+    def _copy_cameras(cameras: Iterable[Camera]) -> List[Camera]:
+        """
+        Returns a list of copies of cached cameras, projections are immutable tuples and returned as they are.
+        """
+        return [camera if isinstance(camera, tuple) else copy(camera) for camera in cameras]
+
+    def cache_source(self) -> Hashable:
+        """
+        Returns what the result cache keys of the controller start with: the database file, the file a snapshot
+        was copied from, or an object of its own for a private in-memory database.
+        """
+        if self.source_path is not None:
+            return self.source_path
+        if self.db_path in PRIVATE_DB_PATHS:
+            if self._private_source is None:
+                self._private_source = object()
+            return self._private_source
+        return self.db_path
+
+    def db_version(self) -> Optional[tuple]:
+        """
+        Returns a token that changes whenever the database changes, or None when results must not be cached.
+
+        For a database file it is the file_version() of the file, the same for every connection to it, so
+        controllers sharing a ResultCache agree on it. A snapshot never changes and keeps the version of the file
+        it was copied from. A private in-memory database is versioned by its schema and the changes made through
+        its only connection. None is returned while the connection has uncommitted changes, which other
+        connections do not see, and for a file that cannot be read.
+        """
+        if self._source_version is not None:
+            return self._source_version
+        if self.conn.in_transaction:
+            return None
+        if self.db_path in PRIVATE_DB_PATHS:
+            return self.conn.execute("PRAGMA schema_version").fetchone()[0], self.conn.total_changes
+        return file_version(self.db_path)
+
+    def iter_cameras(
+            self,
+            query: str,
+            params: Sequence,
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            camera_class: Optional[Type] = None,
+            method: str = "iter_cameras",
+    ) -> Iterator[Camera]:
+        """
+        Runs a SELECT over the cameras table and lazily yields every row as a Camera.
+
+        Rows are pulled with `fetchmany(batch_size)` on a cursor of their own, so at most one batch is held in memory
+        and other queries can run on the controller while the iterator is consumed.
+
+        With metrics, the query is recorded as a QueryEvent of `method` once the iterator is exhausted or closed.
+        """
+        if self.metrics is not None:
+            return self._measured_iter_cameras(method, query, params, batch_size, camera_class)
+
+        cursor = self.conn.cursor()
+        cursor.execute(query, params)
+        columns = tuple(column[0] for column in cursor.description)
+        cursor.row_factory = CamerasController.camera_row_factory(camera_class or self.camera_class, columns)
+
+        def cameras() -> Iterator[Camera]:
+            try:
+                rows = cursor.fetchmany(batch_size)
+                while rows:
+                    yield from rows
+                    rows = cursor.fetchmany(batch_size)
+            finally:
+                CamerasController._close_cursor(cursor)
+
+        return cameras()
+
+    @staticmethod
+    def _close_cursor(cursor: Cursor) -> None:
+        """
+        Closes the cursor of an iterator. Once the connection is closed this raises, which would replace the error
+        the iterator stopped on, so it is ignored.
+        """
+        try:
+            cursor.close()
+        except sqlite3.ProgrammingError:
+            pass
+
+    def _measured_iter_cameras(
+            self, method: str, query: str, params: Sequence, batch_size: int, camera_class: Optional[Type]
+    ) -> Iterator[Camera]:
+        metrics = self.metrics
+        # Recorded against the connection the query runs on, even once the controller is closed or released
+        conn = self.conn
+        cursor = conn.cursor()
+        start = perf_counter()
+        cursor.execute(query, params)
+        execute_s = perf_counter() - start
+        columns = tuple(column[0] for column in cursor.description)
+        row_factory = CamerasController.camera_row_factory(camera_class or self.camera_class, columns)
+
+        def cameras() -> Iterator[Camera]:
+            fetch_s = materialize_s = 0.0
+            count = 0
+            try:
+                while True:
+                    start = perf_counter()
+                    rows = cursor.fetchmany(batch_size)
+                    fetched = perf_counter()
+                    if not rows:
+                        fetch_s += fetched - start
+                        break
+                    batch = [row_factory(None, row) for row in rows]
+                    fetch_s += fetched - start
+                    materialize_s += perf_counter() - fetched
+                    count += len(batch)
+                    yield from batch
+            finally:
+                CamerasController._close_cursor(cursor)
+                metrics.record(
+                    conn, QueryEvent(method, query, len(params), execute_s, fetch_s, materialize_s, count), params
+                )
+
+        return cameras()
+
+    def _fetch_rows(
+            self,
+            query: str,
+            params: Sequence,
+            materialize: Callable[[Tuple[str, ...], list], Any],
+            cursor: Optional[Cursor] = None,
+            method: str = "query",
+    ) -> Any:
+        """
+        Runs a query on `cursor`, or on a cursor of its own, and returns `materialize` called with the column names
+        and every row, recording a QueryEvent of `method` when the controller has metrics.
+        """
+        own_cursor = cursor is None
+        if own_cursor:
+            cursor = self.conn.cursor()
+        metrics = self.metrics
+        try:
+            if metrics is None:
+                cursor.execute(query, params)
+                return materialize(tuple(column[0] for column in cursor.description), cursor.fetchall())
+
+            start = perf_counter()
+            cursor.execute(query, params)
+            executed = perf_counter()
+            columns = tuple(column[0] for column in cursor.description)
+            rows = cursor.fetchall()
+            fetched = perf_counter()
+            result = materialize(columns, rows)
+            done = perf_counter()
+        finally:
+            if own_cursor:
+                cursor.close()
+
+        event = QueryEvent(
+            method, query, len(params), executed - start, fetched - executed, done - fetched, len(rows)
+        )
+        metrics.record(self.conn, event, params)
+        return result
+
+    @staticmethod
+    def materialize(camera_class: Type, columns: Tuple[str, ...], rows: Iterable[tuple]) -> List[Camera]:
+        """
+        Builds a `camera_class` object of every row with the given column layout, through its row factory.
+        """
+        row_factory = CamerasController.camera_row_factory(camera_class, columns)
+        return [row_factory(None, row) for row in rows]
+
+    def _result_class(self, fields: Optional[Sequence[str]]) -> Type:
+        """
+        Returns the class built for each row: the controller camera class, or a CameraProjection for `fields`.
+        """
+        return self.camera_class if fields is None else camera_projection(tuple(fields))
+
+    def get_by_field(
+            self, field: str, value: Union[str, int, float], fields: Optional[Sequence[str]] = None
+    ) -> List[Camera]:
+        return self.fetch_cameras(
+            *self._field_query(field, value, fields), camera_class=self._result_class(fields), method="get_by_field"
+        )
+
+    def iter_by_field(
+            self,
+            field: str,
+            value: Union[str, int, float],
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Camera]:
+        return self.iter_cameras(
+            *self._field_query(field, value, fields),
+            batch_size=batch_size,
+            camera_class=self._result_class(fields),
+            method="iter_by_field",
+        )
+
+    def _field_query(
+            self, field: str, value: Union[str, int, float], fields: Optional[Sequence[str]]
+    ) -> Tuple[str, list]:
+        return self.query_builder.where([(field, "=", value)], fields=fields)
+
+    def get_by_field_like(self, field: str, value: str, fields: Optional[Sequence[str]] = None) -> List[Camera]:
+        return self.fetch_cameras(
+            *self._field_like_query(field, value, fields),
+            camera_class=self._result_class(fields),
+            method="get_by_field_like",
+        )
+
+    def iter_by_field_like(
+            self,
+            field: str,
+            value: str,
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Camera]:
+        return self.iter_cameras(
+            *self._field_like_query(field, value, fields),
+            batch_size=batch_size,
+            camera_class=self._result_class(fields),
+            method="iter_by_field_like",
+        )
+
+    def _field_like_query(self, field: str, value: str, fields: Optional[Sequence[str]]) -> Tuple[str, list]:
+        # Pass only one value with the % wildcard characters
+        return self.query_builder.where([(field, "LIKE", "%{}%".format(value))], fields=fields)
+
+    def get_by_fields_like_and(
+            self, field_value_dict: Dict[str, str], fields: Optional[Sequence[str]] = None
+    ) -> List[Camera]:
+        return self.fetch_cameras(
+            *self._fields_like_query(field_value_dict, "AND", fields),
+            camera_class=self._result_class(fields),
+            method="get_by_fields_like_and",
+        )
+
+    def iter_by_fields_like_and(
+            self,
+            field_value_dict: Dict[str, str],
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Camera]:
+        return self.iter_cameras(
+            *self._fields_like_query(field_value_dict, "AND", fields),
+            batch_size=batch_size,
+            camera_class=self._result_class(fields),
+            method="iter_by_fields_like_and",
+        )
+
+    def get_by_fields_like_or(
+            self, field_value_dict: Dict[str, str], fields: Optional[Sequence[str]] = None
+    ) -> List[Camera]:
+        return self.fetch_cameras(
+            *self._fields_like_query(field_value_dict, "OR", fields),
+            camera_class=self._result_class(fields),
+            method="get_by_fields_like_or",
+        )
+
+    def iter_by_fields_like_or(
+            self,
+            field_value_dict: Dict[str, str],
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Camera]:
+        return self.iter_cameras(
+            *self._fields_like_query(field_value_dict, "OR", fields),
+            batch_size=batch_size,
+            camera_class=self._result_class(fields),
+            method="iter_by_fields_like_or",
+        )
+
+    def _fields_like_query(
+            self, field_value_dict: Dict[str, str], separator: str, fields: Optional[Sequence[str]]
+    ) -> Tuple[str, list]:
+        # LIKE is case-insensitive for ASCII already, the former COLLATE NOCASE did not change the results
+        conditions = [(field, "LIKE", f"%{value}%") for field, value in field_value_dict.items()]
+        return self.query_builder.where(conditions, separator, fields)
+
+    def get_by_fields_with_operators(
+            self, conditions, fields: Optional[Sequence[str]] = None, order_by: Optional[Sequence[str]] = None
+    ) -> List[Camera]:
+        return self.fetch_cameras(
+            *self._operators_query(conditions, fields, order_by),
+            camera_class=self._result_class(fields),
+            method="get_by_fields_with_operators",
+        )
+
+    def iter_by_fields_with_operators(
+            self,
+            conditions,
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            fields: Optional[Sequence[str]] = None,
+            order_by: Optional[Sequence[str]] = None,
+    ) -> Iterator[Camera]:
+        return self.iter_cameras(
+            *self._operators_query(conditions, fields, order_by),
+            batch_size=batch_size,
+            camera_class=self._result_class(fields),
+            method="iter_by_fields_with_operators",
+        )
+
+    def _operators_query(
+            self, conditions, fields: Optional[Sequence[str]], order_by: Optional[Sequence[str]] = None
+    ) -> Tuple[str, list]:
+        return self.query_builder.where(conditions, fields=fields, order_by=order_by)
 
-        self.cursor.execute(query, params)
-        rows = self.cursor.fetchall()
-        columns = [column[0] for column in self.cursor.description]
+    def get_page(
+            self,
+            conditions=(),
+            order_by: Sequence[str] = DEFAULT_ORDER_BY,
+            limit: int = DEFAULT_PAGE_SIZE,
+            after: Optional[str] = None,
+            separator: str = "AND",
+            fields: Optional[Sequence[str]] = None,
+    ) -> Page:
+        """
+        Returns one page of the cameras matching `conditions`, sorted by `order_by`, with the token of the next one.
+
+        Pages are read with keyset pagination: the token holds the sort key of the last camera of a page and the
+        next page starts right after it, through an index range on the key instead of skipping rows like OFFSET,
+        so the hundredth page costs the same as the first. rowid ends every sort key, which makes it unique, so
+        the default key is served by the unique index on (brand, model). Cameras inserted or removed between
+        pages neither shift nor repeat the others.
+
+        Args:
+            conditions: (field, operator, value) triples, as in get_by_fields_with_operators, such as
+            [("brand", "=", "Canon")]. Every camera by default.
+            order_by (Sequence[str]): The fields to sort by, "-" prefixed for descending order, such as
+            ["-year", "model"].
+            limit (int): The maximum number of cameras of the page.
+            after (Optional[str]): The next_token of the previous page, None for the first page.
+            separator (str): "AND" or "OR", how the conditions are combined.
+            fields (Optional[Sequence[str]]): The columns to read, every column by default.
+
+        Raises:
+            ValueError: If `limit` is not positive, a field or operator is not supported, or `after` is not a token
+            of the same conditions and order.
+
+        Returns:
+            Page: The cameras of the page and its next_token, None on the last page.
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        conditions = list(conditions)
+        key = sort_key(order_by)
+        digest = query_digest(*self.query_builder.where(conditions, separator))
+        after_values = decode_page_token(after, key, digest) if after is not None else None
+        # One more row than the page tells whether there is a next one, without reading an empty last page
+        query, params = self.query_builder.page(conditions, separator, fields, key, after_values, limit + 1)
+        camera_class = self._result_class(fields)
+
+        def page(columns: Tuple[str, ...], rows: list) -> Page:
+            cameras = CamerasController.materialize(camera_class, columns, rows[:limit])
+            if len(rows) <= limit:
+                return Page(cameras)
+            return Page(cameras, encode_page_token(key, digest, rows[limit - 1][-len(key):]))
+
+        return self._fetch_rows(query, params, page, self.cursor, method="get_page")
+
+    def get_by_iso_range(
+            self, min_iso: Optional[int] = None, max_iso: Optional[int] = None, fields: Optional[Sequence[str]] = None
+    ) -> List[Camera]:
+        """
+        Returns the cameras with at least one ISO setting between `min_iso` and `max_iso`, both inclusive.
+
+        Uses the camera_iso table, whose rows are single values or ranges such as 100-25600, and matches the rows
+        overlapping [min_iso, max_iso]: get_by_iso_range(25600) finds the cameras that reach ISO 25600 without
+        matching "256000", get_by_iso_range(3200, 3200) those with ISO 3200 inside one of their ranges. Leave a
+        bound as None to keep that side of the range open.
+        """
+        return self.fetch_cameras(
+            *self._iso_range_query(min_iso, max_iso, fields),
+            camera_class=self._result_class(fields),
+            method="get_by_iso_range",
+        )
 
-        return [CamerasController.row_to_camera(row, columns) for row in rows] if rows else []
+    def iter_by_iso_range(
+            self,
+            min_iso: Optional[int] = None,
+            max_iso: Optional[int] = None,
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Camera]:
+        return self.iter_cameras(
+            *self._iso_range_query(min_iso, max_iso, fields),
+            batch_size=batch_size,
+            camera_class=self._result_class(fields),
+            method="iter_by_iso_range",
+        )
 
-    def get_by_fields_like_or(self, field_value_dict: Dict[str, str]) -> List[Camera]:
-        query_fields = [
-            f"{field} LIKE ? COLLATE NOCASE" for field in field_value_dict.keys()
+    def _iso_range_query(
+            self, min_iso: Optional[int], max_iso: Optional[int], fields: Optional[Sequence[str]]
+    ) -> Tuple[str, list]:
+        query = (
+            f"{self.query_builder.select(fields)} FROM cameras WHERE rowid IN ("
+            "SELECT camera_id FROM camera_iso WHERE iso_max >= ? AND iso_min <= ?"
+            ")"
+        )
+        return query, [
+            min_iso if min_iso is not None else 0,
+            max_iso if max_iso is not None else 2 ** 63 - 1,
         ]
-        query = "SELECT * FROM cameras WHERE " + " OR ".join(query_fields)
-        params = [f"%{value}%" for value in field_value_dict.values()]
 
-        self.cursor.execute(query, params)
-        rows = self.cursor.fetchall()
-        columns = [column[0] for column in self.cursor.description]
+    def get_by_storage_type(self, storage_type: str, fields: Optional[Sequence[str]] = None) -> List[Camera]:
+        """
+        Returns the cameras supporting `storage_type`, compared case-insensitively against the camera_storage table.
+        """
+        return self.fetch_cameras(
+            *self._storage_type_query(storage_type, fields),
+            camera_class=self._result_class(fields),
+            method="get_by_storage_type",
+        )
 
-        return [CamerasController.row_to_camera(row, columns) for row in rows] if rows else []
+    def iter_by_storage_type(
+            self, storage_type: str, batch_size: int = DEFAULT_BATCH_SIZE, fields: Optional[Sequence[str]] = None
+    ) -> Iterator[Camera]:
+        return self.iter_cameras(
+            *self._storage_type_query(storage_type, fields),
+            batch_size=batch_size,
+            camera_class=self._result_class(fields),
+            method="iter_by_storage_type",
+        )
 
-    def get_by_fields_with_operators(self, conditions):
-        query = "SELECT * FROM cameras WHERE "
-        query_conditions = []
-        query_values = []
+    def _storage_type_query(self, storage_type: str, fields: Optional[Sequence[str]]) -> Tuple[str, list]:
+        query = (
+            f"{self.query_builder.select(fields)} FROM cameras WHERE rowid IN ("
+            "SELECT camera_id FROM camera_storage WHERE type = ? COLLATE NOCASE"
+            ")"
+        )
+        return query, [storage_type]
 
-        for field, operator, value in conditions:
-            query_conditions.append(f"{field} {operator} ?")
-            query_values.append(value)
+    def search(self, text: str, limit: int = 20, fields: Optional[Sequence[str]] = None) -> List[Camera]:
+        """
+        Full-text search over brand, model and also_known_as.
 
-        query += " AND ".join(query_conditions)
-        self.cursor.execute(query, query_values)
+        Every whitespace separated term of `text` is matched as a prefix, so "EOS 5D" finds "EOS 5D Mark IV".
+        Results are ranked by bm25, best match first.
 
-        # Fetch the rows and create a list to store the Camera objects
-        cameras = []
-        for row in self.cursor.fetchall():
-            # Ensure column_name is a string
+        Args:
+            text (str): The free text to search for.
+            limit (int): The maximum number of cameras to return.
+            fields (Optional[Sequence[str]]): The columns to read, every column by default.
 
-            row_dict = {str(column_name): row[i] for i, (column_name, *_) in enumerate(self.cursor.description)}
+        Returns:
+            List[Camera]: The matching cameras, best match first.
+        """
+        match_query = CamerasController.fts_match_query(text)
+        if not match_query:
+            return []
 
-            camera = CamerasController.row_to_camera(row_dict=row_dict, columns=self.cursor.description)
+        return self.fetch_cameras(
+            *self._search_query(match_query, limit, fields), camera_class=self._result_class(fields), method="search"
+        )
 
-            cameras.append(camera)
+    def iter_search(
+            self,
+            text: str,
+            limit: int = 20,
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Camera]:
+        match_query = CamerasController.fts_match_query(text)
+        if not match_query:
+            return iter([])
 
-        return cameras
+        return self.iter_cameras(
+            *self._search_query(match_query, limit, fields),
+            batch_size=batch_size,
+            camera_class=self._result_class(fields),
+            method="iter_search",
+        )
+
+    def _search_query(self, match_query: str, limit: int, fields: Optional[Sequence[str]]) -> Tuple[str, list]:
+        query = (
+            f"{self.query_builder.select(fields)} FROM cameras_fts "
+            "JOIN cameras ON cameras.rowid = cameras_fts.rowid "
+            "WHERE cameras_fts MATCH ? "
+            "ORDER BY bm25(cameras_fts) "
+            "LIMIT ?"
+        )
+        return query, [match_query, limit]
+
+    def similar_to(
+            self,
+            camera,
+            k: int = 10,
+            weights: Optional[Dict[str, float]] = None,
+            fields: Optional[Sequence[str]] = None,
+    ) -> List[Camera]:
+        """
+        Returns the `k` cameras with the closest specs to `camera`, closest first.
+
+        Cameras are compared on SIMILARITY_FEATURES, the sensor size and resolution, megapixels, crop factor,
+        weight and year, each standardized so that no unit dominates, through the KD-tree of spec_index(). Cameras
+        with the brand and model of `camera` are left out.
+
+        Args:
+            camera: A Camera, a projection or a mapping with some of the features. Missing ones count as average.
+            k (int): The number of cameras to return.
+            weights (Optional[Dict[str, float]]): The weight of some features in the distance, 1 for the others,
+            such as {"year": 0} to ignore the year.
+            fields (Optional[Sequence[str]]): The columns to read, every column by default.
+
+        Raises:
+            ValueError: If `weights` names an unknown feature or a weight is negative.
+
+        Returns:
+            List[Camera]: The most similar cameras, closest first.
+        """
+        index = self.spec_index()
+        neighbours = index.query(
+            spec_index_values(camera, index.features), k, weights=weights, exclude=spec_index_key(camera)
+        )
+        return self.fetch_by_rowids([rowid for _, rowid in neighbours], fields, method="similar_to")
+
+    def spec_index(self) -> SpecIndex:
+        """
+        Returns the SpecIndex of the database, built on first use and rebuilt once the database has changed.
+
+        Indexes are shared through index_cache by every controller over the same database file and version,
+        snapshots included. While the connection has uncommitted changes the index is built without being cached.
+        """
+        return self._cached_index("spec_index", lambda: build_spec_index(self.conn))
+
+    def brand_keys(self) -> FrozenSet[str]:
+        """
+        Returns the brand keys of the distinct brands of the database, the known brands its aliases were built
+        with by CameraDBFiller, cached like spec_index().
+        """
+        return self._cached_index(
+            "brand_keys",
+            lambda: brand_keys(
+                self._fetch_rows(
+                    "SELECT DISTINCT brand FROM cameras",
+                    [],
+                    lambda columns, rows: [brand for brand, in rows],
+                    method="resolve_exif",
+                )
+            ),
+        )
+
+    def _cached_index(self, name: str, build: Callable[[], Any]) -> Any:
+        """
+        Returns the `name` structure of the database from index_cache, built by `build` once per db_version().
+        """
+        version = self.db_version()
+        if version is None:
+            return build()
+        key = (self.cache_source(), name)
+        index = self.index_cache.get(key, version)
+        if index is MISSING:
+            index = build()
+            self.index_cache.put(key, version, index)
+        return index
+
+    def facets(
+            self,
+            filters=(),
+            facet_fields: Sequence[str] = DEFAULT_FACET_FIELDS,
+            range_fields: Sequence[str] = DEFAULT_RANGE_FIELDS,
+            separator: str = "AND",
+            limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Counts the cameras matching `filters` per value of every facet field, and returns the range of the range
+        fields, such as the cameras per brand and year and the lowest and highest megapixels of a search page.
+
+        Counting runs in SQLite, one GROUP BY per facet field and one aggregate for the total and the ranges, so no
+        camera is built. Results are cached per controller by filters and fields, and dropped once db_version()
+        changes, so the unfiltered facets and those of common filters are only computed once per database version.
+
+        Args:
+            filters: (field, operator, value) triples, as in get_by_fields_with_operators, such as
+            [("brand", "=", "Canon")]. Every camera by default.
+            facet_fields (Sequence[str]): The columns to count cameras by.
+            range_fields (Sequence[str]): The columns to return the minimum and maximum of.
+            separator (str): "AND" or "OR", how the filters are combined.
+            limit (Optional[int]): The number of most frequent values returned per facet, every value by default.
+
+        Raises:
+            ValueError: If a field, operator or separator is not supported.
+
+        Returns:
+            Dict[str, Any]: The number of matching cameras as "count", the count of every value of every facet
+            field, most frequent first, as "facets", and the (min, max) of every range field as "ranges", such as
+            {"count": 2, "facets": {"brand": {"Canon": 2}}, "ranges": {"megapixels": (20.1, 24.2)}}.
+        """
+        filters = list(filters)
+        key = (separator, tuple(sorted(filters, key=repr)), tuple(facet_fields), tuple(range_fields), limit)
+        try:
+            hash(key)
+        except TypeError:
+            key = None
+
+        version = self.db_version() if key is not None else None
+        if version is None:
+            key = None
+
+        if key is not None:
+            if self.facet_cache is None:
+                self.facet_cache = ResultCache(max_size=FACET_CACHE_SIZE)
+            result = self.facet_cache.get(key, version)
+            if result is not MISSING:
+                return CamerasController._copy_facets(result)
+
+        query, params = self.query_builder.aggregate(filters, separator, range_fields)
+        row = self._fetch_rows(query, params, lambda columns, rows: rows[0], method="facets")
+        result = {
+            "count": row[0],
+            "facets": {},
+            "ranges": {field: tuple(row[1 + 2 * index:3 + 2 * index]) for index, field in enumerate(range_fields)},
+        }
+        for field in facet_fields:
+            query, params = self.query_builder.facet(filters, separator, field, limit)
+            result["facets"][field] = self._fetch_rows(
+                query, params, lambda columns, rows: dict(rows), method="facets"
+            )
+
+        if key is not None:
+            self.facet_cache.put(key, version, result)
+        return CamerasController._copy_facets(result)
+
+    @staticmethod
+    def _copy_facets(result: Dict[str, Any]) -> Dict[str, Any]:
+        # Callers get their own dicts, so changing one never changes the cached result
+        return {
+            "count": result["count"],
+            "facets": {field: dict(counts) for field, counts in result["facets"].items()},
+            "ranges": dict(result["ranges"]),
+        }
+
+    def to_arrays(self, fields: Optional[Sequence[str]] = None, conditions=()) -> Dict[str, Any]:
+        """
+        Reads columns of the cameras table as arrays, one per field, without building a camera per row.
+
+        Numeric columns are NumPy float64 arrays, or array.array("d") when NumPy is not installed, with NaN for
+        NULL, and text columns object arrays, or tuples. Functions of cameras_db.arrays compute the sensor
+        diagonals, pixel pitch, megapixels and crop factor of the whole result at once.
+
+        Args:
+            fields (Optional[Sequence[str]]): The columns to read, every column by default.
+            conditions: (field, operator, value) triples combined with AND, as in get_by_fields_with_operators.
+
+        Returns:
+            Dict[str, Any]: The array of every field, all in the same row order.
+        """
+        query, params = self.query_builder.where(conditions, fields=fields)
+
+        def arrays(columns: Tuple[str, ...], rows: list) -> Dict[str, Any]:
+            values = list(zip(*rows)) or [()] * len(columns)
+            return {
+                column: column_array(column_values, column in CAMERA_NUMERIC_COLUMNS)
+                for column, column_values in zip(columns, values)
+            }
+
+        return self._fetch_rows(query, params, arrays, method="to_arrays")
+
+    def resolve_many(
+            self, pairs: Iterable[Tuple[str, str]], fields: Optional[Sequence[str]] = None
+    ) -> Dict[Tuple[str, str], List[Camera]]:
+        """
+        Resolves many (brand, model) pairs at once, matching them like get_by_fields_like_and does.
+
+        Pairs are deduplicated case-insensitively, as LIKE matches, but otherwise used as given, surrounding spaces
+        included, and sent in chunks as a VALUES table joined against the cameras
+        table. Brand patterns are first matched against the distinct brand names, so each pair only compares its
+        model with the models of the matching brands, in one pass over the table per chunk instead of one full
+        scan per pair.
+
+        Args:
+            pairs (Iterable[Tuple[str, str]]): The (brand, model) pairs, such as EXIF Make and Model, as tuples or
+            any other sequence of two strings.
+            fields (Optional[Sequence[str]]): The columns to read, every column by default.
+
+        Returns:
+            Dict[Tuple[str, str], List[Camera]]: The matching cameras of every input pair, as a tuple, empty when
+            none match.
+        """
+        keys: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+        for pair in pairs:
+            brand, model = pair = tuple(pair)
+            keys.setdefault((brand.lower(), model.lower()), []).append(pair)
+
+        matches: Dict[Tuple[str, str], List[Camera]] = {key: [] for key in keys}
+        camera_class = self._result_class(fields)
+        distinct_keys = list(keys)
+        chunk_size = max(1, self.conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER) // 3)
+
+        for start in range(0, len(distinct_keys), chunk_size):
+            chunk = distinct_keys[start:start + chunk_size]
+            query = (
+                "WITH pairs (pair_id, brand_pattern, model_pattern) AS MATERIALIZED ("
+                f"VALUES {', '.join(['(?, ?, ?)'] * len(chunk))}"
+                "), brands (brand_pattern, brand) AS MATERIALIZED ("
+                "SELECT patterns.brand_pattern, names.brand "
+                "FROM (SELECT DISTINCT brand_pattern FROM pairs) AS patterns "
+                "JOIN (SELECT DISTINCT brand FROM cameras) AS names ON names.brand LIKE patterns.brand_pattern"
+                ") "
+                f"{self.query_builder.select(fields)}, pairs.pair_id FROM pairs "
+                "JOIN brands ON brands.brand_pattern = pairs.brand_pattern "
+                "JOIN cameras ON cameras.brand = brands.brand AND cameras.model LIKE pairs.model_pattern "
+                "ORDER BY pairs.pair_id, cameras.rowid"
+            )
+            params = []
+            for pair_id, (brand, model) in enumerate(chunk):
+                params.extend((pair_id, f"%{brand}%", f"%{model}%"))
+
+            def collect(columns: Tuple[str, ...], rows: list, chunk=chunk) -> None:
+                row_factory = CamerasController.camera_row_factory(camera_class, columns)
+                for row in rows:
+                    matches[chunk[row[-1]]].append(row_factory(None, row))
+
+            self._fetch_rows(query, params, collect, method="resolve_many")
+
+        return {pair: matches[key] for key, key_pairs in keys.items() for pair in key_pairs}
+
+    def resolve_exif(
+            self,
+            make: Optional[str],
+            model: Optional[str],
+            limit: int = 5,
+            cutoff: float = 0.6,
+            fields: Optional[Sequence[str]] = None,
+    ) -> List[Camera]:
+        """
+        Resolves the EXIF Make and Model strings of a picture to cameras, through the camera_aliases table.
+
+        Both are normalized like the aliases built by CameraDBFiller, with the brands of the database as known
+        brands, so "NIKON CORPORATION" / "NIKON D750" is an exact, indexed lookup of "nikon:d750". Without an exact
+        match, the aliases of the same brand, or of every brand when it is unknown, are ranked by similarity of
+        their model and those scoring at least `cutoff` are returned, best first.
+
+        Args:
+            make (Optional[str]): The EXIF Make, such as "Canon".
+            model (Optional[str]): The EXIF Model, such as "Canon EOS 5D Mark IV".
+            limit (int): The maximum number of cameras to return.
+            cutoff (float): The minimum similarity, between 0 and 1, of a fuzzy match.
+            fields (Optional[Sequence[str]]): The columns to read, every column by default.
+
+        Returns:
+            List[Camera]: The matching cameras, the exact ones or the best fuzzy ones first.
+        """
+        key = exif_key(make, model, self.brand_keys())
+        camera_class = self._result_class(fields)
+        query = (
+            f"{self.query_builder.select(fields)} FROM camera_aliases "
+            "JOIN cameras ON cameras.rowid = camera_aliases.camera_id "
+            "WHERE camera_aliases.alias = ? "
+            "ORDER BY camera_aliases.priority, cameras.rowid "
+            "LIMIT ?"
+        )
+        cameras = self.fetch_cameras(query, [key, limit], camera_class=camera_class, method="resolve_exif")
+        if cameras:
+            return cameras
+
+        return self.fetch_by_rowids(self._fuzzy_alias_matches(key, limit, cutoff), fields, method="resolve_exif")
+
+    def fetch_by_rowids(
+            self, rowids: Sequence[int], fields: Optional[Sequence[str]] = None, method: str = "fetch_by_rowids"
+    ) -> List[Camera]:
+        """
+        Returns the cameras with the given rowids, in that order, recorded with metrics as a query of `method`.
+        """
+        if not rowids:
+            return []
+
+        query = (
+            f"WITH ranked (position, camera_id) AS (VALUES {', '.join(['(?, ?)'] * len(rowids))}) "
+            f"{self.query_builder.select(fields)} FROM ranked "
+            "JOIN cameras ON cameras.rowid = ranked.camera_id "
+            "ORDER BY ranked.position"
+        )
+        params = [param for position, rowid in enumerate(rowids) for param in (position, rowid)]
+        return self.fetch_cameras(query, params, camera_class=self._result_class(fields), method=method)
+
+    def _fuzzy_alias_matches(self, key: str, limit: int, cutoff: float) -> List[int]:
+        brand, _, model = key.partition(":")
+        # The aliases of a brand are the index range between "<brand>:" and "<brand>;"
+        candidates = self._fetch_rows(
+            "SELECT alias, camera_id, priority FROM camera_aliases WHERE alias >= ? AND alias < ?",
+            [f"{brand}:", f"{brand};"],
+            lambda columns, rows: rows,
+            method="resolve_exif",
+        )
+        if not candidates:
+            candidates = self._fetch_rows(
+                "SELECT alias, camera_id, priority FROM camera_aliases",
+                [],
+                lambda columns, rows: rows,
+                method="resolve_exif",
+            )
+
+        matcher = SequenceMatcher()
+        matcher.set_seq2(model)
+        best: Dict[int, Tuple[float, int]] = {}
+        for alias, camera_id, priority in candidates:
+            matcher.set_seq1(alias.partition(":")[2])
+            if matcher.real_quick_ratio() < cutoff or matcher.quick_ratio() < cutoff:
+                continue
+            rank = (-matcher.ratio(), priority)
+            if -rank[0] >= cutoff and (camera_id not in best or rank < best[camera_id]):
+                best[camera_id] = rank
+
+        return sorted(best, key=lambda camera_id: (best[camera_id], camera_id))[:limit]
+
+    @staticmethod
+    def fts_match_query(text: str) -> str:
+        """
+        Builds an FTS5 MATCH expression where every term of `text` is a quoted prefix query.
+
+        Quoting each term keeps FTS5 operators and punctuation typed by users from being parsed as query syntax.
+        """
+        terms = [term.replace('"', "") for term in text.split()]
+        return " ".join(f'"{term}"*' for term in terms if any(c.isalnum() for c in term))
 
     def close(self):
         """
         Closes the connection.
 
-        This function closes the connection to the database.
+        This function closes the connection to the database, when it was opened.
 
         Returns:
             None
         """
-        self.conn.close()
+        if self._conn is not None:
+            self._conn.close()
+
+    def __enter__(self) -> "CamerasController":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,136 @@
+import re
+import unicodedata
+from typing import AbstractSet, FrozenSet, Iterable, List, Optional, Tuple
+
+# Words of EXIF Make strings that never tell vendors apart, such as "NIKON CORPORATION" or "OLYMPUS IMAGING CORP."
+MAKE_NOISE_WORDS = frozenset({
+    "ag", "america", "camera", "cameras", "co", "company", "computer", "corp", "corporation", "digital", "electric",
+    "electronics", "europe", "gmbh", "imaging", "inc", "international", "japan", "limited", "ltd", "of", "optical",
+    "photo", "film", "solutions", "techwin",
+})
+
+# Vendor names, once stripped of noise words, that differ from the brand column
+VENDOR_BRANDS = {
+    "agfa": "agfaphoto",
+    "asahi": "pentax",
+    "carlzeiss": "zeiss",
+    "eastmankodak": "kodak",
+    "fuji": "fujifilm",
+    "general": "ge",
+    "generalelectric": "ge",
+    "hewlettpackard": "hp",
+    "om": "olympus",
+    "seikoepson": "epson",
+    "victor": "jvc",
+}
+
+# Series names the catalog puts in front of models but EXIF Model strings usually leave out
+OPTIONAL_MODEL_PREFIXES = {
+    "panasonic": ("lumix",),
+    "sony": ("cybershot",),
+}
+
+# Words EXIF Model strings sometimes end with, such as "KODAK EASYSHARE C340 ZOOM DIGITAL CAMERA"
+MODEL_NOISE_SUFFIXES = (("digital", "camera"), ("camera",))
+
+REGION_PATTERN = re.compile(r"\([^)]*\)")
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def words(text: Optional[str]) -> List[str]:
+    """
+    Returns the lowercase alphanumeric words of `text`, with diacritics removed.
+    """
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii")
+    return WORD_PATTERN.findall(text.lower())
+
+
+def brand_key(make: Optional[str]) -> str:
+    """
+    Returns the canonical key of a brand column value or of an EXIF Make string.
+
+    "NIKON CORPORATION" and "Nikon" both give "nikon", "EASTMAN KODAK COMPANY" gives "kodak" and "Konica-Minolta"
+    gives "konicaminolta".
+    """
+    key = "".join(word for word in words(make) if word not in MAKE_NOISE_WORDS) or "".join(words(make))
+    return VENDOR_BRANDS.get(key, key)
+
+
+def brand_keys(brands: Iterable[Optional[str]]) -> FrozenSet[str]:
+    """
+    Returns the brand keys of brand column values, such as those of `SELECT DISTINCT brand FROM cameras`, the
+    known brands of model_key.
+    """
+    return frozenset(brand_key(brand) for brand in brands)
+
+
+def model_key(model: Optional[str], brand: str, known_brands: AbstractSet[str] = frozenset()) -> Tuple[str, str]:
+    """
+    Returns the (brand key, model key) of a model name or of an EXIF Model string made by `brand`.
+
+    The brand is stripped from the front of the model, so "NIKON D750" and "D750" both give "d750". When the
+    model starts with another of the `known_brands`, that brand wins, as with "PENTAX K-1" made by "RICOH IMAGING
+    COMPANY". The model key keeps only letters and digits, so "EOS-1D X" and "EOS 1D X" are the same.
+    """
+    model_words = words(model)
+    for size in (2, 1):
+        prefix = "".join(model_words[:size])
+        if len(model_words) > size and (prefix == brand or prefix in known_brands):
+            brand = prefix
+            model_words = model_words[size:]
+            break
+
+    for suffix in MODEL_NOISE_SUFFIXES:
+        if len(model_words) > len(suffix) and tuple(model_words[-len(suffix):]) == suffix:
+            model_words = model_words[:-len(suffix)]
+            break
+
+    return brand, "".join(model_words)
+
+
+def alias_key(brand: str, model: str) -> str:
+    """
+    Returns the key camera_aliases is looked up by, "<brand key>:<model key>".
+    """
+    return f"{brand}:{model}"
+
+
+def exif_key(make: Optional[str], model: Optional[str], known_brands: AbstractSet[str] = frozenset()) -> str:
+    """
+    Returns the alias key of an EXIF Make/Model pair, with the `known_brands` of the database the aliases were
+    built with.
+    """
+    return alias_key(*model_key(model, brand_key(make), known_brands))
+
+
+def camera_aliases(
+        brand: Optional[str],
+        model: Optional[str],
+        also_known_as: Optional[str],
+        known_brands: AbstractSet[str] = frozenset(),
+) -> List[Tuple[str, int]]:
+    """
+    Returns the distinct (alias key, priority) pairs a camera is resolved by, `known_brands` being the brand_keys
+    of the brands of its database.
+
+    Its own model has priority 0, the model without an optional series prefix such as "Lumix" 1, and every name
+    of `also_known_as`, without its "(US)" or "(Japan)" region, 2.
+    """
+    camera_brand = brand_key(brand)
+    names = [(model, 0)]
+    names += [(name, 2) for name in REGION_PATTERN.sub("", also_known_as or "").split(",") if name.strip()]
+
+    aliases = {}
+    for name, priority in names:
+        name_brand, name_model = model_key(name, camera_brand, known_brands)
+        if not name_model:
+            continue
+        aliases.setdefault(alias_key(name_brand, name_model), priority)
+        for prefix in OPTIONAL_MODEL_PREFIXES.get(name_brand, ()):
+            if name_model.startswith(prefix) and len(name_model) > len(prefix):
+                aliases.setdefault(alias_key(name_brand, name_model[len(prefix):]), max(priority, 1))
+
+    return sorted(aliases.items(), key=lambda alias: alias[1])
+
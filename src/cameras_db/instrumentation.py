@@ -0,0 +1,193 @@
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+# Slow queries are logged as warnings here, with their query plan
+SLOW_QUERY_LOGGER = logging.getLogger("cameras_db.slow_queries")
+
+
+class QueryEvent:
+    """
+    The measures of one query of a CamerasController.
+
+    Attributes:
+        method (str): The public controller method that ran the query, such as "get_by_field".
+        sql (str): The SQL text.
+        param_count (int): The number of bound parameters.
+        execute_s (float): The seconds spent in `execute`, until SQLite returned the first row.
+        fetch_s (float): The seconds spent fetching the rows from SQLite.
+        materialize_s (float): The seconds spent building cameras, or arrays, from the rows.
+        rows (int): The number of rows returned.
+        cached (bool): Whether the result came from the result cache, without running the query.
+        plan (Optional[List[str]]): The EXPLAIN QUERY PLAN details of a slow query, None for the others.
+    """
+
+    __slots__ = ("method", "sql", "param_count", "execute_s", "fetch_s", "materialize_s", "rows", "cached", "plan")
+
+    def __init__(
+            self,
+            method: str,
+            sql: str,
+            param_count: int,
+            execute_s: float = 0.0,
+            fetch_s: float = 0.0,
+            materialize_s: float = 0.0,
+            rows: int = 0,
+            cached: bool = False,
+            plan: Optional[List[str]] = None,
+    ):
+        self.method = method
+        self.sql = sql
+        self.param_count = param_count
+        self.execute_s = execute_s
+        self.fetch_s = fetch_s
+        self.materialize_s = materialize_s
+        self.rows = rows
+        self.cached = cached
+        self.plan = plan
+
+    @property
+    def total_s(self) -> float:
+        return self.execute_s + self.fetch_s + self.materialize_s
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return (
+            f"QueryEvent(method={self.method!r}, rows={self.rows}, total_s={self.total_s:.6f}, "
+            f"cached={self.cached})"
+        )
+
+
+class QueryMetrics:
+    """
+    Records a QueryEvent for every query of the controllers it is given to, as CamerasController(metrics=...).
+
+    Events are kept in a bounded list of the most recent ones, summed up per method by summary() and handed to
+    every callback, such as a function feeding a metrics system. Queries taking at least `slow_query_s` seconds
+    are logged as warnings on the "cameras_db.slow_queries" logger with their EXPLAIN QUERY PLAN, whose "SCAN"
+    lines without an index are the full scans to look at.
+
+    Controllers without metrics only test that their `metrics` attribute is None, so instrumentation costs
+    nothing until it is enabled. It is safe to share between threads and controllers.
+
+    Args:
+        slow_query_s (Optional[float]): The duration, in seconds, from which a query is logged, None to log none.
+        callbacks (Iterable[Callable[[QueryEvent], None]]): Functions called with every event.
+        max_events (int): The number of recent events kept.
+        logger (Optional[logging.Logger]): The logger of slow queries, SLOW_QUERY_LOGGER by default.
+    """
+
+    def __init__(
+            self,
+            slow_query_s: Optional[float] = None,
+            callbacks: Iterable[Callable[[QueryEvent], None]] = (),
+            max_events: int = 1000,
+            logger: Optional[logging.Logger] = None,
+    ):
+        self.slow_query_s = slow_query_s
+        self.callbacks = list(callbacks)
+        self.logger = logger or SLOW_QUERY_LOGGER
+        self._events: "deque[QueryEvent]" = deque(maxlen=max_events)
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback: Callable[[QueryEvent], None]) -> None:
+        """
+        Calls `callback` with every event from now on.
+        """
+        self.callbacks.append(callback)
+
+    def record(self, conn, event: QueryEvent, params: Sequence = ()) -> None:
+        """
+        Records an event of a query run on `conn` with `params`, explaining and logging it when it is slow.
+        """
+        if self.slow_query_s is not None and not event.cached and event.total_s >= self.slow_query_s:
+            event.plan = QueryMetrics.explain(conn, event.sql, params)
+            self.log_slow_query(event)
+
+        with self._lock:
+            self._events.append(event)
+            totals = self._totals.get(event.method)
+            if totals is None:
+                totals = self._totals[event.method] = dict.fromkeys(
+                    ("calls", "cached", "rows", "execute_s", "fetch_s", "materialize_s", "total_s"), 0
+                )
+            totals["calls"] += 1
+            totals["cached"] += event.cached
+            totals["rows"] += event.rows
+            totals["execute_s"] += event.execute_s
+            totals["fetch_s"] += event.fetch_s
+            totals["materialize_s"] += event.materialize_s
+            totals["total_s"] += event.total_s
+
+        for callback in self.callbacks:
+            callback(event)
+
+    @staticmethod
+    def explain(conn, sql: str, params: Sequence = ()) -> List[str]:
+        """
+        Returns the EXPLAIN QUERY PLAN details of a query, one line per step, indented by depth, or the error
+        that prevented explaining it.
+        """
+        try:
+            steps = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        except Exception as e:  # the plan is a diagnostic, it must never fail the query it explains
+            return [f"EXPLAIN QUERY PLAN failed: {e}"]
+
+        depths = {0: -1}
+        lines = []
+        for step_id, parent_id, _, detail in steps:
+            depths[step_id] = depths.get(parent_id, -1) + 1
+            lines.append("  " * depths[step_id] + detail)
+        return lines
+
+    @staticmethod
+    def full_scans(plan: Optional[Sequence[str]]) -> List[str]:
+        """
+        Returns the steps of a query plan that scan a whole table without an index, such as "SCAN cameras".
+        """
+        return [step.strip() for step in plan or () if step.strip().startswith("SCAN ") and " USING " not in step]
+
+    def log_slow_query(self, event: QueryEvent) -> None:
+        full_scans = QueryMetrics.full_scans(event.plan)
+        self.logger.warning(
+            "Slow query in %s: %.1f ms (execute %.1f ms, fetch %.1f ms, materialize %.1f ms), %d rows, "
+            "%d parameters%s\n%s\nQuery plan:\n%s",
+            event.method,
+            event.total_s * 1000,
+            event.execute_s * 1000,
+            event.fetch_s * 1000,
+            event.materialize_s * 1000,
+            event.rows,
+            event.param_count,
+            f", full scan: {', '.join(full_scans)}" if full_scans else "",
+            event.sql,
+            "\n".join(event.plan or ()),
+        )
+
+    def events(self) -> List[QueryEvent]:
+        """
+        Returns the most recent events, oldest first.
+        """
+        with self._lock:
+            return list(self._events)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the calls, cache hits, rows and seconds spent executing, fetching and materializing of every
+        method since the metrics were created or cleared.
+        """
+        with self._lock:
+            return {method: dict(totals) for method, totals in self._totals.items()}
+
+    def clear(self) -> None:
+        """
+        Drops every event and total.
+        """
+        with self._lock:
+            self._events.clear()
+            self._totals.clear()
+
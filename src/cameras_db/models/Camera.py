@@ -59,6 +59,16 @@ class Camera:
             battery: Optional[str] = None,
             weight: Optional[float] = None,
             dimensions: Optional[str] = None,
+            weight_g: Optional[float] = None,
+            screen_size_in: Optional[float] = None,
+            min_shutter_s: Optional[float] = None,
+            max_shutter_s: Optional[float] = None,
+            max_aperture_wide: Optional[float] = None,
+            max_aperture_tele: Optional[float] = None,
+            dimensions_w_mm: Optional[float] = None,
+            dimensions_h_mm: Optional[float] = None,
+            dimensions_d_mm: Optional[float] = None,
+            content_hash: Optional[str] = None,
     ) -> None:
         self.brand = brand
         self.model = model
@@ -111,6 +121,16 @@ class Camera:
         self.battery = battery
         self.weight = weight
         self.dimensions = dimensions
+        self.weight_g = weight_g
+        self.screen_size_in = screen_size_in
+        self.min_shutter_s = min_shutter_s
+        self.max_shutter_s = max_shutter_s
+        self.max_aperture_wide = max_aperture_wide
+        self.max_aperture_tele = max_aperture_tele
+        self.dimensions_w_mm = dimensions_w_mm
+        self.dimensions_h_mm = dimensions_h_mm
+        self.dimensions_d_mm = dimensions_d_mm
+        self.content_hash = content_hash
 
     def diagonal_size_mm(self) -> float:
         """Calculate the diagonal size of the sensor in millimeters."""
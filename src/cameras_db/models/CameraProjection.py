@@ -0,0 +1,32 @@
+from collections import namedtuple
+from functools import lru_cache
+from typing import Tuple, Type
+
+from cameras_db.models.Camera import Camera
+
+
+@lru_cache(maxsize=128)
+def camera_projection(fields: Tuple[str, ...]) -> Type[tuple]:
+    """
+    Returns the lightweight result type of a query projected onto `fields`.
+
+    It is a named tuple with one attribute per field, in order. `diagonal_size_mm()`, `diagonal_size_px()` and
+    `sensor` work as on Camera as long as the fields they use are part of the projection. Types are cached per
+    tuple of fields.
+
+    Args:
+        fields (Tuple[str, ...]): The projected column names.
+
+    Returns:
+        Type[tuple]: The CameraProjection type for those fields.
+    """
+    return type(
+        "CameraProjection",
+        (namedtuple("CameraProjection", fields),),
+        {
+            "__slots__": (),
+            "diagonal_size_mm": Camera.diagonal_size_mm,
+            "diagonal_size_px": Camera.diagonal_size_px,
+            "sensor": Camera.sensor,
+        },
+    )
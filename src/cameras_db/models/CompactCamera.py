@@ -0,0 +1,48 @@
+import inspect
+from typing import Callable, Sequence
+
+from cameras_db.models.Camera import Camera
+
+# The parameters of the Camera constructor, one per attribute of a camera
+CAMERA_PARAMETERS = tuple(inspect.signature(Camera.__init__).parameters.values())[1:]
+
+
+def compile_init(parameters: Sequence[inspect.Parameter]) -> Callable[..., None]:
+    """
+    Compiles an __init__ taking `parameters`, with their defaults, and assigning each to the attribute of the same
+    name, the way CamerasController.camera_row_factory compiles its factories.
+
+    Args:
+        parameters (Sequence[inspect.Parameter]): The parameters, in order.
+
+    Returns:
+        Callable[..., None]: The __init__ function.
+    """
+    namespace = {"defaults": {parameter.name: parameter.default for parameter in parameters}}
+    arguments = [
+        parameter.name if parameter.default is inspect.Parameter.empty
+        else f"{parameter.name}=defaults[{parameter.name!r}]"
+        for parameter in parameters
+    ]
+    assignments = [f"    self.{parameter.name} = {parameter.name}\n" for parameter in parameters]
+    exec(f"def __init__(self, {', '.join(arguments)}):\n{''.join(assignments)}", namespace)
+    return namespace["__init__"]
+
+
+class CompactCamera:
+    """
+    A memory-lean camera.
+
+    Holds the same attributes as Camera in __slots__ instead of a per-instance __dict__, which takes roughly a third
+    of the memory per camera. Attributes can be read and set but not added. The slots and the constructor are
+    derived from the signature of Camera.__init__, so both classes always take the same arguments.
+    """
+    __slots__ = tuple(parameter.name for parameter in CAMERA_PARAMETERS)
+
+    __init__ = compile_init(CAMERA_PARAMETERS)
+    __init__.__signature__ = inspect.signature(Camera.__init__)
+    __init__.__qualname__ = "CompactCamera.__init__"
+
+    diagonal_size_mm = Camera.diagonal_size_mm
+    diagonal_size_px = Camera.diagonal_size_px
+    sensor = Camera.sensor
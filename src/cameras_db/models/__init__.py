@@ -1 +1,3 @@
 from cameras_db.models import Camera
+from cameras_db.models import CompactCamera
+from cameras_db.models import CameraProjection
@@ -0,0 +1,85 @@
+import base64
+import hashlib
+import json
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+# The sort key of pages when none is given, served by the unique index on (brand, model)
+DEFAULT_ORDER_BY = ("brand", "model")
+DEFAULT_PAGE_SIZE = 50
+
+# A sort key, as (column, descending) pairs
+SortKey = Tuple[Tuple[str, bool], ...]
+
+
+class Page:
+    """
+    One page of a keyset paginated query, see CamerasController.get_page.
+
+    Attributes:
+        cameras (List): The cameras of the page, in the order of the sort key.
+        next_token (Optional[str]): The token of the next page, None on the last one.
+    """
+
+    __slots__ = ("cameras", "next_token")
+
+    def __init__(self, cameras: List, next_token: Optional[str] = None):
+        self.cameras = cameras
+        self.next_token = next_token
+
+    def __iter__(self) -> Iterator:
+        return iter(self.cameras)
+
+    def __len__(self) -> int:
+        return len(self.cameras)
+
+    def __repr__(self) -> str:
+        return f"Page(cameras={len(self.cameras)}, next_token={self.next_token!r})"
+
+
+def sort_key(order_by: Sequence[str], unique: bool = True) -> SortKey:
+    """
+    Returns the sort key of `order_by`, field names with a "-" prefix for descending order, ended by rowid when
+    `unique` so that no two rows share a key. Field names are validated by the QueryBuilder compiling the key.
+    """
+    if isinstance(order_by, str):
+        order_by = (order_by,)
+    key = tuple((field[1:], True) if field.startswith("-") else (field, False) for field in order_by)
+    if not key:
+        raise ValueError("At least one order_by field is required")
+    if unique and "rowid" not in (field for field, _ in key):
+        key += (("rowid", key[-1][1]),)
+    return key
+
+
+def query_digest(query: str, params: Sequence[Any]) -> str:
+    """
+    Returns a short digest of a filter query and its parameters, carried by page tokens so that a token is only
+    accepted by the query that issued it.
+    """
+    return hashlib.blake2b(repr((query, list(params))).encode(), digest_size=8).hexdigest()
+
+
+def encode_page_token(key: SortKey, digest: str, values: Sequence[Any]) -> str:
+    """
+    Returns the opaque token of the page after the row whose sort key columns hold `values`.
+    """
+    payload = json.dumps([digest, [[field, descending] for field, descending in key], list(values)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_page_token(token: str, key: SortKey, digest: str) -> List[Any]:
+    """
+    Returns the sort key values of a token from encode_page_token.
+
+    Raises:
+        ValueError: If the token is malformed or was issued for another query or sort key.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        token_digest, token_key, values = json.loads(payload)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid page token: {token!r}") from e
+
+    if token_digest != digest or [tuple(field) for field in token_key] != list(key) or len(values) != len(key):
+        raise ValueError("The page token was issued for another query or sort order")
+    return values
@@ -0,0 +1,25 @@
+import atexit
+from contextlib import ExitStack
+from functools import lru_cache
+from importlib import resources
+from pathlib import Path
+
+# The database shipped inside the cameras_db package
+DB_FILENAME = "cameras_db.db"
+
+_extracted = ExitStack()
+atexit.register(_extracted.close)
+
+
+@lru_cache(maxsize=None)
+def default_db_path() -> str:
+    """
+    Returns the path of the cameras_db.db packaged with cameras_db, found through importlib.resources.
+
+    When the package is imported from a zip file, the database is extracted once to a temporary file, removed
+    when the process exits, as SQLite can only open files.
+    """
+    resource = resources.files(__package__).joinpath(DB_FILENAME)
+    if isinstance(resource, Path):
+        return str(resource)
+    return str(_extracted.enter_context(resources.as_file(resource)))
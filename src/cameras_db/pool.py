@@ -0,0 +1,175 @@
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+from sqlite3 import Connection
+from typing import Optional
+
+from cameras_db.controllers import CamerasController
+from cameras_db.instrumentation import QueryMetrics
+from cameras_db.paths import default_db_path
+
+
+class PooledCamerasController(CamerasController):
+    """
+    A CamerasController checked out of a CamerasControllerPool.
+
+    It owns its connection and cursor until it is closed, which returns the connection to the pool instead of
+    closing it. Use it from one thread at a time.
+    """
+
+    def __init__(self, pool: "CamerasControllerPool", conn: Connection):
+        super().__init__(pool.db_path, check_same_thread=False, metrics=pool.metrics)
+        self.pool = pool
+        self.conn = conn
+        self.cursor = conn.cursor()
+
+    @property
+    def conn(self) -> Connection:
+        """
+        The pooled connection, never reopened once returned to the pool.
+        """
+        if self._conn is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a controller returned to its pool.")
+        return self._conn
+
+    @conn.setter
+    def conn(self, conn: Optional[Connection]) -> None:
+        self._conn = conn
+
+    def close(self):
+        """
+        Returns the connection to the pool.
+
+        Returns:
+            None
+        """
+        self.pool.release(self)
+
+
+class CamerasControllerPool:
+    """
+    A bounded pool of read-only connections to a cameras database, safe to share between threads.
+
+    Every checkout gets its own connection and cursor, so threads never share a cursor. At most `size`
+    connections are open at once, `acquire` blocks for up to `timeout` seconds when all of them are checked out.
+
+    Example:
+        pool = CamerasControllerPool("cameras_db.db", size=32)
+        with pool.acquire() as controller:
+            cameras = controller.get_by_field("brand", "Canon")
+    """
+
+    def __init__(
+            self,
+            db_path: Optional[str] = None,
+            size: int = 8,
+            timeout: Optional[float] = None,
+            metrics: Optional[QueryMetrics] = None,
+    ):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.db_path = db_path if db_path is not None else default_db_path()
+        self.size = size
+        self.timeout = timeout
+        # Shared by every checked out controller
+        self.metrics = metrics
+        self._uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        self._idle: "queue.LifoQueue[Connection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        # Guards _closed against the idle queue, so no connection is left open by a release racing close
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def acquire(self) -> PooledCamerasController:
+        """
+        Checks a controller out of the pool, opening a new connection when no idle one is available.
+
+        Raises:
+            TimeoutError: If no connection was released within `timeout` seconds.
+            RuntimeError: If the pool is closed.
+
+        Returns:
+            PooledCamerasController: A controller to close, or use as a context manager, once done.
+        """
+        if self._closed:
+            raise RuntimeError("The pool is closed")
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"No connection to {self.db_path} was released within {self.timeout} seconds")
+
+        with self._lock:
+            closed = self._closed
+            try:
+                conn = None if closed else self._idle.get_nowait()
+            except queue.Empty:
+                conn = None
+        if closed:
+            self._slots.release()
+            raise RuntimeError("The pool is closed")
+
+        if conn is None:
+            try:
+                conn = self.connect()
+            except BaseException:
+                self._slots.release()
+                raise
+
+        return PooledCamerasController(self, conn)
+
+    def release(self, controller: PooledCamerasController) -> None:
+        """
+        Returns the connection of a checked out controller to the pool. Releasing it twice does nothing.
+
+        Returns:
+            None
+        """
+        conn = controller._conn
+        if conn is None:
+            return
+        if controller._cursor is not None:
+            controller._cursor.close()
+        controller.conn = None
+        controller.cursor = None
+
+        with self._lock:
+            if not self._closed:
+                self._idle.put(conn)
+                conn = None
+        if conn is not None:
+            conn.close()
+        self._slots.release()
+
+    def connect(self) -> Connection:
+        """
+        Opens a read-only connection usable from whichever thread checks it out.
+
+        Returns:
+            Connection: The new connection.
+        """
+        conn = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def close(self) -> None:
+        """
+        Closes the idle connections. Connections still checked out are closed when they are released.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._closed = True
+            idle = []
+            while True:
+                try:
+                    idle.append(self._idle.get_nowait())
+                except queue.Empty:
+                    break
+        for conn in idle:
+            conn.close()
+
+    def __enter__(self) -> "CamerasControllerPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
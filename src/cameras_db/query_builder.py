@@ -0,0 +1,371 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from cameras_db.constants import CAMERA_COLUMNS
+from cameras_db.pagination import SortKey, sort_key
+
+# Accepted operators, with the canonical spelling each one is written as
+OPERATORS = {
+    "=": "=",
+    "==": "=",
+    "!=": "!=",
+    "<>": "!=",
+    "<": "<",
+    "<=": "<=",
+    ">": ">",
+    ">=": ">=",
+    "LIKE": "LIKE",
+    "NOT LIKE": "NOT LIKE",
+    "GLOB": "GLOB",
+    "NOT GLOB": "NOT GLOB",
+    "IS": "IS",
+    "IS NOT": "IS NOT",
+}
+
+
+class QueryBuilder:
+    """
+    Builds the SQL of the CamerasController queries from validated, canonical condition shapes.
+
+    Field names are checked against the columns of CREATE_CAMERA_TABLE_QUERY and operators against OPERATORS, so
+    nothing but known identifiers is ever interpolated into the SQL. Conditions are sorted and operators spelled
+    one way, so equivalent shapes, such as the same fields in another order, produce the same SQL text. That text
+    is kept in an LRU keyed by the shape, and because sqlite3 caches compiled statements per SQL text, a repeated
+    shape skips both building and parsing.
+
+    It is safe to share between threads.
+    """
+
+    def __init__(self, columns: Sequence[str] = CAMERA_COLUMNS, cache_size: int = 256):
+        self.columns = frozenset(columns)
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def validate_field(self, field: str) -> str:
+        """
+        Returns `field` if it is a column of the cameras table.
+
+        Raises:
+            ValueError: If it is not.
+        """
+        if field not in self.columns:
+            raise ValueError(f"Unknown field: {field!r}")
+        return field
+
+    def validate_sort_field(self, field: str) -> str:
+        """
+        Returns `field` if it is a column of the cameras table or rowid.
+
+        Raises:
+            ValueError: If it is neither.
+        """
+        return field if field == "rowid" else self.validate_field(field)
+
+    @staticmethod
+    def canonical_operator(operator: str) -> str:
+        """
+        Returns the canonical spelling of `operator`.
+
+        Raises:
+            ValueError: If it is not in OPERATORS.
+        """
+        canonical = OPERATORS.get(" ".join(str(operator).upper().split()))
+        if canonical is None:
+            raise ValueError(f"Unsupported operator: {operator!r}")
+        return canonical
+
+    def select(self, fields: Optional[Sequence[str]] = None) -> str:
+        """
+        Returns the SELECT clause reading `fields` from the cameras table, or every column when it is None.
+        """
+        shape = ("SELECT", tuple(fields) if fields is not None else None)
+        return self._cached(shape)
+
+    def where(
+            self,
+            conditions: Iterable[Tuple[str, str, Any]],
+            separator: str = "AND",
+            fields: Optional[Sequence[str]] = None,
+            order_by: Optional[Sequence[str]] = None,
+    ) -> Tuple[str, List[Any]]:
+        """
+        Builds a SELECT over the cameras table filtered by `conditions`.
+
+        Args:
+            conditions (Iterable[Tuple[str, str, Any]]): (field, operator, value) triples. Without any, every row
+            is selected.
+            separator (str): "AND" or "OR", how the conditions are combined.
+            fields (Optional[Sequence[str]]): The columns to read, every column by default.
+            order_by (Optional[Sequence[str]]): The fields to sort by, "-" prefixed for descending order, such as
+            ["brand", "-year"]. Unordered by default.
+
+        Raises:
+            ValueError: If a field, operator or separator is not supported.
+
+        Returns:
+            Tuple[str, List[Any]]: The SQL and its parameters.
+        """
+        conditions = sorted(conditions, key=lambda condition: (str(condition[0]), str(condition[1])))
+        separator = str(separator).strip().upper() if len(conditions) > 1 else "AND"
+        shape = (
+            "WHERE",
+            tuple(fields) if fields is not None else None,
+            separator,
+            tuple((field, operator) for field, operator, _ in conditions),
+            sort_key(order_by, unique=False) if order_by else None,
+        )
+        return self._cached(shape), [value for _, _, value in conditions]
+
+    def page(
+            self,
+            conditions: Iterable[Tuple[str, str, Any]],
+            separator: str,
+            fields: Optional[Sequence[str]],
+            key: SortKey,
+            after: Optional[Sequence[Any]],
+            limit: int,
+    ) -> Tuple[str, List[Any]]:
+        """
+        Builds the SELECT of one page of a keyset paginated query: the rows matching `conditions` that sort after
+        the `after` values of the `key` columns, in `key` order, at most `limit` of them.
+
+        The columns of `key` are read last, as page_key_0, page_key_1... so the token of the next page can be built
+        from the last row, whatever `fields` are. The page starts with a range on the sort key instead of skipping
+        rows like OFFSET, so with an index over the key, such as (brand, model, rowid), every page costs the same.
+
+        Args:
+            conditions (Iterable[Tuple[str, str, Any]]): (field, operator, value) triples, as for where().
+            separator (str): "AND" or "OR", how the conditions are combined.
+            fields (Optional[Sequence[str]]): The columns to read, every column by default.
+            key (SortKey): The sort key from pagination.sort_key(), ending with rowid.
+            after (Optional[Sequence[Any]]): The key values of the last row of the previous page, None for the
+            first page.
+            limit (int): The maximum number of rows.
+
+        Raises:
+            ValueError: If a field, operator or separator is not supported.
+
+        Returns:
+            Tuple[str, List[Any]]: The SQL and its parameters.
+        """
+        conditions = sorted(conditions, key=lambda condition: (str(condition[0]), str(condition[1])))
+        separator = str(separator).strip().upper() if len(conditions) > 1 else "AND"
+        shape = (
+            "PAGE",
+            tuple(fields) if fields is not None else None,
+            separator,
+            tuple((field, operator) for field, operator, _ in conditions),
+            tuple(key),
+            tuple(value is None for value in after) if after is not None else None,
+        )
+        params = [value for _, _, value in conditions]
+        if after is not None:
+            params.extend(QueryBuilder.keyset_params(key, after))
+        params.append(limit)
+        return self._cached(shape), params
+
+    def facet(
+            self,
+            conditions: Iterable[Tuple[str, str, Any]],
+            separator: str,
+            field: str,
+            limit: Optional[int] = None,
+    ) -> Tuple[str, List[Any]]:
+        """
+        Builds the GROUP BY counting the rows matching `conditions` per value of `field`, most frequent first, the
+        `limit` most frequent ones when given.
+
+        Raises:
+            ValueError: If a field, operator or separator is not supported.
+
+        Returns:
+            Tuple[str, List[Any]]: The SQL, returning (value, count) rows, and its parameters.
+        """
+        conditions = sorted(conditions, key=lambda condition: (str(condition[0]), str(condition[1])))
+        separator = str(separator).strip().upper() if len(conditions) > 1 else "AND"
+        shape = (
+            "FACET",
+            field,
+            separator,
+            tuple((field, operator) for field, operator, _ in conditions),
+            limit is not None,
+        )
+        params = [value for _, _, value in conditions]
+        if limit is not None:
+            params.append(limit)
+        return self._cached(shape), params
+
+    def aggregate(
+            self,
+            conditions: Iterable[Tuple[str, str, Any]],
+            separator: str,
+            range_fields: Sequence[str],
+    ) -> Tuple[str, List[Any]]:
+        """
+        Builds the SELECT of the number of rows matching `conditions` and the minimum and maximum of the numeric
+        values of every field of `range_fields` over them, in one pass.
+
+        Raises:
+            ValueError: If a field, operator or separator is not supported.
+
+        Returns:
+            Tuple[str, List[Any]]: The SQL, returning one (count, min, max, min, max...) row, and its parameters.
+        """
+        conditions = sorted(conditions, key=lambda condition: (str(condition[0]), str(condition[1])))
+        separator = str(separator).strip().upper() if len(conditions) > 1 else "AND"
+        shape = (
+            "AGGREGATE",
+            tuple(range_fields),
+            separator,
+            tuple((field, operator) for field, operator, _ in conditions),
+        )
+        return self._cached(shape), [value for _, _, value in conditions]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the hits, misses and current size of the statement cache.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._cache)}
+
+    def clear(self) -> None:
+        """
+        Empties the statement cache and resets its counters.
+        """
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _cached(self, shape: tuple) -> str:
+        with self._lock:
+            sql = self._cache.get(shape)
+            if sql is not None:
+                self._cache.move_to_end(shape)
+                self.hits += 1
+                return sql
+
+        # Compiled outside the lock, a shape built twice by racing threads is harmless
+        sql = self._compile(shape)
+        with self._lock:
+            self.misses += 1
+            self._cache[shape] = sql
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return sql
+
+    def _compile(self, shape: tuple) -> str:
+        if shape[0] == "SELECT":
+            fields = shape[1]
+            if fields is None:
+                return "SELECT cameras.*"
+            if not fields:
+                raise ValueError("At least one field is required")
+            return "SELECT " + ", ".join(f"cameras.{self.validate_field(field)}" for field in fields)
+
+        if shape[0] == "FACET":
+            _, field, separator, conditions, limited = shape
+            field = self.validate_field(field)
+            query = f"SELECT cameras.{field}, COUNT(*) FROM cameras"
+            if conditions:
+                query += " WHERE " + self._conditions(separator, conditions)
+            query += f" GROUP BY cameras.{field} ORDER BY COUNT(*) DESC, cameras.{field}"
+            return query + " LIMIT ?" if limited else query
+
+        if shape[0] == "AGGREGATE":
+            _, range_fields, separator, conditions = shape
+            # Text left in numeric columns by older imports, such as "9,3", is not part of the range
+            columns = [
+                f"{function}(CASE WHEN typeof(cameras.{field}) IN ('integer', 'real') THEN cameras.{field} END)"
+                for field in map(self.validate_field, range_fields)
+                for function in ("MIN", "MAX")
+            ]
+            query = f"SELECT {', '.join(['COUNT(*)'] + columns)} FROM cameras"
+            if conditions:
+                query += " WHERE " + self._conditions(separator, conditions)
+            return query
+
+        if shape[0] == "PAGE":
+            _, fields, separator, conditions, key, after_nulls = shape
+            columns = ", ".join(
+                f"cameras.{self.validate_sort_field(field)} AS page_key_{index}" for index, (field, _) in enumerate(key)
+            )
+            query = f"{self.select(fields)}, {columns} FROM cameras"
+            where = [f"({self._conditions(separator, conditions)})"] if conditions else []
+            if after_nulls is not None:
+                where.append(QueryBuilder.keyset_condition(key, after_nulls))
+            if where:
+                query += " WHERE " + " AND ".join(where)
+            return f"{query} {QueryBuilder.order_by_clause(key)} LIMIT ?"
+
+        _, fields, separator, conditions, order = shape
+        query = self.select(fields) + " FROM cameras"
+        if conditions:
+            query += " WHERE " + self._conditions(separator, conditions)
+        if order:
+            for field, _ in order:
+                self.validate_sort_field(field)
+            query += " " + QueryBuilder.order_by_clause(order)
+        return query
+
+    def _conditions(self, separator: str, conditions: Sequence[Tuple[str, str]]) -> str:
+        if separator not in ("AND", "OR"):
+            raise ValueError(f"Unsupported separator: {separator!r}")
+        return f" {separator} ".join(
+            f"{self.validate_field(field)} {self.canonical_operator(operator)} ?" for field, operator in conditions
+        )
+
+    @staticmethod
+    def order_by_clause(key: SortKey) -> str:
+        return "ORDER BY " + ", ".join(
+            f"cameras.{field} DESC" if descending else f"cameras.{field}" for field, descending in key
+        )
+
+    @staticmethod
+    def keyset_condition(key: SortKey, after_nulls: Sequence[bool]) -> str:
+        """
+        Returns the condition of the rows sorting after a row of `key` values, whose NULL ones are `after_nulls`.
+
+        SQLite sorts NULL first in ascending order and last in descending order. An ascending key without NULL is
+        the row value comparison (a, b, rowid) > (?, ?, ?), which SQLite turns into an index range. Other keys are
+        expanded into "a after ? OR (a IS ? AND b after ?) OR ...", handling NULL on both sides.
+        """
+        if not any(descending for _, descending in key) and not any(after_nulls):
+            columns = ", ".join(f"cameras.{field}" for field, _ in key)
+            return f"({columns}) > ({', '.join(['?'] * len(key))})"
+
+        branches = []
+        for index, ((field, descending), is_null) in enumerate(zip(key, after_nulls)):
+            if descending and is_null:
+                # Nothing sorts after NULL in descending order
+                continue
+            if is_null:
+                after = f"cameras.{field} IS NOT NULL"
+            elif descending:
+                after = f"(cameras.{field} < ? OR cameras.{field} IS NULL)"
+            else:
+                after = f"cameras.{field} > ?"
+            branches.append(" AND ".join([f"cameras.{equal} IS ?" for equal, _ in key[:index]] + [after]))
+        return "(" + " OR ".join(f"({branch})" for branch in branches) + ")" if branches else "0"
+
+    @staticmethod
+    def keyset_params(key: SortKey, after: Sequence[Any]) -> List[Any]:
+        """
+        Returns the parameters of keyset_condition() for the `after` values.
+        """
+        if not any(descending for _, descending in key) and not any(value is None for value in after):
+            return list(after)
+
+        params = []
+        for index, ((_, descending), value) in enumerate(zip(key, after)):
+            if value is None:
+                if not descending:
+                    params.extend(after[:index])
+                continue
+            params.extend(after[:index])
+            params.append(value)
+        return params
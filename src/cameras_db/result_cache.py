@@ -0,0 +1,110 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+MISSING = object()
+
+# The offset and size of the file change counter in the header of an SQLite database, bumped by every commit
+CHANGE_COUNTER_OFFSET = 24
+CHANGE_COUNTER_SIZE = 4
+
+
+def file_version(db_path: str) -> Optional[tuple]:
+    """
+    Returns a token that changes whenever the SQLite database file at `db_path` changes, or None if it cannot be read.
+
+    It combines the inode, modification time and size of the file, which catch the file being replaced, as
+    setup_db.py does when it regenerates it, the file change counter of its header, bumped by every commit in
+    rollback journal mode, and the modification time and size of its write-ahead log, grown by every commit in
+    WAL mode. None of them depend on the connection, so every connection to the file gets the same token.
+    """
+    try:
+        stat = os.stat(db_path)
+        with open(db_path, "rb") as db_file:
+            db_file.seek(CHANGE_COUNTER_OFFSET)
+            change_counter = db_file.read(CHANGE_COUNTER_SIZE)
+    except (OSError, TypeError, ValueError):
+        return None
+    try:
+        wal_stat = os.stat(f"{db_path}-wal")
+        wal_version = (wal_stat.st_mtime_ns, wal_stat.st_size)
+    except OSError:
+        wal_version = None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size, change_counter, wal_version
+
+
+class ResultCache:
+    """
+    An LRU cache of query results with an optional time to live, for CamerasController.
+
+    Every entry is stored with the version of the database it was read from. An entry read back under another
+    version, or older than `ttl` seconds, counts as a miss and is dropped, so results never outlive a change to
+    the database.
+
+    It is safe to share between threads and between controllers over the same database file, snapshots of it
+    included, as their keys start with the file path and the version of a file is the same on every connection.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: Hashable) -> Any:
+        """
+        Returns the value cached for `key` under `version`, or MISSING.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, entry_version, expires_at = entry
+                if entry_version == version and (expires_at is None or time.monotonic() < expires_at):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return MISSING
+
+    def put(self, key: Hashable, version: Hashable, value: Any) -> None:
+        """
+        Caches `value` for `key` under `version`, evicting the least recently used entries beyond `max_size`.
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, version, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Drops every entry and resets the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the hits, misses, evictions and current size of the cache.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
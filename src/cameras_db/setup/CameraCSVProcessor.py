@@ -1,8 +1,39 @@
 import csv
+import io
 import json
+import os
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from html import unescape
-from typing import Dict
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple, Union
+
+from cameras_db import CAMERA_COLUMN_TYPES
+
+# Bytes of CSV records normalized per task by iter_rows_parallel
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Patterns of the field parsers, compiled once
+DECIMAL_PATTERN = re.compile(r"\d+(?:[.,]\d+)?")
+NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+SENSOR_SIZE_PATTERN = re.compile(r"([\d.]+) x ([\d.]+)")
+SENSOR_RESOLUTION_PATTERN = re.compile(r"\d+\.\d+|\d+")
+FRACTION_PATTERN = re.compile(r"(\d+)\s*[/-]\s*(\d+)")
+SECONDS_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*(min)?")
+ISO_NUMBER_PATTERN = re.compile(r"(?<![\d/.])(\d+)(?![\d/.])(?!\s*(?:x|mp|gb|mb|ev)\b)", re.IGNORECASE)
+ISO_RANGE_PATTERN = re.compile(r"\d\s*[-\u2013]\s*\d")
+# Separators of storage types outside parentheses, and what is left around a bare media name
+STORAGE_TYPE_SEPARATOR_PATTERN = re.compile(r"[,/;+]|\band\b")
+STORAGE_TYPE_QUALIFIER_PATTERN = re.compile(
+    r"\([^()]*\)?|\bx\s*\d+(?:\s*slots?)?|\bdual\b|\bslots?\b|\bcards?\b|\)", re.IGNORECASE
+)
+FIELD_SPECIAL_CHARACTERS_PATTERN = re.compile(r"[.()]")
+
+BOOLEAN_VALUES = {"Yes": True, "yes": True, "No": False, "no": False}
+
+# Stores a cleaned field value, None when empty, parsed into the type of its column, and the columns parsed from
+# it into a new row
+Normalizer = Callable[[Dict[str, Any], Optional[str]], None]
 
 
 class CameraCSVProcessor:
@@ -10,6 +41,8 @@ class CameraCSVProcessor:
         self.csv_file_path = csv_file_path
         self.json_data = []
         self.fieldnames = []
+        self._normalizers: Tuple[List[str], List[Tuple[str, Normalizer]]] = ([], [])
+        self._normalized_fieldnames: Optional[List[str]] = None
 
     def open_csv(self) -> None:
         """
@@ -21,7 +54,7 @@ class CameraCSVProcessor:
         Returns:
             None
         """
-        with open(self.csv_file_path, mode="r", encoding="utf-8") as csvfile:
+        with open(self.csv_file_path, mode="r", encoding="utf-8", newline="") as csvfile:
             csvreader = csv.DictReader(csvfile, delimiter=";")
             self.fieldnames = [
                 field.lower().replace(" ", "_") for field in csvreader.fieldnames
@@ -33,9 +66,133 @@ class CameraCSVProcessor:
 
         print(f"File opened and read: {self.csv_file_path}")
 
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """
+        Reads the CSV file lazily, yielding every row as normalized by normalize_row.
+
+        Unlike open_csv, nothing is kept in `json_data`, so rows can be streamed into the database with
+        CameraDBFiller.insert_rows in constant memory.
+
+        Returns:
+            Iterator[Dict[str, Any]]: The normalized rows, in file order.
+        """
+        with open(self.csv_file_path, mode="r", encoding="utf-8", newline="") as csvfile:
+            csvreader = csv.DictReader(csvfile, delimiter=";")
+            self.fieldnames = [
+                field.lower().replace(" ", "_") for field in csvreader.fieldnames
+            ]
+
+            row: Dict[str, str]
+            for row in csvreader:
+                yield self.normalize_row(row)
+
+    def iter_rows_parallel(
+            self, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Reads the CSV file like iter_rows, normalizing its rows in a pool of worker processes.
+
+        The records after the header are split into byte ranges of about `chunk_size` bytes that end on record
+        boundaries, newlines outside quoted fields, found by counting quotes, which runs at I/O speed. Every worker
+        reads and normalizes its own ranges, and the rows are yielded back in file order, with at most two ranges
+        per worker in flight so memory stays bounded however large the file.
+
+        Args:
+            workers (Optional[int]): The number of worker processes, os.cpu_count() by default. With 1, rows are
+            normalized in this process.
+            chunk_size (int): The approximate size of a range, in bytes.
+
+        Returns:
+            Iterator[Dict[str, Any]]: The normalized rows, in file order.
+        """
+        workers = workers or os.cpu_count() or 1
+        with open(self.csv_file_path, mode="rb") as csvfile:
+            header = csvfile.readline()
+            start = csvfile.tell()
+        raw_fieldnames = next(csv.reader([header.decode("utf-8")], delimiter=";"))
+        self.fieldnames = [field.lower().replace(" ", "_") for field in raw_fieldnames]
+        ranges = CameraCSVProcessor.record_ranges(self.csv_file_path, start, chunk_size)
+
+        if workers == 1:
+            for range_start, range_end in ranges:
+                yield from CameraCSVProcessor.normalize_range(
+                    self.csv_file_path, raw_fieldnames, range_start, range_end
+                )
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            try:
+                pending = deque()
+                for range_start, range_end in ranges:
+                    pending.append(executor.submit(
+                        CameraCSVProcessor.normalize_range, self.csv_file_path, raw_fieldnames, range_start, range_end
+                    ))
+                    if len(pending) >= 2 * workers:
+                        yield from pending.popleft().result()
+                while pending:
+                    yield from pending.popleft().result()
+            finally:
+                # Drop the ranges not started yet when the rows are not all consumed
+                executor.shutdown(cancel_futures=True)
+
+    @staticmethod
+    def record_ranges(
+            csv_file_path: str, start: int, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[Tuple[int, int]]:
+        """
+        Splits a CSV file from the record starting at byte `start` into (start, end) byte ranges of whole records.
+
+        A range ends after the last newline of a block of `chunk_size` bytes preceded by an even number of quotes,
+        that is a newline outside any quoted field, so records with quoted newlines are never split.
+
+        Returns:
+            Iterator[Tuple[int, int]]: The byte ranges, in file order.
+        """
+        with open(csv_file_path, mode="rb") as csvfile:
+            csvfile.seek(start)
+            range_start = position = start
+            # Quotes between range_start and position
+            quotes = 0
+            while True:
+                block = csvfile.read(chunk_size)
+                if not block:
+                    break
+
+                newline = block.rfind(b"\n")
+                while newline >= 0 and (quotes + block.count(b'"', 0, newline)) % 2:
+                    newline = block.rfind(b"\n", 0, newline)
+
+                if newline >= 0:
+                    yield range_start, position + newline + 1
+                    range_start = position + newline + 1
+                    quotes = block.count(b'"', newline + 1)
+                else:
+                    quotes += block.count(b'"')
+                position += len(block)
+
+            if range_start < position:
+                yield range_start, position
+
+    @staticmethod
+    def normalize_range(
+            csv_file_path: str, raw_fieldnames: Sequence[str], start: int, end: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Reads the records between bytes `start` and `end` of a CSV file with the header `raw_fieldnames` and
+        returns them normalized by normalize_row. Runs in the worker processes of iter_rows_parallel.
+        """
+        with open(csv_file_path, mode="rb") as csvfile:
+            csvfile.seek(start)
+            text = csvfile.read(end - start).decode("utf-8")
+
+        processor = CameraCSVProcessor(csv_file_path)
+        processor.fieldnames = [field.lower().replace(" ", "_") for field in raw_fieldnames]
+        csvreader = csv.DictReader(io.StringIO(text, newline=""), fieldnames=raw_fieldnames, delimiter=";")
+        return [processor.normalize_row(row) for row in csvreader]
+
     def treat_fields(self, row: Dict[str, str]) -> None:
         """
-        Treats the fields of a given row dictionary.
+        Treats the fields of a given row dictionary with normalize_row and appends the result to `json_data`.
 
         Args:
             row (Dict[str, str]): The dictionary representing a row of data, with field names as keys and values
@@ -43,94 +200,226 @@ class CameraCSVProcessor:
 
         Returns:
             None
+        """
+        self.json_data.append(self.normalize_row(row))
+
+    def normalize_row(self, row: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Treats the fields of a given row dictionary.
+
+        Args:
+            row (Dict[str, str]): The dictionary representing a row of data, with field names as keys and values
+            as values.
+
+        Returns:
+            Dict[str, Any]: The treated row.
 
         Description:
-            This function treats the fields of the given row dictionary by performing various transformations
-            on specific fields.
+            Every value is stripped and HTML unescaped, empty values becoming None, and stored under the column
+            name of its field, such as "focal_length_35mm_equiv" for "Focal length (35mm equiv.)". Every field
+            is then handed to its normalizer, built once per header by field_normalizers, which parses the value
+            into the type of its column and adds the numeric columns parsed from it:
 
-            The function creates a new dictionary, `new_row`, where each field name is transformed according
-            to the specific rules.
+            1. Registered Fields (FIELD_NORMALIZERS):
+               - "sensor_size" ('1/2.5" (~ 5.75 x 4.32 mm)') is kept and parsed into "sensor_size_w"
+               and "sensor_size_h".
+               - "sensor_resolution" ("2579 x 1939") is kept and parsed into "sensor_px_w" and "sensor_px_h".
+               - "iso" ("Auto,50,100") is split by commas into a list.
+               - "weight" ("85 g") is kept and parsed into "weight_g", "screen_size" ('2.36"') into
+               "screen_size_in".
+               - "min_shutter_speed" and "max_shutter_speed" ("1/2 sec", "Bulb+30 sec") are kept and parsed into
+               seconds in "min_shutter_s" and "max_shutter_s".
+               - "max_aperture" ("f2.8 - f4.8") is kept and parsed into "max_aperture_wide"
+               and "max_aperture_tele".
+               - "dimensions" ("93 x 60 x 28 mm") is kept and parsed into "dimensions_w_mm", "dimensions_h_mm"
+               and "dimensions_d_mm".
+               The parsed columns are None when the value can not be parsed.
 
-            The function performs the following transformations:
+            2. REAL Columns:
+               - The first number of the value, with a decimal comma as in "6,02" or a unit as in "4.6x",
+               or None.
 
-            1. Focal Length Transformation:
-               - If the field "focal_length_(35mm_equiv.)" exists in `row`, the function stores its value
-               in the field "focal_length_35" of `new_row` and deletes the original field.
+            3. INTEGER Columns:
+               - "Yes" and "No" become `True` and `False`, digits an int, anything else is kept as is.
 
-            2. Max Aperture Transformation:
-               - If the field "max._aperture_(35mm_equiv.)" exists in `row`, the function stores its value
-               in the field "max_aperture_35" of `new_row` and deletes the original field.
+            4. TEXT Columns, and fields of unknown columns:
+               - "Yes" and "No" become `True` and `False`, as for "gps", anything else is kept as is.
+        """
+        columns, normalizers = self.field_normalizers()
+        new_row = {
+            column: unescape(value.strip()) if value else None
+            for column, value in zip(columns, row.values())
+        }
+        for column, normalize in normalizers:
+            normalize(new_row, new_row[column])
+        return new_row
 
-            3. Sensor Size Transformation:
-               - If the field "sensor_size" exists in `new_row`, the function searches for a pattern of
-               two decimal numbers separated by "x" in the field's value.
-               - If a match is found, the function stores the first decimal number
-               in the field "sensor_size_w" of `new_row`
-               and the second decimal number in the field "sensor_size_h" of `new_row`.
+    def field_normalizers(self) -> Tuple[List[str], List[Tuple[str, Normalizer]]]:
+        """
+        Returns the columns and normalizers build_normalizers gives for `fieldnames`, built again when they change.
+        """
+        if self._normalized_fieldnames is not self.fieldnames:
+            self._normalizers = build_normalizers(self.fieldnames)
+            self._normalized_fieldnames = self.fieldnames
+        return self._normalizers
 
-            4. Sensor Resolution Transformation:
-               - If the field "sensor_resolution" exists in `new_row`, the function searches for all decimal numbers
-                in the field's value.
-               - If at least two decimal numbers are found, the function stores the first decimal number
-               in the field "sensor_px_w" of `new_row` and the second decimal number in the field "sensor_px_h" of `new_row`.
+    @staticmethod
+    def column_key(fieldname: str) -> str:
+        """
+        Returns the column name of a CSV field name, lowercased with special characters removed, such as
+        "focal_length_35mm_equiv" for "Focal length (35mm equiv.)" or "max_aperture" for "max._aperture".
+        """
+        return FIELD_SPECIAL_CHARACTERS_PATTERN.sub("", fieldname.lower().replace(" ", "_")).replace("-", "_")
 
-            5. ISO Transformation:
-               - If the field "iso" exists in `new_row`, the function splits its value by commas
-               and stores the resulting list in the field "iso" of `new_row`.
+    @staticmethod
+    def parse_decimal(value: Optional[str]) -> Optional[float]:
+        """
+        Parses the first number found in a value such as "85 g", '2.36"' or "6,02".
 
-            6. Boolean Transformations:
-               - For each key-value pair in `new_row`, if the value is "Yes" or "yes",
-               the function replaces the value with `True`.
-               - If the value is "No" or "no", the function replaces the value with `False`.
+        Returns:
+            Optional[float]: The number, or None when the value holds no number.
+        """
+        if not value:
+            return None
+        match = DECIMAL_PATTERN.search(value)
+        return float(match.group(0).replace(",", ".")) if match else None
 
-            Finally, the function appends `new_row` to the `json_data` list of the calling object.
+    @staticmethod
+    def parse_sensor_size(value: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
         """
-        new_row = {
-            self.fieldnames[int(i)]: unescape(value.strip()) if value else None
-            for i, (key, value) in enumerate(row.items())
-        }
+        Parses a sensor size such as '1/2.5" (~ 5.75 x 4.32 mm)' or "23.5 x 15.6 mm" into its width and height in
+        millimeters.
+
+        Returns:
+            Tuple[Optional[float], Optional[float]]: The width and height, or Nones when they can not be parsed.
+        """
+        match = SENSOR_SIZE_PATTERN.search(value) if value else None
+        if not match:
+            return None, None
+        return float(match.group(1)), float(match.group(2))
+
+    @staticmethod
+    def parse_sensor_resolution(value: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Parses a sensor resolution such as "2579 x 1939" into its width and height in pixels.
+
+        Returns:
+            Tuple[Optional[int], Optional[int]]: The width and height, or Nones when there are less than two numbers.
+        """
+        matches = SENSOR_RESOLUTION_PATTERN.findall(value) if value else ()
+        if len(matches) < 2:
+            return None, None
+        return int(matches[0]), int(matches[1])
+
+    @staticmethod
+    def parse_seconds(value: Optional[str]) -> Optional[float]:
+        """
+        Parses a shutter speed such as "1/2000 sec", "30 sec", "Bulb+30 sec" or "8min sec" into seconds.
+
+        Returns:
+            Optional[float]: The shutter speed in seconds, or None when it can not be parsed.
+        """
+        if not value:
+            return None
+        fraction = FRACTION_PATTERN.search(value)
+        if fraction:
+            return int(fraction.group(1)) / int(fraction.group(2))
+        seconds = SECONDS_PATTERN.search(value)
+        if not seconds:
+            return None
+        return float(seconds.group(1)) * (60 if seconds.group(2) else 1)
+
+    @staticmethod
+    def parse_aperture_range(value: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+        """
+        Parses a max aperture such as "f2.8 - f4.8" or "f2.8" into its wide and tele f-numbers.
+
+        Returns:
+            Tuple[Optional[float], Optional[float]]: The wide and tele f-numbers, equal for fixed apertures.
+        """
+        if not value:
+            return None, None
+        matches = NUMBER_PATTERN.findall(value)
+        if not matches:
+            return None, None
+        return float(matches[0]), float(matches[-1])
+
+    @staticmethod
+    def parse_dimensions(value: Optional[str]) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        """
+        Parses dimensions such as "93 x 60 x 28 mm" or "92 x 61,5 x 31,5 mm" into width, height and depth in
+        millimeters.
+
+        Returns:
+            Tuple[Optional[float], Optional[float], Optional[float]]: The dimensions, or Nones when there are
+            not exactly three of them.
+        """
+        if not value:
+            return None, None, None
+        matches = DECIMAL_PATTERN.findall(value)
+        if len(matches) != 3:
+            return None, None, None
+        width, height, depth = (float(match.replace(",", ".")) for match in matches)
+        return width, height, depth
+
+    @staticmethod
+    def parse_iso_ranges(iso: Union[List[str], str, None]) -> List[Tuple[Optional[int], Optional[int], int]]:
+        """
+        Parses the ISO settings of a camera into (iso_min, iso_max, is_auto) rows for the camera_iso table.
+
+        Accepts the list produced by treat_fields or its comma joined form. Every "Auto" entry becomes a
+        (None, None, 1) row. An entry with a range, such as "100-25600 (extends to 51200)", becomes one row from its
+        lowest to its highest number, extensions included, (100, 51200, 0), and every other ISO number a row of its
+        own, (200, 200, 0), so a camera has an ISO setting `value` when a row has iso_min <= value <= iso_max.
+        Fractions of EV steps and megapixel or resolution figures are skipped.
+
+        Returns:
+            List[Tuple[Optional[int], Optional[int], int]]: The distinct rows, in the order they were found.
+        """
+        if not iso:
+            return []
+        entries = iso.split(",") if isinstance(iso, str) else iso
 
-        # Focal Length Transformation
-        focal_length = row.get("focal_length_(35mm_equiv.)")
-        if focal_length:
-            new_row["focal_length_35"] = focal_length
-            del new_row["focal_length_(35mm_equiv.)"]
-
-        # Max Aperture Transformation
-        max_aperture = row.get("max._aperture_(35mm_equiv.)")
-        if max_aperture:
-            new_row["max_aperture_35"] = max_aperture
-            del new_row["max._aperture_(35mm_equiv.)"]
-
-        # Sensor Size Transformation
-        sensor_size = new_row.get("sensor_size")
-        if sensor_size:
-            sensor_size_match = re.search(r"([\d.]+) x ([\d.]+)", sensor_size)
-            if sensor_size_match:
-                new_row["sensor_size_w"] = float(sensor_size_match.group(1))
-                new_row["sensor_size_h"] = float(sensor_size_match.group(2))
-
-        # Sensor Resolution Transformation
-        sensor_resolution = new_row.get("sensor_resolution")
-        if sensor_resolution:
-            matches = re.findall(r"\d+\.\d+|\d+", sensor_resolution)
-            if len(matches) > 1:
-                new_row["sensor_px_w"] = int(matches[0])
-                new_row["sensor_px_h"] = int(matches[1])
-
-        # ISO Transformation
-        iso = new_row.get("iso")
-        if iso:
-            new_row["iso"] = [x.strip() for x in iso.split(",")]
-
-        # Boolean Transformations
-        for key, value in new_row.items():
-            if value == "Yes" or value == "yes":
-                new_row[key] = True
-            elif value == "No" or value == "no":
-                new_row[key] = False
-
-        self.json_data.append(new_row)
+        ranges = []
+        for entry in entries:
+            if "auto" in entry.lower():
+                ranges.append((None, None, 1))
+            numbers = [int(number) for number in ISO_NUMBER_PATTERN.findall(entry) if int(number) >= 6]
+            if numbers and ISO_RANGE_PATTERN.search(entry):
+                ranges.append((min(numbers), max(numbers), 0))
+            else:
+                ranges.extend((number, number, 0) for number in numbers)
+
+        return list(dict.fromkeys(ranges))
+
+    @staticmethod
+    def split_storage_types(storage_types: Optional[str]) -> List[str]:
+        """
+        Splits a storage_types value such as "SDHC, Secure Digital" or "SD/SDHC/SDXC x 2 slots" into its distinct
+        media names.
+
+        Types are separated by commas, slashes, semicolons, "+" and "and" outside parentheses, so
+        "PCMCIA (2 x type II / 1 x type III)" stays one type. Each one is then reduced to a bare media name, without
+        its parenthesized qualifiers, "card" and slot counts such as "x 2 slots", "x2" or "Dual": "PCMCIA", "SDXC".
+
+        Returns:
+            List[str]: The storage types, in the order they were found.
+        """
+        if not storage_types:
+            return []
+
+        tokens, depth, start = [], 0, 0
+        for match in re.finditer(r"[()]|" + STORAGE_TYPE_SEPARATOR_PATTERN.pattern, storage_types):
+            separator = match.group(0)
+            if separator in "()":
+                depth = depth + 1 if separator == "(" else max(depth - 1, 0)
+            elif depth == 0:
+                tokens.append(storage_types[start:match.start()])
+                start = match.end()
+        tokens.append(storage_types[start:])
+
+        types = (" ".join(STORAGE_TYPE_QUALIFIER_PATTERN.sub(" ", token).split()) for token in tokens)
+        return list(dict.fromkeys(storage_type for storage_type in types if storage_type))
 
     def convert_to_json(self) -> str:
         """
@@ -140,3 +429,131 @@ class CameraCSVProcessor:
             str: The JSON string representation of the object.
         """
         return json.dumps(self.json_data, ensure_ascii=False, indent=4)
+
+
+def real_normalizer(column: str) -> Normalizer:
+    """
+    Returns the normalizer storing the number of a value, such as 6.02 for "6,02", or None.
+    """
+    parse_decimal = CameraCSVProcessor.parse_decimal
+
+    def normalize(new_row: Dict[str, Any], value: Optional[str]) -> None:
+        new_row[column] = parse_decimal(value)
+    return normalize
+
+
+def integer_normalizer(column: str) -> Normalizer:
+    """
+    Returns the normalizer storing "Yes" and "No" as True and False, digits as an int and anything else as is.
+    """
+    def normalize(new_row: Dict[str, Any], value: Optional[str]) -> None:
+        if value in BOOLEAN_VALUES:
+            new_row[column] = BOOLEAN_VALUES[value]
+        elif value and value.isdigit():
+            new_row[column] = int(value)
+        else:
+            new_row[column] = value
+    return normalize
+
+
+def boolean_normalizer(column: str) -> Normalizer:
+    """
+    Returns the normalizer storing "Yes" and "No" as True and False and anything else as is.
+    """
+    def normalize(new_row: Dict[str, Any], value: Optional[str]) -> None:
+        if value in BOOLEAN_VALUES:
+            new_row[column] = BOOLEAN_VALUES[value]
+    return normalize
+
+
+def list_normalizer(column: str) -> Normalizer:
+    """
+    Returns the normalizer storing the stripped comma-separated items of a value as a list.
+    """
+    def normalize(new_row: Dict[str, Any], value: Optional[str]) -> None:
+        new_row[column] = [item.strip() for item in value.split(",")] if value else value
+    return normalize
+
+
+def parsed_normalizer(
+        column: str, parsed_columns: Tuple[str, ...], parse: Callable[[Optional[str]], Any]
+) -> Normalizer:
+    """
+    Returns the normalizer storing a value as is and what `parse` returns for it into `parsed_columns`, a tuple
+    of values when there are several.
+    """
+    if len(parsed_columns) == 1:
+        parsed_column, = parsed_columns
+
+        def normalize(new_row: Dict[str, Any], value: Optional[str]) -> None:
+            new_row[column] = value
+            new_row[parsed_column] = parse(value)
+    else:
+        def normalize(new_row: Dict[str, Any], value: Optional[str]) -> None:
+            new_row[column] = value
+            new_row.update(zip(parsed_columns, parse(value)))
+    return normalize
+
+
+# Normalizers of the fields not stored as the type of their column alone, by column
+FIELD_NORMALIZERS: Dict[str, Normalizer] = {
+    "sensor_size": parsed_normalizer(
+        "sensor_size", ("sensor_size_w", "sensor_size_h"), CameraCSVProcessor.parse_sensor_size
+    ),
+    "sensor_resolution": parsed_normalizer(
+        "sensor_resolution", ("sensor_px_w", "sensor_px_h"), CameraCSVProcessor.parse_sensor_resolution
+    ),
+    "iso": list_normalizer("iso"),
+    "weight": parsed_normalizer("weight", ("weight_g",), CameraCSVProcessor.parse_decimal),
+    "screen_size": parsed_normalizer("screen_size", ("screen_size_in",), CameraCSVProcessor.parse_decimal),
+    "min_shutter_speed": parsed_normalizer(
+        "min_shutter_speed", ("min_shutter_s",), CameraCSVProcessor.parse_seconds
+    ),
+    "max_shutter_speed": parsed_normalizer(
+        "max_shutter_speed", ("max_shutter_s",), CameraCSVProcessor.parse_seconds
+    ),
+    "max_aperture": parsed_normalizer(
+        "max_aperture", ("max_aperture_wide", "max_aperture_tele"), CameraCSVProcessor.parse_aperture_range
+    ),
+    "dimensions": parsed_normalizer(
+        "dimensions", ("dimensions_w_mm", "dimensions_h_mm", "dimensions_d_mm"), CameraCSVProcessor.parse_dimensions
+    ),
+}
+
+
+def parsed_columns() -> FrozenSet[str]:
+    """
+    Returns the columns FIELD_NORMALIZERS parse out of another field, such as "weight_g" out of "weight", which are
+    not fields of the CSV.
+    """
+    new_row: Dict[str, Any] = {}
+    for normalize in FIELD_NORMALIZERS.values():
+        normalize(new_row, None)
+    return frozenset(new_row.keys() - FIELD_NORMALIZERS.keys())
+
+
+# The columns of the table that are not fields of the CSV, filled by the normalizers of other fields
+PARSED_COLUMNS = parsed_columns()
+
+# Normalizer factories of the column types
+TYPE_NORMALIZERS: Dict[str, Callable[[str], Normalizer]] = {
+    "REAL": real_normalizer,
+    "INTEGER": integer_normalizer,
+    "TEXT": boolean_normalizer,
+}
+
+
+def build_normalizers(fieldnames: Sequence[str]) -> Tuple[List[str], List[Tuple[str, Normalizer]]]:
+    """
+    Returns the column of every field of a CSV header, and its (column, normalizer): the normalizer
+    FIELD_NORMALIZERS registers for the column, or else the one of its type in CAMERA_COLUMN_TYPES, TEXT for the
+    columns not in the table.
+    """
+    columns = [CameraCSVProcessor.column_key(fieldname) for fieldname in fieldnames]
+    normalizers = []
+    for column in columns:
+        normalizer = FIELD_NORMALIZERS.get(column)
+        if normalizer is None:
+            normalizer = TYPE_NORMALIZERS[CAMERA_COLUMN_TYPES.get(column, "TEXT")](column)
+        normalizers.append((column, normalizer))
+    return columns, normalizers
@@ -1,8 +1,27 @@
 import csv
+import hashlib
 import sqlite3
-from typing import Dict
+from functools import lru_cache
+from itertools import groupby, islice
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
 
-from cameras_db import CREATE_CAMERA_TABLE_QUERY
+from cameras_db import (
+    CAMERA_COLUMNS,
+    CAMERA_COLUMN_TYPES,
+    CREATE_CAMERA_TABLE_QUERY,
+    CREATE_CAMERA_FTS_TABLE_QUERY,
+    CREATE_CAMERA_FTS_TRIGGERS_QUERY,
+    REBUILD_CAMERA_FTS_QUERY,
+    CREATE_CAMERA_CHILD_TABLES_QUERY,
+    CREATE_CAMERA_INDEXES_QUERY,
+    CREATE_CAMERA_UNIQUE_KEY_QUERY,
+    REMOVE_DUPLICATE_CAMERAS_QUERY,
+)
+from cameras_db.exif import brand_key, brand_keys, camera_aliases
+from cameras_db.setup.CameraCSVProcessor import PARSED_COLUMNS, CameraCSVProcessor
+
+# Rows sent to the database per executemany call by insert_rows
+DEFAULT_IMPORT_BATCH_SIZE = 1000
 
 
 class CameraDBFiller:
@@ -12,6 +31,8 @@ class CameraDBFiller:
         self.csv_file_path = csv_file_path
         self.conn = None
         self.cursor = None
+        # The brand keys the camera_aliases rows were computed with, see update_aliases
+        self.alias_brands: Optional[FrozenSet[str]] = None
 
     def connect_db(self) -> None:
         """
@@ -80,6 +101,20 @@ class CameraDBFiller:
         - sensor_size_h: REAL
         - sensor_px_w: INTEGER
         - sensor_px_h: INTEGER
+        - weight_g: REAL
+        - screen_size_in: REAL
+        - min_shutter_s: REAL
+        - max_shutter_s: REAL
+        - max_aperture_wide: REAL
+        - max_aperture_tele: REAL
+        - dimensions_w_mm: REAL
+        - dimensions_h_mm: REAL
+        - dimensions_d_mm: REAL
+        - content_hash: TEXT
+
+        The columns from weight_g to dimensions_d_mm are numeric companions parsed by CameraCSVProcessor.treat_fields
+        from their text counterparts, so range filters can run in SQL. content_hash is a digest of the imported
+        values of the row, see content_hash().
 
         This function does not return anything.
         """
@@ -87,6 +122,65 @@ class CameraDBFiller:
         self.cursor.execute(CREATE_CAMERA_TABLE_QUERY)
         print(f"Created table {self.table_name}")
 
+    def create_child_tables(self) -> None:
+        """
+        Creates the camera_iso and camera_storage child tables.
+
+        - camera_iso: one row per ISO value or range of a camera (camera_id, iso_min, iso_max, is_auto), a single
+          value having iso_min = iso_max, and "Auto" stored as NULL bounds and is_auto = 1.
+        - camera_storage: one row per storage type of a camera (camera_id, type).
+        - camera_aliases: one row per normalized name of a camera (camera_id, alias, priority), from its brand,
+          model and also_known_as, that CamerasController.resolve_exif looks EXIF Make/Model strings up by.
+
+        camera_id is the rowid of the camera in {self.table_name}. A trigger removes the child rows of deleted
+        cameras. Their indexes are created by create_indexes.
+
+        This function does not return anything.
+        """
+        self.cursor.executescript(CREATE_CAMERA_CHILD_TABLES_QUERY)
+        print(f"Created child tables for {self.table_name}")
+
+    def create_indexes(self) -> None:
+        """
+        Creates the unique key on brand/model and the B-tree indexes on year, megapixels, crop_factor and the numeric
+        companion columns, then runs ANALYZE so the query planner picks them for range filters.
+
+        Only the first imported row of every brand/model is kept. Call it after the data has been inserted,
+        building the indexes once is cheaper than maintaining them row by row.
+
+        This function does not return anything.
+        """
+        self.cursor.executescript(CREATE_CAMERA_INDEXES_QUERY)
+        # Once the child tables are indexed on camera_id, so that deleting duplicates does not scan them per row
+        self.cursor.execute(REMOVE_DUPLICATE_CAMERAS_QUERY)
+        self.cursor.execute(CREATE_CAMERA_UNIQUE_KEY_QUERY)
+        self.conn.commit()
+        print(f"Created indexes for {self.table_name}")
+
+    def create_fts_table(self) -> None:
+        """
+        Creates the FTS5 full-text index over brand, model and also_known_as.
+
+        The index is an external content table backed by {self.table_name}, so it does not duplicate the
+        rows. Triggers on insert, update and delete keep it in sync with every later import, and any rows
+        already present are indexed by rebuilding it once.
+
+        This function does not return anything.
+        """
+        self.cursor.execute(CREATE_CAMERA_FTS_TABLE_QUERY)
+        self.cursor.executescript(CREATE_CAMERA_FTS_TRIGGERS_QUERY)
+        self.rebuild_fts_index()
+        print(f"Created full-text index for {self.table_name}")
+
+    def rebuild_fts_index(self) -> None:
+        """
+        Rebuilds the FTS5 full-text index from the contents of {self.table_name}.
+
+        This function does not return anything.
+        """
+        self.cursor.execute(REBUILD_CAMERA_FTS_QUERY)
+        self.conn.commit()
+
     def read_csv_and_insert(self) -> None:
         """
         Reads a CSV file and inserts its contents into a database table.
@@ -94,7 +188,7 @@ class CameraDBFiller:
         Returns:
             None
         """
-        with open(self.csv_file_path, mode="r", encoding="utf-8") as f:
+        with open(self.csv_file_path, mode="r", encoding="utf-8", newline="") as f:
             reader = csv.DictReader(f)
             row: Dict[str, str]
             for row in reader:
@@ -131,22 +225,447 @@ class CameraDBFiller:
         Returns:
             None
         """
-        # Remove special characters and quote column names
-        columns = [
-            f'"{col.replace(".", "").replace("(", "").replace(")", "").replace("-", "_")}"'
-            for col in camera_dict.keys()
-        ]
+        keys = tuple(camera_dict.keys())
+        values = CameraDBFiller.column_values(camera_dict)
+        query = CameraDBFiller.insert_query(self.table_name, keys + ("content_hash",))
+        self.cursor.execute(query, values + (CameraDBFiller.content_hash(keys, values),))
+        self.insert_camera_children(self.cursor.lastrowid, camera_dict)
+
+    def insert_camera_children(self, camera_id: int, camera_dict) -> None:
+        """
+        Insert the ISO values, storage types and aliases of a camera into the camera_iso, camera_storage and
+        camera_aliases tables.
+
+        Args:
+            camera_id (int): The rowid of the camera.
+            camera_dict (dict): A dictionary containing the camera information.
+
+        Returns:
+            None
+        """
+        iso_rows, storage_rows, names = [], [], []
+        CameraDBFiller.collect_children(camera_id, camera_dict, iso_rows, storage_rows, names)
+        self.insert_children(iso_rows, storage_rows)
+        self.update_aliases(names)
+
+    def stream_csv_and_insert(self, batch_size: int = DEFAULT_IMPORT_BATCH_SIZE, workers: int = 1) -> int:
+        """
+        Streams the CSV file at `csv_file_path` into the database with insert_rows, without building the whole
+        data set in memory or going through JSON.
+
+        Args:
+            batch_size (int): The number of rows sent per executemany call.
+            workers (int): The number of processes normalizing the rows, see csv_rows.
+
+        Returns:
+            int: The number of inserted cameras.
+        """
+        count = self.insert_rows(self.csv_rows(workers), batch_size)
+        print(f"Streamed {self.csv_file_path} into {self.table_name} {count} rows")
+        return count
+
+    def csv_rows(self, workers: int = 1) -> Iterator[Dict[str, Any]]:
+        """
+        Returns the normalized rows of the CSV file at `csv_file_path`, in file order.
+
+        With more than one worker, rows are normalized in that many processes by
+        CameraCSVProcessor.iter_rows_parallel while this process writes them, for feeds too large for one core.
+        """
+        processor = CameraCSVProcessor(self.csv_file_path)
+        return processor.iter_rows() if workers == 1 else processor.iter_rows_parallel(workers)
+
+    def insert_rows(self, rows: Iterable[Dict[str, Any]], batch_size: int = DEFAULT_IMPORT_BATCH_SIZE) -> int:
+        """
+        Bulk inserts normalized camera rows, such as those of CameraCSVProcessor.iter_rows, and their child rows,
+        into a new database. Use upsert_rows to update an existing one.
+
+        Rows are consumed lazily in batches of `batch_size` and sent with one executemany per batch and column
+        set, through an INSERT built once per column set. Rowids are assigned here rather than read back one
+        row at a time, so the child rows of a batch are inserted with executemany as well.
+
+        The whole load runs in a single transaction with `journal_mode = OFF` and `synchronous = OFF`, restored
+        afterwards. Without a journal a failed load can not be rolled back, so load into a new database, then
+        build the full-text index and the B-tree indexes once with create_fts_table and create_indexes.
+
+        Args:
+            rows (Iterable[Dict[str, Any]]): The normalized camera rows.
+            batch_size (int): The number of rows sent per executemany call.
+
+        Returns:
+            int: The number of inserted cameras.
+        """
+        self.conn.commit()
+        journal_mode = self.cursor.execute("PRAGMA journal_mode").fetchone()[0]
+        synchronous = self.cursor.execute("PRAGMA synchronous").fetchone()[0]
+        self.cursor.execute("PRAGMA journal_mode = OFF")
+        self.cursor.execute("PRAGMA synchronous = OFF")
+
+        count = 0
+        next_rowid = self.cursor.execute(f"SELECT COALESCE(MAX(rowid), 0) + 1 FROM {self.table_name}").fetchone()[0]
+        self.alias_brands = self.brand_keys()
+        try:
+            rows = iter(rows)
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+
+                iso_rows, storage_rows, names = [], [], []
+                for keys, group in groupby(batch, key=lambda row: tuple(row.keys())):
+                    params = []
+                    for camera_dict in group:
+                        values = CameraDBFiller.column_values(camera_dict)
+                        params.append((next_rowid, *values, CameraDBFiller.content_hash(keys, values)))
+                        CameraDBFiller.collect_children(next_rowid, camera_dict, iso_rows, storage_rows, names)
+                        next_rowid += 1
+                    query = CameraDBFiller.insert_query(self.table_name, keys + ("content_hash",), True)
+                    self.cursor.executemany(query, params)
+                    count += len(params)
+                self.insert_children(iso_rows, storage_rows)
+                self.update_aliases(names)
+
+            self.conn.commit()
+        finally:
+            self.cursor.execute(f"PRAGMA synchronous = {synchronous}")
+            self.cursor.execute(f"PRAGMA journal_mode = {journal_mode}")
+
+        return count
+
+    def upsert_csv(
+            self, delete_missing: bool = False, batch_size: int = DEFAULT_IMPORT_BATCH_SIZE, workers: int = 1
+    ) -> Dict[str, int]:
+        """
+        Streams the CSV file at `csv_file_path` into an existing database with upsert_rows.
 
-        # Convert lists to comma-separated strings
-        values = [
-            ",".join(val) if isinstance(val, list) else val
-            for val in camera_dict.values()
-        ]
+        Returns:
+            Dict[str, int]: The counts of upsert_rows.
+        """
+        counts = self.upsert_rows(self.csv_rows(workers), delete_missing, batch_size)
+        print(f"Upserted {self.csv_file_path} into {self.table_name}: {counts}")
+        return counts
+
+    def upsert_rows(
+            self,
+            rows: Iterable[Dict[str, Any]],
+            delete_missing: bool = False,
+            batch_size: int = DEFAULT_IMPORT_BATCH_SIZE,
+    ) -> Dict[str, int]:
+        """
+        Incrementally imports normalized camera rows into an existing database, writing only what changed.
 
-        placeholders = ", ".join("?" * len(columns))
-        query = f"INSERT INTO {self.table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+        Cameras are matched on the unique (brand, model) key, created first if needed, and compared through their
+        content_hash. New cameras are inserted and changed ones updated with `INSERT ... ON CONFLICT DO UPDATE`,
+        their child rows replaced, while unchanged ones are not written at all. Only the first row of a (brand,
+        model) repeated in the feed is imported. The import runs in one transaction, rolled back on error, so
+        readers see either the previous or the new catalog.
 
-        self.cursor.execute(query, tuple(values))
+        Args:
+            rows (Iterable[Dict[str, Any]]): The normalized camera rows of the whole feed.
+            delete_missing (bool): Whether to delete the cameras that are not in `rows`.
+            batch_size (int): The number of rows sent per executemany call.
+
+        Returns:
+            Dict[str, int]: The number of "inserted", "updated", "unchanged", "deleted" and "duplicate" rows.
+        """
+        self.conn.commit()
+        self.cursor.execute(REMOVE_DUPLICATE_CAMERAS_QUERY)
+        self.cursor.execute(CREATE_CAMERA_UNIQUE_KEY_QUERY)
+
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0, "deleted": 0, "duplicate": 0}
+        existing = {
+            (brand, model): (rowid, content_hash)
+            for rowid, brand, model, content_hash in self.cursor.execute(
+                f"SELECT rowid, brand, model, content_hash FROM {self.table_name}"
+            )
+        }
+        seen = set()
+        next_rowid = self.cursor.execute(f"SELECT COALESCE(MAX(rowid), 0) + 1 FROM {self.table_name}").fetchone()[0]
+        self.alias_brands = self.brand_keys()
+        try:
+            rows = iter(rows)
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+
+                params_by_keys: Dict[Tuple[str, ...], List[tuple]] = {}
+                changed_ids = []
+                iso_rows, storage_rows, names = [], [], []
+                for camera_dict in batch:
+                    key = (camera_dict.get("brand"), camera_dict.get("model"))
+                    if key in seen:
+                        counts["duplicate"] += 1
+                        continue
+                    seen.add(key)
+
+                    keys = tuple(camera_dict.keys())
+                    values = CameraDBFiller.column_values(camera_dict)
+                    digest = CameraDBFiller.content_hash(keys, values)
+                    current = existing.get(key)
+                    if current is not None and current[1] == digest:
+                        counts["unchanged"] += 1
+                        continue
+
+                    if current is None:
+                        # New cameras get their rowid here, so their child rows can be batched
+                        camera_id, rowid = next_rowid, next_rowid
+                        next_rowid += 1
+                        counts["inserted"] += 1
+                    else:
+                        # Changed cameras keep theirs, the conflict on (brand, model) turns the insert into an update
+                        camera_id, rowid = current[0], None
+                        changed_ids.append((camera_id,))
+                        counts["updated"] += 1
+
+                    params_by_keys.setdefault(keys, []).append((rowid, *values, digest))
+                    CameraDBFiller.collect_children(camera_id, camera_dict, iso_rows, storage_rows, names)
+
+                for table in ("camera_iso", "camera_storage", "camera_aliases"):
+                    self.cursor.executemany(f"DELETE FROM {table} WHERE camera_id = ?", changed_ids)
+                for keys, params in params_by_keys.items():
+                    self.cursor.executemany(CameraDBFiller.upsert_query(self.table_name, keys), params)
+                self.insert_children(iso_rows, storage_rows)
+                self.update_aliases(names)
+
+            if delete_missing:
+                missing = [(rowid,) for key, (rowid, _) in existing.items() if key not in seen]
+                # The child rows and the full-text index follow through their triggers
+                self.cursor.executemany(f"DELETE FROM {self.table_name} WHERE rowid = ?", missing)
+                counts["deleted"] = len(missing)
+                if missing and self.brand_keys() != self.alias_brands:
+                    # A brand is gone, the models that started with it are no longer split off
+                    self.update_aliases()
+
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+
+        return counts
+
+    def migrate_db(self) -> Dict[str, int]:
+        """
+        Brings a database built by an earlier version of this module, such as the cameras_db.db packaged with
+        cameras_db, up to the current schema in place, so that upsert_rows and every CamerasController method can
+        run on it:
+
+        1. The columns of CREATE_CAMERA_TABLE_QUERY it lacks, such as the numeric companion columns and
+           content_hash, are added with ALTER TABLE ... ADD COLUMN.
+        2. The missing child tables are created.
+        3. The cameras without a content_hash are normalized again from their stored CSV fields, as
+           CameraCSVProcessor.normalize_row does on import, and updated with their companion columns and hash.
+        4. The child rows of those cameras, or of every camera when a child table was created, are rebuilt.
+        5. The full-text index is created if it is missing.
+
+        The data is rewritten in one transaction, rolled back on error. A database already up to date is left as it
+        is, so migrating twice does nothing the second time.
+
+        Returns:
+            Dict[str, int]: The number of "columns" added, cameras "normalized" and cameras whose child rows were
+            rebuilt, as "children".
+        """
+        self.conn.commit()
+        columns = {column for _, column, *_ in self.cursor.execute(f"PRAGMA table_info({self.table_name})")}
+        added = [column for column in CAMERA_COLUMNS if column not in columns]
+        for column in added:
+            self.cursor.execute(
+                f"ALTER TABLE {self.table_name} ADD COLUMN {column} {CAMERA_COLUMN_TYPES[column]}"
+            )
+
+        tables = {name for name, in self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        all_children = not {"camera_iso", "camera_storage", "camera_aliases"} <= tables
+        self.create_child_tables()
+
+        # The fields of the CSV, in the order of the table, the other columns are parsed from them
+        fields = [column for column in CAMERA_COLUMNS if column not in PARSED_COLUMNS and column != "content_hash"]
+        processor = CameraCSVProcessor(self.csv_file_path)
+        processor.fieldnames = fields
+        counts = {"columns": len(added), "normalized": 0, "children": 0}
+        try:
+            rows = self.cursor.execute(
+                f"SELECT rowid, content_hash IS NULL, {', '.join(fields)} FROM {self.table_name}"
+                f"{'' if all_children else ' WHERE content_hash IS NULL'}"
+            ).fetchall()
+            camera_ids = []
+            iso_rows, storage_rows, names = [], [], []
+            for camera_id, unhashed, *values in rows:
+                # Stored values are read back as the CSV text they were imported from
+                camera_dict = processor.normalize_row(
+                    dict(zip(fields, (None if value is None else str(value) for value in values)))
+                )
+                if unhashed:
+                    keys = tuple(camera_dict.keys())
+                    values = CameraDBFiller.column_values(camera_dict)
+                    self.cursor.execute(
+                        CameraDBFiller.update_query(self.table_name, keys),
+                        (*values, CameraDBFiller.content_hash(keys, values), camera_id),
+                    )
+                    counts["normalized"] += 1
+                camera_ids.append((camera_id,))
+                CameraDBFiller.collect_children(camera_id, camera_dict, iso_rows, storage_rows, names)
+
+            for table in ("camera_iso", "camera_storage", "camera_aliases"):
+                self.cursor.executemany(f"DELETE FROM {table} WHERE camera_id = ?", camera_ids)
+            self.insert_children(iso_rows, storage_rows)
+            self.alias_brands = self.brand_keys()
+            self.update_aliases(names)
+            counts["children"] = len(camera_ids)
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+
+        if "cameras_fts" not in tables:
+            self.create_fts_table()
+
+        print(f"Migrated {self.db_name}: {counts}")
+        return counts
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def column_name(key: str) -> str:
+        """
+        Returns the quoted column of a field name, as CameraCSVProcessor.column_key, such as
+        "focal_length_35mm_equiv" for "focal_length_(35mm_equiv.)".
+        """
+        return f'"{CameraCSVProcessor.column_key(key)}"'
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def insert_query(table_name: str, keys: Tuple[str, ...], with_rowid: bool = False) -> str:
+        """
+        Returns the INSERT statement of a camera with the fields `keys`, built once per column set.
+        """
+        columns = [CameraDBFiller.column_name(key) for key in keys]
+        if with_rowid:
+            columns.insert(0, "rowid")
+        return f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def upsert_query(table_name: str, keys: Tuple[str, ...]) -> str:
+        """
+        Returns the INSERT ... ON CONFLICT DO UPDATE statement of a camera with the fields `keys`, followed by its
+        rowid and content_hash, built once per column set.
+        """
+        columns = [CameraDBFiller.column_name(key) for key in keys] + ["content_hash"]
+        assignments = ", ".join(f"{column} = excluded.{column}" for column in columns)
+        return (
+            f"{CameraDBFiller.insert_query(table_name, keys + ('content_hash',), True)} "
+            f"ON CONFLICT (brand, model) DO UPDATE SET {assignments} "
+            f"WHERE content_hash IS NOT excluded.content_hash"
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def update_query(table_name: str, keys: Tuple[str, ...]) -> str:
+        """
+        Returns the UPDATE statement of the fields `keys` and the content_hash of the camera with a given rowid,
+        built once per column set.
+        """
+        columns = [CameraDBFiller.column_name(key) for key in keys] + ["content_hash"]
+        return f"UPDATE {table_name} SET {', '.join(f'{column} = ?' for column in columns)} WHERE rowid = ?"
+
+    @staticmethod
+    def content_hash(keys: Tuple[str, ...], values: Tuple[Any, ...]) -> str:
+        """
+        Returns a digest of the column values of a camera that does not depend on the order of its columns.
+        """
+        items = sorted(zip(map(CameraDBFiller.column_name, keys), values), key=lambda item: item[0])
+        return hashlib.blake2b(repr(items).encode("utf-8"), digest_size=16).hexdigest()
+
+    @staticmethod
+    def column_values(camera_dict) -> Tuple[Any, ...]:
+        """
+        Returns the values of a camera in the order of its keys, with lists converted to comma-separated strings.
+        """
+        return tuple(",".join(val) if isinstance(val, list) else val for val in camera_dict.values())
+
+    @staticmethod
+    def collect_children(
+            camera_id: int,
+            camera_dict,
+            iso_rows: List[tuple],
+            storage_rows: List[tuple],
+            names: List[tuple],
+    ) -> None:
+        """
+        Appends the camera_iso and camera_storage rows of a camera to the given lists, and its (camera_id, brand,
+        model, also_known_as) to `names`, for update_aliases.
+        """
+        iso_rows.extend(
+            (camera_id, iso_min, iso_max, is_auto)
+            for iso_min, iso_max, is_auto in CameraCSVProcessor.parse_iso_ranges(camera_dict.get("iso"))
+        )
+        storage_rows.extend(
+            (camera_id, storage_type)
+            for storage_type in CameraCSVProcessor.split_storage_types(camera_dict.get("storage_types"))
+        )
+        names.append(
+            (camera_id, camera_dict.get("brand"), camera_dict.get("model"), camera_dict.get("also_known_as"))
+        )
+
+    def insert_children(self, iso_rows: List[tuple], storage_rows: List[tuple]) -> None:
+        """
+        Inserts rows collected by collect_children into the camera_iso and camera_storage tables.
+        """
+        self.cursor.executemany(
+            "INSERT INTO camera_iso (camera_id, iso_min, iso_max, is_auto) VALUES (?, ?, ?, ?)", iso_rows
+        )
+        self.cursor.executemany("INSERT INTO camera_storage (camera_id, type) VALUES (?, ?)", storage_rows)
+
+    def brand_keys(self) -> FrozenSet[str]:
+        """
+        Returns the brand keys of the distinct brands of the cameras table, the known brands of camera_aliases.
+        """
+        return brand_keys(brand for brand, in self.cursor.execute(f"SELECT DISTINCT brand FROM {self.table_name}"))
+
+    def update_aliases(self, names: Optional[Iterable[tuple]] = None) -> None:
+        """
+        Inserts the camera_aliases rows of the (camera_id, brand, model, also_known_as) `names` collected by
+        collect_children, whose former rows are deleted by the caller as those of the other child tables, or
+        replaces those of every camera, computed by camera_aliases with the brands of the cameras table.
+
+        The brands the current aliases were computed with are kept in `alias_brands`, so the distinct brands are
+        not read for every batch of an import. When `names` brings a brand they lack, or they are not known yet,
+        they are read again and the aliases of every camera are computed again, since the models of other brands
+        may start with the new one.
+        """
+        if names is not None and self.alias_brands is not None:
+            names = list(names)
+            if all(brand_key(brand) in self.alias_brands for _, brand, _, _ in names):
+                self.insert_aliases(names)
+                return
+
+        self.alias_brands = self.brand_keys()
+        self.cursor.execute("DELETE FROM camera_aliases")
+        self.insert_aliases(
+            self.cursor.execute(f"SELECT rowid, brand, model, also_known_as FROM {self.table_name}").fetchall()
+        )
+
+    def insert_aliases(self, names: Iterable[tuple]) -> None:
+        """
+        Inserts the camera_aliases rows of (camera_id, brand, model, also_known_as) `names`, with `alias_brands`.
+        """
+        self.cursor.executemany(
+            "INSERT INTO camera_aliases (camera_id, alias, priority) VALUES (?, ?, ?)",
+            [
+                (camera_id, alias, priority)
+                for camera_id, brand, model, also_known_as in names
+                for alias, priority in camera_aliases(brand, model, also_known_as, self.alias_brands)
+            ],
+        )
+
+    def rebuild_alias_table(self) -> None:
+        """
+        Recomputes the camera_aliases table from the brand, model and also_known_as of every camera, with the
+        distinct brands of the cameras table as known brands, as after changing the normalization in
+        cameras_db.exif.
+
+        This function does not return anything.
+        """
+        self.update_aliases()
+        self.conn.commit()
 
     def close_db(self):
         """
@@ -1,6 +1,7 @@
 # CameraCSVProcessor.py
 # ... Your existing CameraCSVProcessor class
 import os.path
+import sys
 
 # CameraDB.py
 # ... Your existing CameraDB class
@@ -11,27 +12,72 @@ from CameraDBFiller import CameraDBFiller
 import json
 
 
-def main_workflow(csv_file_path, db_name, table_name):
-    # Step 1: Process the CSV file
-    csv_processor = CameraCSVProcessor(csv_file_path)
-    csv_processor.open_csv()
-    json_string = csv_processor.convert_to_json()
+def main_workflow(csv_file_path, db_name, table_name, streaming=True, workers=1):
+    camera_db = CameraDBFiller(db_name, table_name, csv_file_path)
+    camera_db.connect_db()
+    camera_db.create_camera_table()
+    camera_db.create_child_tables()
+
+    if streaming:
+        # Stream the CSV rows into the database in one transaction, then index them once
+        camera_db.stream_csv_and_insert(workers=workers)
+        camera_db.create_fts_table()
+    else:
+        # Step 1: Process the CSV file
+        csv_processor = CameraCSVProcessor(csv_file_path)
+        csv_processor.open_csv()
+        json_string = csv_processor.convert_to_json()
+
+        # Convert the JSON string back to a Python list
+        camera_data = json.loads(json_string)
+
+        # Step 2: Insert data into the database
+        camera_db.create_fts_table()
+        camera_db.read_json_and_insert(camera_data)
+
+    camera_db.create_indexes()
+    camera_db.close_db()
+    camera_db.vacuum_db()
 
-    # Convert the JSON string back to a Python list
-    camera_data = json.loads(json_string)
 
-    # Step 2: Insert data into the database
+def update_workflow(csv_file_path, db_name, table_name, delete_missing=False, workers=1):
+    # Upsert only the new and changed rows into the existing database, in place, once migrated to the current schema
     camera_db = CameraDBFiller(db_name, table_name, csv_file_path)
     camera_db.connect_db()
-    camera_db.create_camera_table()
-    camera_db.read_json_and_insert(camera_data)
+    camera_db.migrate_db()
+    camera_db.upsert_csv(delete_missing=delete_missing, workers=workers)
+    camera_db.create_indexes()
+    camera_db.close_db()
+
+
+def migrate_workflow(db_name, table_name):
+    # Bring the existing database to the current schema without a CSV, then index and compact it
+    camera_db = CameraDBFiller(db_name, table_name, None)
+    camera_db.connect_db()
+    camera_db.migrate_db()
+    camera_db.create_indexes()
     camera_db.close_db()
     camera_db.vacuum_db()
 
 
 if __name__ == "__main__":
+    # --workers=N normalizes the CSV rows in N processes, 0 for one per CPU
+    workers = next((int(arg.split("=", 1)[1]) for arg in sys.argv if arg.startswith("--workers=")), 1)
+    workers = workers or os.cpu_count() or 1
+
+    if "--migrate" in sys.argv:
+        migrate_workflow("../cameras_db.db", "cameras")
+        sys.exit()
+
+    # --delete-missing also deletes the cameras of the database that are no longer in the CSV
+    if "--rebuild" not in sys.argv and os.path.exists("../cameras_db.db"):
+        update_workflow(
+            "cameras-all.csv", "../cameras_db.db", "cameras", "--delete-missing" in sys.argv, workers=workers
+        )
+        sys.exit()
+
     if os.path.exists("../cameras_db.db"):
         os.remove("../cameras_db.db")
         print("Database removed")
 
-    main_workflow("cameras-all.csv", "../cameras_db.db", "cameras")
+    main_workflow("cameras-all.csv", "../cameras_db.db", "cameras", workers=workers)
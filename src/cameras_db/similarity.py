@@ -0,0 +1,195 @@
+import heapq
+from math import isnan, sqrt
+from typing import Any, Hashable, List, Mapping, Optional, Sequence, Tuple
+
+# The numeric columns cameras are compared on, weight_g being the numeric companion of the weight text column
+SIMILARITY_FEATURES = (
+    "sensor_size_w",
+    "sensor_size_h",
+    "sensor_px_w",
+    "sensor_px_h",
+    "megapixels",
+    "crop_factor",
+    "weight_g",
+    "year",
+)
+
+# Points per leaf, below which a linear scan beats descending further in Python
+LEAF_SIZE = 16
+
+
+class SpecIndex:
+    """
+    A KD-tree over the normalized specs of every camera, for nearest-neighbour queries.
+
+    Every feature is standardized to a mean of 0 and a standard deviation of 1, missing values, NULL or text left
+    in numeric columns, standing at the mean, so that no single unit dominates the distance. Queries use a
+    weighted Euclidean distance, with the weights applied at query time, so one tree serves every weighting:
+    the distance to a splitting plane is scaled by the weight of its axis, which keeps the pruning exact.
+
+    Args:
+        features (Sequence[str]): The feature names, in the order of the values of `rows`.
+        ids (Sequence[int]): The id of every row, such as its rowid.
+        keys (Sequence[Hashable]): A key of every row, such as (brand, model), queries can exclude.
+        rows (Sequence[Sequence[Any]]): The feature values of every row.
+    """
+
+    def __init__(
+            self,
+            features: Sequence[str],
+            ids: Sequence[int],
+            keys: Sequence[Hashable],
+            rows: Sequence[Sequence[Any]],
+    ):
+        self.features = tuple(features)
+        self.ids = list(ids)
+        self.keys = list(keys)
+        self.means: List[float] = []
+        self.scales: List[float] = []
+
+        columns = list(zip(*rows)) or [()] * len(self.features)
+        for column in columns:
+            values = [value for value in map(SpecIndex.number, column) if not isnan(value)]
+            mean = sum(values) / len(values) if values else 0.0
+            variance = sum((value - mean) ** 2 for value in values) / len(values) if values else 0.0
+            self.means.append(mean)
+            self.scales.append(sqrt(variance) or 1.0)
+
+        self.points = [self.normalize(row) for row in rows]
+        self.root = self._build(list(range(len(self.points))))
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    @staticmethod
+    def number(value: Any) -> float:
+        """
+        Returns `value` as a float, or NaN when it is not a number.
+        """
+        return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else float("nan")
+
+    def normalize(self, values: Sequence[Any]) -> Tuple[float, ...]:
+        """
+        Returns the standardized point of raw feature values, missing ones at 0.
+        """
+        point = []
+        for value, mean, scale in zip(values, self.means, self.scales):
+            value = SpecIndex.number(value)
+            point.append(0.0 if isnan(value) else (value - mean) / scale)
+        return tuple(point)
+
+    def weights(self, weights: Optional[Mapping[str, float]] = None) -> Tuple[float, ...]:
+        """
+        Returns the weight of every feature, 1 unless given in `weights`.
+
+        Raises:
+            ValueError: If `weights` names an unknown feature or a weight is negative.
+        """
+        weights = dict(weights or {})
+        unknown = set(weights) - set(self.features)
+        if unknown:
+            raise ValueError(f"Unknown features: {', '.join(sorted(unknown))}")
+        if any(weight < 0 for weight in weights.values()):
+            raise ValueError("Weights must not be negative")
+        return tuple(float(weights.get(feature, 1.0)) for feature in self.features)
+
+    def query(
+            self,
+            values: Sequence[Any],
+            k: int,
+            weights: Optional[Mapping[str, float]] = None,
+            exclude: Optional[Hashable] = None,
+    ) -> List[Tuple[float, int]]:
+        """
+        Returns the (distance, id) of the `k` rows nearest to the raw feature `values`, nearest first.
+
+        Args:
+            values (Sequence[Any]): The raw feature values, in the order of `features`.
+            k (int): The number of rows to return.
+            weights (Optional[Mapping[str, float]]): The weight of some features, 1 for the others.
+            exclude (Optional[Hashable]): A key whose rows are skipped, such as the (brand, model) of `values`.
+        """
+        weights = self.weights(weights)
+        target = self.normalize(values)
+        # A max-heap of the best k so far, as (-squared distance, -position)
+        best: List[Tuple[float, int]] = []
+        if k > 0 and self.root is not None:
+            self._search(self.root, target, weights, k, exclude, best)
+        return [(sqrt(-distance), self.ids[-position]) for distance, position in sorted(best, reverse=True)]
+
+    def _build(self, positions: List[int]):
+        if not positions:
+            return None
+        if len(positions) <= LEAF_SIZE:
+            return positions
+
+        dimensions = len(self.features)
+        spreads = [
+            max(self.points[position][axis] for position in positions)
+            - min(self.points[position][axis] for position in positions)
+            for axis in range(dimensions)
+        ]
+        axis = max(range(dimensions), key=spreads.__getitem__)
+        if spreads[axis] == 0:
+            return positions
+
+        positions.sort(key=lambda position: self.points[position][axis])
+        middle = len(positions) // 2
+        split = self.points[positions[middle]][axis]
+        return axis, split, self._build(positions[:middle]), self._build(positions[middle:])
+
+    def _search(self, node, target, weights, k, exclude, best) -> None:
+        if isinstance(node, list):
+            for position in node:
+                if exclude is not None and self.keys[position] == exclude:
+                    continue
+                point = self.points[position]
+                distance = sum(weight * (a - b) ** 2 for weight, a, b in zip(weights, point, target))
+                entry = (-distance, -position)
+                if len(best) < k:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
+            return
+
+        axis, split, left, right = node
+        offset = target[axis] - split
+        near, far = (left, right) if offset < 0 else (right, left)
+        if near is not None:
+            self._search(near, target, weights, k, exclude, best)
+        if far is not None and (len(best) < k or weights[axis] * offset ** 2 <= -best[0][0]):
+            self._search(far, target, weights, k, exclude, best)
+
+
+def spec_index_values(camera: Any, features: Sequence[str]) -> List[Any]:
+    """
+    Returns the raw feature values of a Camera, or of any object or mapping with those attributes, None when
+    missing.
+    """
+    if isinstance(camera, Mapping):
+        return [camera.get(feature) for feature in features]
+    return [getattr(camera, feature, None) for feature in features]
+
+
+def spec_index_key(camera: Any) -> Optional[Tuple[Any, Any]]:
+    """
+    Returns the (brand, model) of a Camera, or None when it has neither.
+    """
+    values = spec_index_values(camera, ("brand", "model"))
+    return None if values == [None, None] else tuple(values)
+
+
+def build_spec_index(conn, features: Sequence[str] = SIMILARITY_FEATURES) -> SpecIndex:
+    """
+    Builds the SpecIndex of the cameras table of `conn`, over the `features` it has.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(cameras)")}
+    features = [feature for feature in features if feature in columns]
+    ids, keys, rows = [], [], []
+    select = ", ".join(["rowid", "brand", "model", *features])
+    for rowid, brand, model, *values in conn.execute(f"SELECT {select} FROM cameras ORDER BY rowid"):
+        ids.append(rowid)
+        keys.append((brand, model))
+        rows.append(values)
+    return SpecIndex(features, ids, keys, rows)
+
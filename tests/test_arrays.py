@@ -0,0 +1,65 @@
+from math import isnan, sqrt
+from unittest import TestCase
+
+from cameras_db import arrays
+from cameras_db.constants import CREATE_CAMERA_TABLE_QUERY
+from cameras_db.controllers import CamerasController
+
+
+class TestArrays(TestCase):
+
+    def setUp(self):
+        self.controller = CamerasController(":memory:")
+        self.controller.cursor.execute(CREATE_CAMERA_TABLE_QUERY)
+        self.controller.cursor.executemany(
+            """
+            INSERT INTO cameras (brand, model, sensor_size_w, sensor_size_h, sensor_px_w, sensor_px_h, crop_factor)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                ("Canon", "EOS R6", 36, 24, 6720, 4480, 1),
+                ("Nikon", "D7500", 23.5, 15.7, 5568, 3712, None),
+                ("Acer", "CE-5430", 7.18, 5.32, 0, 0, "6,02"),
+            ],
+        )
+        self.controller.conn.commit()
+
+    def tearDown(self):
+        self.controller.close()
+
+    def test_to_arrays(self):
+        columns = self.controller.to_arrays(["model", "sensor_size_w", "sensor_px_w", "crop_factor"])
+
+        self.assertEqual(list(columns), ["model", "sensor_size_w", "sensor_px_w", "crop_factor"])
+        self.assertEqual(list(columns["model"]), ["EOS R6", "D7500", "CE-5430"])
+        self.assertEqual(list(columns["sensor_px_w"]), [6720.0, 5568.0, 0.0])
+        self.assertEqual(columns["crop_factor"][0], 1.0)
+        self.assertTrue(isnan(columns["crop_factor"][1]))
+        self.assertTrue(isnan(columns["crop_factor"][2]))
+
+        columns = self.controller.to_arrays(["model"], [("sensor_size_w", ">=", 36)])
+        self.assertEqual(list(columns["model"]), ["EOS R6"])
+
+        columns = self.controller.to_arrays(["model", "year"], [("brand", "=", "Leica")])
+        self.assertEqual(len(columns["model"]), 0)
+        self.assertEqual(len(columns["year"]), 0)
+
+    def test_sensor_math_matches_camera(self):
+        columns = self.controller.to_arrays()
+        cameras = self.controller.get_by_fields_with_operators([])
+
+        self.assertEqual(list(arrays.diagonal_size_mm(columns)), [camera.diagonal_size_mm() for camera in cameras])
+        self.assertEqual(list(arrays.diagonal_size_px(columns)), [camera.diagonal_size_px() for camera in cameras])
+
+    def test_derived_sensor_math(self):
+        columns = self.controller.to_arrays()
+
+        pixel_pitch = list(arrays.pixel_pitch_um(columns))
+        self.assertAlmostEqual(pixel_pitch[0], 36000 / 6720)
+        self.assertTrue(isnan(pixel_pitch[2]))
+
+        self.assertAlmostEqual(list(arrays.megapixels(columns))[1], 5568 * 3712 / 1e6)
+
+        crop_factors = list(arrays.crop_factor(columns))
+        self.assertAlmostEqual(crop_factors[0], 1.0)
+        self.assertAlmostEqual(crop_factors[1], sqrt(36 ** 2 + 24 ** 2) / sqrt(23.5 ** 2 + 15.7 ** 2))
@@ -0,0 +1,71 @@
+import os
+import sqlite3
+import tempfile
+from unittest import IsolatedAsyncioTestCase
+
+from cameras_db.async_controllers import AsyncCamerasController
+from cameras_db.constants import CREATE_CAMERA_TABLE_QUERY
+from cameras_db.instrumentation import QueryMetrics
+
+
+class TestAsyncCamerasController(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "cameras_db.db")
+
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(CREATE_CAMERA_TABLE_QUERY)
+        conn.executemany(
+            """
+            INSERT INTO cameras (brand, model, sensor_size_w, sensor_size_h, sensor_px_w, sensor_px_h)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [
+                ("Canon", "EOS R6", 36, 24, 6720, 4480),
+                ("Nikon", "D750", 36, 24, 6720, 4480),
+                ("Sony", "A7 III", 35.6, 23.8, 6000, 4000),
+            ],
+        )
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    async def test_queries(self):
+        async with AsyncCamerasController(self.db_path, max_workers=2) as controller:
+            result = await controller.get_by_field("brand", "Canon")
+            self.assertEqual([camera.model for camera in result], ["EOS R6"])
+
+            result = await controller.get_by_fields_like_and({"brand": "Can", "model": "EOS"})
+            self.assertEqual([camera.model for camera in result], ["EOS R6"])
+
+            result = await controller.get_by_fields_like_or({"brand": "Can", "model": "D750"})
+            self.assertEqual(sorted(camera.model for camera in result), ["D750", "EOS R6"])
+
+            result = await controller.get_by_fields_with_operators([("sensor_size_w", "<", 36)])
+            self.assertEqual([camera.model for camera in result], ["A7 III"])
+
+            result = await controller.resolve_many([("nikon", "d7"), ("Leica", "M11")])
+            self.assertEqual([camera.model for camera in result[("nikon", "d7")]], ["D750"])
+            self.assertEqual(result[("Leica", "M11")], [])
+
+    async def test_stream(self):
+        async with AsyncCamerasController(self.db_path) as controller:
+            stream = controller.stream("get_by_field_like", "model", "", batch_size=2)
+            models = [camera.model async for camera in stream]
+            self.assertEqual(models, ["EOS R6", "D750", "A7 III"])
+
+            with self.assertRaises(ValueError):
+                async for _ in controller.stream("close"):
+                    pass
+
+    async def test_stream_records_metrics(self):
+        metrics = QueryMetrics()
+        async with AsyncCamerasController(self.db_path, metrics=metrics) as controller:
+            models = [camera.model async for camera in controller.stream("get_by_field", "brand", "Nikon")]
+            self.assertEqual(models, ["D750"])
+
+        event, = metrics.events()
+        self.assertEqual((event.method, event.rows), ("iter_by_field", 1))
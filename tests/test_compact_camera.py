@@ -0,0 +1,62 @@
+import inspect
+import unittest
+from math import sqrt
+
+from cameras_db.controllers import CamerasController
+from cameras_db.constants import CREATE_CAMERA_TABLE_QUERY
+from cameras_db.models.Camera import Camera
+from cameras_db.models.CompactCamera import CompactCamera
+
+
+class TestCompactCameraMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.camera = CompactCamera(
+            brand='Canon',
+            model='EOS 5D',
+            sensor_size_w=36.0,
+            sensor_size_h=24.0,
+            sensor_px_w=6720,
+            sensor_px_h=4480,
+        )
+
+    def test_diagonal_size_mm(self):
+        self.assertEqual(self.camera.diagonal_size_mm(), sqrt(36.0 ** 2 + 24.0 ** 2))
+
+    def test_diagonal_size_px(self):
+        self.assertEqual(self.camera.diagonal_size_px(), sqrt(6720 ** 2 + 4480 ** 2))
+
+    def test_sensor_property(self):
+        self.assertEqual(self.camera.sensor, (36.0, 24.0, 6720, 4480))
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(self.camera, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.camera.nickname = "5D"
+
+    def test_same_attributes_as_camera(self):
+        self.assertEqual(inspect.signature(CompactCamera), inspect.signature(Camera))
+        self.assertEqual(CompactCamera.__slots__, tuple(inspect.signature(Camera).parameters))
+        self.assertEqual(tuple(inspect.signature(Camera).parameters)[-1], "content_hash")
+
+        camera = CompactCamera("Canon", "EOS 5D", 36.0, 24.0, 6720, 4480, year=2005)
+        self.assertEqual((camera.model, camera.year, camera.iso), ("EOS 5D", 2005, None))
+        with self.assertRaises(TypeError):
+            CompactCamera("Canon", "EOS 5D")
+
+    def test_controller_camera_class(self):
+        controller = CamerasController(":memory:", camera_class=CompactCamera)
+        controller.cursor.execute(CREATE_CAMERA_TABLE_QUERY)
+        controller.cursor.execute(
+            "INSERT INTO cameras (brand, model, sensor_size_w, sensor_size_h, sensor_px_w, sensor_px_h) "
+            "VALUES ('Canon', 'EOS 5D', 36, 24, 6720, 4480)"
+        )
+
+        cameras = controller.get_by_field("brand", "Canon") + list(controller.iter_by_field("brand", "Canon"))
+        self.assertEqual([type(camera) for camera in cameras], [CompactCamera, CompactCamera])
+        self.assertEqual(cameras[0].sensor, (36, 24, 6720, 4480))
+        controller.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,19 @@
+import os
+import sqlite3
+import tempfile
 from math import sqrt
 from unittest import TestCase
 
 from cameras_db.controllers import CamerasController
-from cameras_db.constants import CREATE_CAMERA_TABLE_QUERY
+from cameras_db.exif import camera_aliases
+from cameras_db.constants import (
+    CREATE_CAMERA_TABLE_QUERY,
+    CREATE_CAMERA_CHILD_TABLES_QUERY,
+    CREATE_CAMERA_INDEXES_QUERY,
+    CREATE_CAMERA_FTS_TABLE_QUERY,
+    CREATE_CAMERA_FTS_TRIGGERS_QUERY,
+    REBUILD_CAMERA_FTS_QUERY,
+)
 from cameras_db.models.Camera import Camera
 
 
@@ -138,3 +149,341 @@ class TestCamerasController(TestCase):
 
 
 
+
+    def create_fts_index(self):
+        self.controller.cursor.execute(CREATE_CAMERA_FTS_TABLE_QUERY)
+        self.controller.cursor.executescript(CREATE_CAMERA_FTS_TRIGGERS_QUERY)
+        self.controller.cursor.execute(REBUILD_CAMERA_FTS_QUERY)
+        self.controller.conn.commit()
+
+    def test_search(self):
+        self.create_fts_index()
+
+        result = self.controller.search("canon eos")
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].brand, "Canon")
+        self.assertEqual(result[0].model, "EOS R6")
+
+    def test_search_prefix_and_sync(self):
+        self.create_fts_index()
+
+        # Rows inserted after the index was built are picked up by the triggers
+        self.controller.cursor.execute(
+            "INSERT INTO cameras (brand, model) VALUES ('Canon', 'EOS 5D Mark IV')"
+        )
+        self.controller.conn.commit()
+
+        result = self.controller.search("EOS 5D")
+        self.assertEqual([camera.model for camera in result], ["EOS 5D Mark IV"])
+
+        self.controller.cursor.execute("DELETE FROM cameras WHERE model = 'EOS 5D Mark IV'")
+        self.controller.conn.commit()
+        self.assertEqual(self.controller.search("EOS 5D"), [])
+
+    def test_search_limit_and_syntax(self):
+        self.create_fts_index()
+
+        self.assertEqual(len(self.controller.search("36", limit=1)), 0)
+        self.assertEqual(len(self.controller.search("a", limit=1)), 1)
+        self.assertEqual(self.controller.search('" - AND'), [])
+        self.assertEqual(self.controller.search(""), [])
+
+    def test_get_by_fields_with_operators_numeric_companions(self):
+        self.controller.cursor.executemany(
+            "UPDATE cameras SET weight_g = ?, max_aperture_wide = ? WHERE model = ?",
+            [(680, None, "EOS R6"), (840, None, "D750"), (650, 3.5, "A7 III")],
+        )
+        self.controller.conn.commit()
+
+        result = self.controller.get_by_fields_with_operators([("weight_g", "<", 700)])
+        self.assertEqual(sorted(camera.model for camera in result), ["A7 III", "EOS R6"])
+
+        result = self.controller.get_by_fields_with_operators([("max_aperture_wide", "<=", 4)])
+        self.assertEqual([camera.weight_g for camera in result], [650])
+
+    def create_child_tables(self):
+        self.controller.cursor.executescript(CREATE_CAMERA_CHILD_TABLES_QUERY)
+        self.controller.cursor.executescript(CREATE_CAMERA_INDEXES_QUERY)
+        rowids = dict(self.controller.cursor.execute("SELECT model, rowid FROM cameras").fetchall())
+        self.controller.cursor.executemany(
+            "INSERT INTO camera_iso (camera_id, iso_min, iso_max, is_auto) VALUES (?, ?, ?, ?)",
+            [
+                (rowids["EOS R6"], None, None, 1),
+                (rowids["EOS R6"], 100, 20000, 0),
+                (rowids["EOS R6"], 102400, 102400, 0),
+                (rowids["D750"], 100, 12800, 0),
+                (rowids["D750"], 256000, 256000, 0),
+                (rowids["A7 III"], 100, 25600, 0),
+            ],
+        )
+        self.controller.cursor.executemany(
+            "INSERT INTO camera_storage (camera_id, type) VALUES (?, ?)",
+            [
+                (rowids["EOS R6"], "SDXC"),
+                (rowids["D750"], "SDXC"),
+                (rowids["D750"], "SDHC"),
+                (rowids["A7 III"], "Memory Stick Duo"),
+            ],
+        )
+        self.controller.conn.commit()
+
+    def test_get_by_iso_range(self):
+        self.create_child_tables()
+
+        result = self.controller.get_by_iso_range(25600, 25600)
+        self.assertEqual([camera.model for camera in result], ["A7 III"])
+
+        result = self.controller.get_by_iso_range(min_iso=100000)
+        self.assertEqual(sorted(camera.model for camera in result), ["D750", "EOS R6"])
+
+        # ISO 16000 is inside the range of the EOS R6 and the A7 III, not a stored endpoint
+        result = self.controller.get_by_iso_range(16000, 16000)
+        self.assertEqual(sorted(camera.model for camera in result), ["A7 III", "EOS R6"])
+
+        self.assertEqual(len(self.controller.get_by_iso_range()), 3)
+
+    def test_get_by_storage_type(self):
+        self.create_child_tables()
+
+        result = self.controller.get_by_storage_type("sdxc")
+        self.assertEqual(sorted(camera.model for camera in result), ["D750", "EOS R6"])
+        self.assertEqual(self.controller.get_by_storage_type("SD"), [])
+
+        # Deleting a camera removes its child rows
+        self.controller.cursor.execute("DELETE FROM cameras WHERE model = 'D750'")
+        self.assertEqual([camera.model for camera in self.controller.get_by_storage_type("SDXC")], ["EOS R6"])
+        self.assertEqual(
+            self.controller.cursor.execute("SELECT COUNT(*) FROM camera_storage").fetchone()[0], 2
+        )
+
+    def test_snapshot(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "cameras snapshot.db")
+            target = sqlite3.connect(db_path)
+            self.controller.conn.backup(target)
+            target.close()
+
+            snapshot = CamerasController.snapshot(db_path)
+            # The snapshot no longer depends on the file
+            os.remove(db_path)
+
+            result = snapshot.get_by_field("brand", "Nikon")
+            self.assertEqual([camera.model for camera in result], ["D750"])
+
+            with self.assertRaises(sqlite3.OperationalError):
+                snapshot.cursor.execute("DELETE FROM cameras")
+            snapshot.close()
+
+    def test_iter_by_field_like(self):
+        cameras = self.controller.iter_by_field_like("model", "", batch_size=2)
+
+        # Other queries can run while the iterator is consumed
+        self.assertEqual(next(cameras).model, "EOS R6")
+        self.assertEqual(len(self.controller.get_by_field("brand", "Sony")), 1)
+        self.assertEqual([camera.model for camera in cameras], ["D750", "A7 III"])
+
+    def test_iter_variants_match_get_by(self):
+        self.assertEqual(
+            [camera.model for camera in self.controller.iter_by_fields_like_or({"brand": "Can", "model": "D750"})],
+            [camera.model for camera in self.controller.get_by_fields_like_or({"brand": "Can", "model": "D750"})],
+        )
+        conditions = [("sensor_size_w", "=", 36)]
+        self.assertEqual(
+            [camera.model for camera in self.controller.iter_by_fields_with_operators(conditions, batch_size=1)],
+            ["EOS R6", "D750"],
+        )
+        self.assertEqual(list(self.controller.iter_search("")), [])
+
+    def test_camera_row_factory(self):
+        factory = CamerasController.camera_row_factory(Camera, ("rowid", "model", "brand", "sensor_px_h"))
+
+        camera = factory(None, (7, "EOS R6", "Canon", 4480))
+        self.assertEqual((camera.brand, camera.model, camera.sensor_px_h), ("Canon", "EOS R6", 4480))
+        self.assertIsNone(camera.sensor_size_w)
+        self.assertIsNone(camera.dimensions)
+        self.assertIs(
+            CamerasController.camera_row_factory(Camera, ("rowid", "model", "brand", "sensor_px_h")), factory
+        )
+
+    def test_fetch_cameras_leaves_cursor_row_factory(self):
+        self.controller.get_by_field("brand", "Canon")
+
+        self.controller.cursor.execute("SELECT COUNT(*) FROM cameras")
+        self.assertEqual(self.controller.cursor.fetchone(), (3,))
+
+    def test_get_by_fields_projection(self):
+        fields = ["brand", "model", "sensor_size_w", "sensor_size_h", "sensor_px_w", "sensor_px_h"]
+        result = self.controller.get_by_fields_like_and({"brand": "Can"}, fields=fields)
+
+        self.assertEqual(len(result), 1)
+        camera = result[0]
+        self.assertEqual(camera._fields, tuple(fields))
+        self.assertEqual(camera.sensor, (36, 24, 6720, 4480))
+        self.assertEqual(camera.diagonal_size_mm(), sqrt(36 ** 2 + 24 ** 2))
+        self.assertEqual(camera.diagonal_size_px(), sqrt(6720 ** 2 + 4480 ** 2))
+
+        camera = self.controller.get_by_field("brand", "Sony", fields=["model"])[0]
+        self.assertEqual(camera, ("A7 III",))
+        self.assertFalse(hasattr(camera, "url"))
+
+        models = [camera.model for camera in self.controller.iter_by_field_like("model", "", fields=["model"])]
+        self.assertEqual(models, ["EOS R6", "D750", "A7 III"])
+
+    def test_invalid_fields_and_operators(self):
+        with self.assertRaises(ValueError):
+            self.controller.get_by_field("brand = brand --", "Canon")
+        with self.assertRaises(ValueError):
+            self.controller.get_by_fields_like_and({"brand": "Can", "1 = 1 OR model": "EOS"})
+        with self.assertRaises(ValueError):
+            self.controller.get_by_fields_with_operators([("year", "> 0 OR year <", 2000)])
+        with self.assertRaises(ValueError):
+            self.controller.get_by_field("brand", "Canon", fields=["model", "sqlite_master.sql"])
+
+    def test_resolve_many(self):
+        pairs = [("canon", "eos"), ("Nikon", "D750"), ("CANON", "EOS"), ("Leica", "M11"), ("", "a"), ("NIKON", "d750 ")]
+        result = self.controller.resolve_many(pairs)
+
+        self.assertEqual(set(result), set(pairs))
+        self.assertEqual([camera.model for camera in result[("canon", "eos")]], ["EOS R6"])
+        self.assertIs(result[("canon", "eos")], result[("CANON", "EOS")])
+        self.assertEqual([camera.brand for camera in result[("Nikon", "D750")]], ["Nikon"])
+        self.assertEqual(result[("Leica", "M11")], [])
+
+        # Pairs match exactly as get_by_fields_like_and does, surrounding spaces included
+        for brand, model in (("", "a"), ("NIKON", "d750 ")):
+            self.assertEqual(
+                [camera.model for camera in result[(brand, model)]],
+                [camera.model for camera in self.controller.get_by_fields_like_and({"brand": brand, "model": model})],
+            )
+        self.assertEqual(result[("NIKON", "d750 ")], [])
+
+        # Pairs given as lists are keyed by their tuple
+        result = self.controller.resolve_many([["Nikon", "D750"]])
+        self.assertEqual([camera.model for camera in result[("Nikon", "D750")]], ["D750"])
+
+        result = self.controller.resolve_many([("Sony", "A7")], fields=["model"])
+        self.assertEqual(result, {("Sony", "A7"): [("A7 III",)]})
+
+    def create_alias_table(self):
+        self.controller.cursor.executescript(CREATE_CAMERA_CHILD_TABLES_QUERY)
+        self.controller.cursor.executescript(CREATE_CAMERA_INDEXES_QUERY)
+        self.controller.cursor.execute(
+            "UPDATE cameras SET also_known_as = 'EOS R6 Body (Japan)' WHERE model = 'EOS R6'"
+        )
+        rows = self.controller.cursor.execute("SELECT rowid, brand, model, also_known_as FROM cameras").fetchall()
+        self.controller.cursor.executemany(
+            "INSERT INTO camera_aliases (camera_id, alias, priority) VALUES (?, ?, ?)",
+            [
+                (camera_id, alias, priority)
+                for camera_id, brand, model, also_known_as in rows
+                for alias, priority in camera_aliases(brand, model, also_known_as, {"canon", "nikon", "sony"})
+            ],
+        )
+        self.controller.conn.commit()
+
+    def test_resolve_exif(self):
+        self.create_alias_table()
+
+        result = self.controller.resolve_exif("NIKON CORPORATION", "NIKON D750")
+        self.assertEqual([(camera.brand, camera.model) for camera in result], [("Nikon", "D750")])
+
+        result = self.controller.resolve_exif("Canon", "Canon EOS R6 Body", fields=["model"])
+        self.assertEqual(result, [("EOS R6",)])
+
+        # No exact alias, ranked by similarity within the brand
+        result = self.controller.resolve_exif("SONY", "A7III")
+        self.assertEqual([camera.model for camera in result], ["A7 III"])
+        result = self.controller.resolve_exif("Canon", "EOS R6 Mark II")
+        self.assertEqual([camera.model for camera in result], ["EOS R6"])
+
+        # Unknown brands are compared with every alias
+        result = self.controller.resolve_exif("Unknown", "D750")
+        self.assertEqual([camera.model for camera in result], ["D750"])
+
+        self.assertEqual(self.controller.resolve_exif("Leica", "M11"), [])
+        self.assertEqual(self.controller.resolve_exif("Canon", "EOS R6 Mark II", cutoff=0.95), [])
+
+    def test_similar_to(self):
+        self.controller.cursor.execute("UPDATE cameras SET year = 2014 WHERE model = 'D750'")
+        self.controller.cursor.execute("UPDATE cameras SET year = 2018 WHERE model != 'D750'")
+        self.controller.conn.commit()
+        canon = self.controller.get_by_field("model", "EOS R6")[0]
+
+        result = self.controller.similar_to(canon, k=5)
+        self.assertEqual([camera.model for camera in result], ["D750", "A7 III"])
+
+        result = self.controller.similar_to(canon, k=1, weights={"year": 10}, fields=["model"])
+        self.assertEqual(result, [("A7 III",)])
+
+        # The index is rebuilt once the database changes
+        self.controller.cursor.execute(
+            """
+            INSERT INTO cameras (brand, model, sensor_size_w, sensor_size_h, sensor_px_w, sensor_px_h, year)
+            VALUES ('Canon', 'EOS R', 36, 24, 6720, 4480, 2018)
+            """
+        )
+        self.controller.conn.commit()
+        result = self.controller.similar_to(canon, k=1)
+        self.assertEqual([camera.model for camera in result], ["EOS R"])
+
+        result = self.controller.similar_to({"sensor_size_w": 35.6, "sensor_size_h": 23.8}, k=1)
+        self.assertEqual([camera.model for camera in result], ["A7 III"])
+
+
+class TestCamerasControllerBundledDatabase(TestCase):
+    """
+    Runs the queries over the cameras_db.db packaged with cameras_db.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.controller = CamerasController()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.controller.close()
+
+    def test_search(self):
+        result = self.controller.search("EOS 5D", limit=3)
+        self.assertEqual([camera.model for camera in result], ["EOS 5D", "EOS 5DS", "EOS 5DS R"])
+        self.assertEqual({camera.brand for camera in self.controller.search("nikon d7")}, {"Nikon"})
+
+    def test_iso_range_and_storage_type(self):
+        # "Auto,100-12800 (expands to 50-51200)" is one range, so values inside it match as well as its ends
+        for iso in (50, 3200, 51200):
+            self.assertIn("D750", [camera.model for camera in self.controller.get_by_iso_range(iso, iso)])
+        self.assertNotIn("D750", [camera.model for camera in self.controller.get_by_iso_range(min_iso=102400)])
+
+        self.assertIn("D750", [camera.model for camera in self.controller.get_by_storage_type("SDXC")])
+        self.assertIn("Z9", [camera.model for camera in self.controller.get_by_storage_type("xqd")])
+        self.assertNotIn("D750", [camera.model for camera in self.controller.get_by_storage_type("XQD")])
+
+    def test_resolve_exif(self):
+        result = self.controller.resolve_exif("NIKON CORPORATION", "NIKON D7500")
+        self.assertEqual([(camera.brand, camera.model) for camera in result], [("Nikon", "D7500")])
+        result = self.controller.resolve_exif("Canon", "Canon EOS 5D Mark IV")
+        self.assertEqual([(camera.brand, camera.model) for camera in result], [("Canon", "EOS 5D Mark IV")])
+
+    def test_companion_columns(self):
+        d750, = self.controller.get_by_fields_with_operators([("brand", "=", "Nikon"), ("model", "=", "D750")])
+        self.assertEqual((d750.weight, d750.weight_g, d750.screen_size_in), ("840 g", 840.0, 3.2))
+        self.assertEqual((d750.min_shutter_s, d750.max_shutter_s, d750.dimensions_w_mm), (30.0, 0.00025, 140.5))
+
+        result = self.controller.get_by_fields_with_operators(
+            [("weight_g", "<", 200), ("max_aperture_wide", "<=", 2.0)], fields=["weight_g", "max_aperture_wide"]
+        )
+        self.assertTrue(result)
+        self.assertTrue(all(camera.weight_g < 200 and camera.max_aperture_wide <= 2.0 for camera in result))
+
+    def test_spec_index_is_shared(self):
+        other = CamerasController()
+        snapshot = CamerasController.snapshot()
+        try:
+            index = self.controller.spec_index()
+            self.assertIs(other.spec_index(), index)
+            self.assertIs(snapshot.spec_index(), index)
+            self.assertEqual(len(index), 3468)
+        finally:
+            other.close()
+            snapshot.close()
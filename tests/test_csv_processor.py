@@ -0,0 +1,306 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from cameras_db.constants import CAMERA_COLUMN_TYPES
+from cameras_db.setup.CameraCSVProcessor import PARSED_COLUMNS, CameraCSVProcessor, build_normalizers
+
+
+class TestCameraCSVProcessor(TestCase):
+
+    def setUp(self):
+        self.processor = CameraCSVProcessor("cameras-all.csv")
+        self.processor.fieldnames = [
+            "brand", "model", "crop_factor", "weight", "screen_size", "min_shutter_speed",
+            "max_shutter_speed", "max_aperture", "dimensions",
+        ]
+
+    def test_treat_fields_numeric_companions(self):
+        self.processor.treat_fields({
+            "Brand": "Acer",
+            "Model": "CE-5430",
+            "Crop factor": "6,02",
+            "Weight": "130 g",
+            "Screen size": '2.36"',
+            "Min shutter speed": "1/2 sec",
+            "Max shutter speed": "1/1000 sec",
+            "Max aperture": "f2.8 - f4.8",
+            "Dimensions": "88.5 x 60 x 28 mm",
+        })
+
+        row = self.processor.json_data[0]
+        self.assertEqual(row["crop_factor"], 6.02)
+        self.assertEqual(row["weight_g"], 130.0)
+        self.assertEqual(row["screen_size_in"], 2.36)
+        self.assertEqual(row["min_shutter_s"], 0.5)
+        self.assertEqual(row["max_shutter_s"], 0.001)
+        self.assertEqual((row["max_aperture_wide"], row["max_aperture_tele"]), (2.8, 4.8))
+        self.assertEqual(
+            (row["dimensions_w_mm"], row["dimensions_h_mm"], row["dimensions_d_mm"]), (88.5, 60.0, 28.0)
+        )
+
+    def test_treat_fields_column_names_and_types(self):
+        self.processor.fieldnames = [
+            "year", "effective_megapixels", "optical_zoom", "digital_zoom", "raw_support", "gps",
+            "max._aperture", "focal_length_(35mm_equiv.)", "max._aperture_(35mm_equiv.)",
+        ]
+        self.processor.treat_fields({
+            "Year": "2006",
+            "Effective megapixels": "20,9",
+            "Optical zoom": "4.6x",
+            "Digital zoom": "Yes",
+            "Raw support": "No",
+            "GPS": "No",
+            "Max. aperture": "f2.8 - f4.8",
+            "Focal length (35mm equiv.)": "32 - 96 mm",
+            "Max. aperture (35mm equiv.)": "f16.9 - f28.9",
+        })
+
+        self.assertEqual(self.processor.json_data[0], {
+            "year": 2006,
+            "effective_megapixels": 20.9,
+            "optical_zoom": 4.6,
+            "digital_zoom": True,
+            "raw_support": False,
+            "gps": False,
+            "max_aperture": "f2.8 - f4.8",
+            "max_aperture_wide": 2.8,
+            "max_aperture_tele": 4.8,
+            "focal_length_35mm_equiv": "32 - 96 mm",
+            "max_aperture_35mm_equiv": "f16.9 - f28.9",
+        })
+
+    def test_build_normalizers(self):
+        columns, normalizers = build_normalizers(["brand", "sensor_size", "crop_factor", "unknown_field"])
+        self.assertEqual(columns, ["brand", "sensor_size", "crop_factor", "unknown_field"])
+        self.assertEqual([column for column, _ in normalizers], columns)
+
+    def test_treat_fields_text_booleans(self):
+        # Yes and No are booleans in text columns, and in columns the table does not know, as in every column
+        self.processor.fieldnames = ["brand", "gps", "usb", "unknown_field"]
+        self.processor.treat_fields({"Brand": "Canon", "GPS": "Yes", "USB": "no", "Unknown field": "No"})
+        self.assertEqual(
+            self.processor.json_data[0], {"brand": "Canon", "gps": True, "usb": False, "unknown_field": False}
+        )
+
+    def test_parse_seconds(self):
+        self.assertEqual(CameraCSVProcessor.parse_seconds("30 sec"), 30.0)
+        self.assertEqual(CameraCSVProcessor.parse_seconds("Bulb+60 sec"), 60.0)
+        self.assertEqual(CameraCSVProcessor.parse_seconds("8min sec"), 480.0)
+        self.assertEqual(CameraCSVProcessor.parse_seconds("1/4000 sec"), 0.00025)
+        self.assertIsNone(CameraCSVProcessor.parse_seconds(None))
+
+    def test_parse_aperture_and_dimensions(self):
+        self.assertEqual(CameraCSVProcessor.parse_aperture_range("f2.8"), (2.8, 2.8))
+        self.assertEqual(CameraCSVProcessor.parse_aperture_range(""), (None, None))
+        self.assertEqual(CameraCSVProcessor.parse_dimensions("82.4×55.1×20.5 mm"), (82.4, 55.1, 20.5))
+        self.assertEqual(CameraCSVProcessor.parse_dimensions("92 x 61,5 x 31,5 mm"), (92.0, 61.5, 31.5))
+        self.assertEqual(CameraCSVProcessor.parse_dimensions("86 x 20.5 x mm"), (None, None, None))
+
+    def test_parse_iso_ranges(self):
+        self.assertEqual(
+            CameraCSVProcessor.parse_iso_ranges(["Auto", "100-25600 (extends to 51200)", "(50)"]),
+            [(None, None, 1), (100, 51200, 0), (50, 50, 0)],
+        )
+        self.assertEqual(
+            CameraCSVProcessor.parse_iso_ranges("100,200,400 (800 at 3 MP),1/2 or 1/3 EV steps"),
+            [(100, 100, 0), (200, 200, 0), (400, 400, 0), (800, 800, 0)],
+        )
+        self.assertEqual(
+            CameraCSVProcessor.parse_iso_ranges("Auto (100 \u2013 3200)"), [(None, None, 1), (100, 3200, 0)]
+        )
+        self.assertEqual(CameraCSVProcessor.parse_iso_ranges(None), [])
+
+    def test_split_storage_types(self):
+        self.assertEqual(CameraCSVProcessor.split_storage_types("SD/SDHC/SDXC"), ["SD", "SDHC", "SDXC"])
+        self.assertEqual(
+            CameraCSVProcessor.split_storage_types("SDHC, Secure Digital, SDHC"), ["SDHC", "Secure Digital"]
+        )
+        self.assertEqual(CameraCSVProcessor.split_storage_types(""), [])
+
+    def test_split_storage_types_of_bundled_values(self):
+        # Values of the bundled catalog, whose parentheses and slot counts once gave types such as "II"
+        cases = {
+            "PCMCIA (2 x type II / 1 x type III)": ["PCMCIA"],
+            "PCMCIA Type II / III": ["PCMCIA Type II", "III"],
+            "SD/SDHC/SDXC x 2 slots": ["SD", "SDHC", "SDXC"],
+            "SD,SDHC,SDXC x 2 slots": ["SD", "SDHC", "SDXC"],
+            "Compact Flash (Type I, XQD) x2": ["Compact Flash"],
+            "Compact Flash (2 slots: 1 @ Type I, 1 @ Type I or II)": ["Compact Flash"],
+            "Compact Flash (Type I or II), SD/SDHC card": ["Compact Flash", "SD", "SDHC"],
+            "SD/SDHC/SDXC (dual card slots)": ["SD", "SDHC", "SDXC"],
+            "Dual SD/SDHC/SDXC": ["SD", "SDHC", "SDXC"],
+            "SD, SDHC, SDXC and Eye-Fi Card": ["SD", "SDHC", "SDXC", "Eye-Fi"],
+            "xD Picture Card, Internal+SD/SDHC": ["xD Picture", "Internal", "SD", "SDHC"],
+            "Memory Stick PRO Duo/Pro-HG Duo; SD, SDHC and SDXC": [
+                "Memory Stick PRO Duo", "Pro-HG Duo", "SD", "SDHC", "SDXC"
+            ],
+        }
+        for storage_types, expected in cases.items():
+            with self.subTest(storage_types=storage_types):
+                self.assertEqual(CameraCSVProcessor.split_storage_types(storage_types), expected)
+
+
+class TestCameraCSVProcessorParallel(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp_dir.name, "cameras.csv")
+        lines = ["Brand;Model;Also known as;Sensor size;Sensor resolution;ISO;Raw support"]
+        for number in range(60):
+            # Quoted newlines, LF or CRLF, are kept as they are inside the field
+            also_known_as = f'"Model {number}\n(""Japan"")"' if number % 7 == 0 else ""
+            also_known_as = f'"Model {number}\r\n(""Japan"")"' if number % 7 == 3 else also_known_as
+            lines.append(
+                f"Brand {number % 5};Model {number};{also_known_as};APS-C (23.5 x 15.6 mm);6000 x 4000;"
+                f"Auto, 100-{number * 100 + 100};{'Yes' if number % 2 else 'No'}"
+            )
+        with open(self.csv_path, mode="w", encoding="utf-8", newline="") as f:
+            f.write("\r\n".join(lines) + "\r\n")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_record_ranges_split_on_record_boundaries(self):
+        with open(self.csv_path, mode="rb") as f:
+            header = f.readline()
+            content = f.read()
+
+        for chunk_size in (1, 7, 64, 1 << 20):
+            ranges = list(CameraCSVProcessor.record_ranges(self.csv_path, len(header), chunk_size))
+            self.assertEqual(ranges[0][0], len(header))
+            self.assertEqual(ranges[-1][1], len(header) + len(content))
+            for (_, end), (start, _) in zip(ranges, ranges[1:]):
+                self.assertEqual(end, start)
+            for start, end in ranges:
+                record = content[start - len(header):end - len(header)]
+                self.assertTrue(record.endswith(b"\r\n"))
+                self.assertEqual(record.count(b'"') % 2, 0)
+
+    def test_iter_rows_parallel_matches_iter_rows(self):
+        expected = list(CameraCSVProcessor(self.csv_path).iter_rows())
+        self.assertEqual(len(expected), 60)
+        self.assertEqual(expected[7]["also_known_as"], 'Model 7\n("Japan")')
+        self.assertEqual(expected[3]["also_known_as"], 'Model 3\r\n("Japan")')
+
+        for workers in (1, 2):
+            processor = CameraCSVProcessor(self.csv_path)
+            self.assertEqual(list(processor.iter_rows_parallel(workers=workers, chunk_size=200)), expected)
+            self.assertEqual(processor.fieldnames[:2], ["brand", "model"])
+
+
+class TestCameraCSVProcessorCatalogRows(TestCase):
+    """
+    Imports rows of the catalog CSV, as spelled in the feed, and checks every parsed column against values read
+    off the raw fields by hand.
+    """
+
+    HEADER = (
+        "Brand;Model;Year;Megapixels;Effective megapixels;Total megapixels;Sensor size;Sensor resolution;"
+        "Crop factor;Optical zoom;Digital zoom;Raw support;Max aperture;Min shutter speed;Max shutter speed;"
+        "Screen size;Weight;Dimensions"
+    )
+    LINES = [
+        'Nikon;D750;2014;24,3;24,3;24,93;35.9 x 24 mm;6038 x 4025;1;;No;Yes;;30 sec;1/4000 sec;3.2";840 g;'
+        "140.5 x 113 x 78 mm",
+        'Acer;CE-5430;2006;5;;;1/2.5" (~ 5.75 x 4.32 mm);2579 x 1939;6,02;1x;Yes;;f2.8 - f4.8;1/2 sec;1/1000 sec;'
+        '2.36";130 g;88.5 x 60 x 28 mm',
+        'Fujifilm;X100V;2020;26,1;;;23.5 x 15.6 mm;6277 x 4157;1,53;1x;Yes;Yes;f2.0;30 sec;1/32000 sec;3";478 g;'
+        "128 x 74.8 x 53.3 mm",
+        "Panasonic;Lumix DC-G9;2017;20,33;20,33;21,77;Four Thirds (17.3 x 13 mm);5200 x 3910;2;;Yes;Yes;;60 sec;"
+        '1/8000 sec;3";658 g;136.9 x 97.3 x 91.6 mm',
+        'BenQ;DC T850;2008;8;;;1/2.5" (~ 5.75 x 4.32 mm);3262 x 2453;6,02;1x;Yes;;f2.7 - f5.2;8 sec;1/2000 sec;'
+        '3";120 g;91 x 59 x 14,9 mm',
+        "Canon;EOS 350D;2005;8;;;22.2 x 14.8 mm;3477 x 2318;1,62;;No;Yes;;Bulb+30 sec;1/4000 sec;;;",
+        "Concord;3043;2004;3;;;;;;;;;;;;;;86 x 20.5 x mm",
+    ]
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp_dir.name, "cameras.csv")
+        with open(self.csv_path, mode="w", encoding="utf-8", newline="") as f:
+            f.write("\n".join([self.HEADER] + self.LINES) + "\n")
+        self.rows = {row["model"]: row for row in CameraCSVProcessor(self.csv_path).iter_rows()}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def assertColumns(self, columns, expected):
+        for model, values in expected.items():
+            self.assertEqual(tuple(self.rows[model][column] for column in columns), values, model)
+
+    def test_numbers_with_decimal_commas_and_units(self):
+        self.assertColumns(
+            ("year", "megapixels", "effective_megapixels", "total_megapixels", "crop_factor", "optical_zoom"),
+            {
+                "D750": (2014, 24.3, 24.3, 24.93, 1.0, None),
+                "CE-5430": (2006, 5.0, None, None, 6.02, 1.0),
+                "X100V": (2020, 26.1, None, None, 1.53, 1.0),
+                "Lumix DC-G9": (2017, 20.33, 20.33, 21.77, 2.0, None),
+                "EOS 350D": (2005, 8.0, None, None, 1.62, None),
+            },
+        )
+
+    def test_booleans(self):
+        self.assertColumns(
+            ("digital_zoom", "raw_support"),
+            {"D750": (False, True), "CE-5430": (True, None), "X100V": (True, True), "3043": (None, None)},
+        )
+
+    def test_sensor_columns(self):
+        self.assertColumns(
+            ("sensor_size_w", "sensor_size_h", "sensor_px_w", "sensor_px_h"),
+            {
+                "D750": (35.9, 24.0, 6038, 4025),
+                "CE-5430": (5.75, 4.32, 2579, 1939),
+                "Lumix DC-G9": (17.3, 13.0, 5200, 3910),
+                "3043": (None, None, None, None),
+            },
+        )
+
+    def test_units_are_parsed(self):
+        self.assertColumns(
+            ("weight", "weight_g", "screen_size", "screen_size_in"),
+            {
+                "D750": ("840 g", 840.0, '3.2"', 3.2),
+                "CE-5430": ("130 g", 130.0, '2.36"', 2.36),
+                "X100V": ("478 g", 478.0, '3"', 3.0),
+                "EOS 350D": (None, None, None, None),
+            },
+        )
+
+    def test_shutter_speeds_are_parsed(self):
+        self.assertColumns(
+            ("min_shutter_speed", "min_shutter_s", "max_shutter_speed", "max_shutter_s"),
+            {
+                "D750": ("30 sec", 30.0, "1/4000 sec", 0.00025),
+                "CE-5430": ("1/2 sec", 0.5, "1/1000 sec", 0.001),
+                "X100V": ("30 sec", 30.0, "1/32000 sec", 0.00003125),
+                "EOS 350D": ("Bulb+30 sec", 30.0, "1/4000 sec", 0.00025),
+                "3043": (None, None, None, None),
+            },
+        )
+
+    def test_apertures_and_dimensions_are_parsed(self):
+        self.assertColumns(
+            ("max_aperture", "max_aperture_wide", "max_aperture_tele"),
+            {
+                "CE-5430": ("f2.8 - f4.8", 2.8, 4.8),
+                "X100V": ("f2.0", 2.0, 2.0),
+                "D750": (None, None, None),
+            },
+        )
+        self.assertColumns(
+            ("dimensions", "dimensions_w_mm", "dimensions_h_mm", "dimensions_d_mm"),
+            {
+                "D750": ("140.5 x 113 x 78 mm", 140.5, 113.0, 78.0),
+                "DC T850": ("91 x 59 x 14,9 mm", 91.0, 59.0, 14.9),
+                # The depth is missing, the text is kept but nothing is parsed
+                "3043": ("86 x 20.5 x mm", None, None, None),
+            },
+        )
+
+    def test_rows_fit_the_table(self):
+        for model, row in self.rows.items():
+            self.assertLessEqual(set(row), set(CAMERA_COLUMN_TYPES), model)
+            self.assertLessEqual(set(PARSED_COLUMNS), set(row), model)
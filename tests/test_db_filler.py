@@ -0,0 +1,277 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+from unittest import TestCase
+
+from cameras_db.paths import default_db_path
+from cameras_db.setup.CameraCSVProcessor import CameraCSVProcessor
+from cameras_db.setup.CameraDBFiller import CameraDBFiller
+
+CSV_LINES = [
+    "Brand;Model;Also known as;Sensor size;Sensor resolution;ISO;Raw support;Storage types;Weight",
+    'Canon;EOS 850D;EOS Rebel T8i (US);APS-C (22.3 x 14.9 mm);6000 x 4000;Auto, 100-25600;Yes;SD/SDHC/SDXC;515 g',
+    "Nikon;D750;;Full frame (35.9 x 24 mm);6016 x 4016;Auto, 100-12800;Yes;SD/SDHC;750 g",
+    "Sony;A7 III;;Full frame (35.6 x 23.8 mm);6000 x 4000;Auto, 100-51200;No;Memory Stick Duo, SD;650 g",
+]
+
+
+class TestCameraDBFiller(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp_dir.name, "cameras.csv")
+        with open(self.csv_path, mode="w", encoding="utf-8") as f:
+            f.write("\n".join(CSV_LINES) + "\n")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def new_filler(self, name):
+        filler = CameraDBFiller(os.path.join(self.tmp_dir.name, name), "cameras", self.csv_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            filler.connect_db()
+            filler.create_camera_table()
+            filler.create_child_tables()
+        return filler
+
+    def dump(self, filler):
+        return {
+            table: filler.conn.execute(f"SELECT rowid, * FROM {table} ORDER BY rowid").fetchall()
+            for table in ("cameras", "camera_iso", "camera_storage", "camera_aliases")
+        }
+
+    def test_stream_matches_json_import(self):
+        processor = CameraCSVProcessor(self.csv_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            processor.open_csv()
+        json_filler = self.new_filler("json.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            json_filler.read_json_and_insert(json.loads(processor.convert_to_json()))
+
+        stream_filler = self.new_filler("stream.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            count = stream_filler.stream_csv_and_insert(batch_size=2)
+
+        self.assertEqual(count, 3)
+        self.assertEqual(self.dump(stream_filler), self.dump(json_filler))
+        self.assertEqual(
+            stream_filler.conn.execute("SELECT brand, model, raw_support, sensor_px_w FROM cameras").fetchall(),
+            [("Canon", "EOS 850D", 1, 6000), ("Nikon", "D750", 1, 6016), ("Sony", "A7 III", 0, 6000)],
+        )
+
+        # Pragmas are restored once the load is done
+        self.assertEqual(stream_filler.conn.execute("PRAGMA journal_mode").fetchone()[0], "delete")
+        self.assertEqual(stream_filler.conn.execute("PRAGMA synchronous").fetchone()[0], 2)
+
+        json_filler.conn.close()
+        stream_filler.conn.close()
+
+    def test_insert_rows_continues_rowids(self):
+        filler = self.new_filler("rows.db")
+        filler.insert_camera({"brand": "Leica", "model": "M11", "iso": ["64-50000"]})
+        filler.conn.commit()
+
+        rows = CameraCSVProcessor(self.csv_path).iter_rows()
+        self.assertEqual(filler.insert_rows(rows, batch_size=10), 3)
+
+        self.assertEqual(
+            filler.conn.execute("SELECT rowid, model FROM cameras ORDER BY rowid").fetchall(),
+            [(1, "M11"), (2, "EOS 850D"), (3, "D750"), (4, "A7 III")],
+        )
+        self.assertEqual(
+            filler.conn.execute("SELECT DISTINCT camera_id FROM camera_storage ORDER BY camera_id").fetchall(),
+            [(2,), (3,), (4,)],
+        )
+        filler.conn.close()
+
+    def test_insert_query_is_built_once_per_column_set(self):
+        query = CameraDBFiller.insert_query("cameras", ("brand", "focal_length_(35mm_equiv.)"))
+        self.assertEqual(query, 'INSERT INTO cameras ("brand", "focal_length_35mm_equiv") VALUES (?, ?)')
+        self.assertIs(CameraDBFiller.insert_query("cameras", ("brand", "focal_length_(35mm_equiv.)")), query)
+
+    def write_csv(self, lines):
+        with open(self.csv_path, mode="w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def build(self, name):
+        filler = self.new_filler(name)
+        with contextlib.redirect_stdout(io.StringIO()):
+            filler.stream_csv_and_insert()
+            filler.create_fts_table()
+            filler.create_indexes()
+        return filler
+
+    def test_upsert_csv(self):
+        filler = self.build("upsert.db")
+        rowids = dict(filler.conn.execute("SELECT model, rowid FROM cameras").fetchall())
+
+        self.write_csv([
+            CSV_LINES[0],
+            CSV_LINES[1],
+            CSV_LINES[2].replace("SD/SDHC", "XQD").replace("750 g", "755 g"),
+            "Fujifilm;X-T5;;APS-C (23.5 x 15.6 mm);7728 x 5152;100-12800;Yes;SD/SDHC/SDXC;557 g",
+            CSV_LINES[1].replace("515 g", "999 g"),
+        ])
+        with contextlib.redirect_stdout(io.StringIO()):
+            counts = filler.upsert_csv(delete_missing=True)
+
+        self.assertEqual(counts, {"inserted": 1, "updated": 1, "unchanged": 1, "deleted": 1, "duplicate": 1})
+        self.assertEqual(
+            filler.conn.execute("SELECT rowid, model, weight_g FROM cameras ORDER BY rowid").fetchall(),
+            [(rowids["EOS 850D"], "EOS 850D", 515), (rowids["D750"], "D750", 755), (4, "X-T5", 557)],
+        )
+        self.assertEqual(
+            filler.conn.execute("SELECT camera_id, type FROM camera_storage ORDER BY camera_id, type").fetchall(),
+            [(1, "SD"), (1, "SDHC"), (1, "SDXC"), (2, "XQD"), (4, "SD"), (4, "SDHC"), (4, "SDXC")],
+        )
+        self.assertEqual(
+            filler.conn.execute("SELECT DISTINCT camera_id FROM camera_aliases ORDER BY camera_id").fetchall(),
+            [(1,), (2,), (4,)],
+        )
+        self.assertEqual(
+            filler.conn.execute("SELECT rowid FROM cameras_fts WHERE cameras_fts MATCH 'fujifilm'").fetchall(),
+            [(4,)],
+        )
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            counts = filler.upsert_csv()
+        self.assertEqual(counts, {"inserted": 0, "updated": 0, "unchanged": 3, "deleted": 0, "duplicate": 1})
+        filler.conn.close()
+
+    def test_aliases_follow_the_brands_of_the_table(self):
+        filler = self.build("brands.db")
+        ricoh = "Ricoh;Pentax K-1;;Full frame (35.9 x 24 mm);7360 x 4912;100-204800;Yes;SD/SDHC/SDXC;925 g"
+        pentax = "Pentax;K-3;;APS-C (23.5 x 15.6 mm);6016 x 4000;100-51200;Yes;SD/SDHC/SDXC;800 g"
+
+        def aliases():
+            return filler.conn.execute(
+                "SELECT alias FROM camera_aliases JOIN cameras ON cameras.rowid = camera_id WHERE brand = 'Ricoh'"
+            ).fetchall()
+
+        # Pentax arrives in a later batch than the Ricoh camera named after it
+        self.write_csv(CSV_LINES + [ricoh, pentax])
+        with contextlib.redirect_stdout(io.StringIO()):
+            filler.upsert_rows(CameraCSVProcessor(self.csv_path).iter_rows(), batch_size=1)
+        self.assertEqual(aliases(), [("pentax:k1",)])
+
+        self.write_csv(CSV_LINES + [ricoh])
+        with contextlib.redirect_stdout(io.StringIO()):
+            filler.upsert_csv(delete_missing=True)
+        self.assertEqual(aliases(), [("ricoh:pentaxk1",)])
+
+        filler.conn.execute("INSERT INTO cameras (brand, model) VALUES ('Pentax', 'K-5')")
+        filler.rebuild_alias_table()
+        self.assertEqual(aliases(), [("pentax:k1",)])
+        filler.conn.close()
+
+    def test_upsert_rows_rolls_back_on_error(self):
+        filler = self.build("rollback.db")
+        before = filler.conn.execute("SELECT rowid, * FROM cameras").fetchall()
+
+        def rows():
+            yield {"brand": "Nikon", "model": "D750", "weight": "1 g"}
+            yield {"brand": "Leica", "model": "M11"}
+            raise ValueError("truncated feed")
+
+        with self.assertRaises(ValueError):
+            filler.upsert_rows(rows(), delete_missing=True, batch_size=1)
+        self.assertEqual(filler.conn.execute("SELECT rowid, * FROM cameras").fetchall(), before)
+        filler.conn.close()
+
+    def test_create_indexes_keeps_the_first_duplicate(self):
+        self.write_csv(CSV_LINES + [CSV_LINES[2].replace("750 g", "760 g")])
+        filler = self.build("duplicates.db")
+
+        self.assertEqual(
+            filler.conn.execute("SELECT rowid, weight_g FROM cameras WHERE model = 'D750'").fetchall(), [(2, 750)]
+        )
+        with self.assertRaises(sqlite3.IntegrityError):
+            filler.conn.execute("INSERT INTO cameras (brand, model) VALUES ('Nikon', 'D750')")
+        filler.conn.close()
+
+    def old_database(self, name):
+        # The shape of a database built before the companion columns, content_hash and the child tables
+        filler = CameraDBFiller(os.path.join(self.tmp_dir.name, name), "cameras", self.csv_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            filler.connect_db()
+        filler.conn.executescript("""
+            CREATE TABLE cameras (
+                brand TEXT, model TEXT, also_known_as TEXT, sensor_size TEXT, sensor_resolution TEXT, iso TEXT,
+                raw_support INTEGER, storage_types TEXT, weight REAL, sensor_size_w REAL, sensor_size_h REAL,
+                sensor_px_w INTEGER, sensor_px_h INTEGER
+            );
+        """)
+        filler.conn.executemany(
+            "INSERT INTO cameras VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                ("Canon", "EOS 850D", "EOS Rebel T8i (US)", "APS-C (22.3 x 14.9 mm)", "6000 x 4000", "Auto,100-25600",
+                 1, "SD/SDHC/SDXC", "515 g", 22.3, 14.9, 6000, 4000),
+                ("Nikon", "D750", None, "Full frame (35.9 x 24 mm)", "6016 x 4016", "Auto,100-12800",
+                 1, "SD/SDHC", "750 g", 35.9, 24, 6016, 4016),
+                ("Nikon", "D750", None, None, None, None, None, None, None, None, None, None, None),
+            ],
+        )
+        filler.conn.commit()
+        return filler
+
+    def test_migrate_db(self):
+        filler = self.old_database("old.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            counts = filler.migrate_db()
+
+        self.assertEqual(counts, {"columns": 48, "normalized": 3, "children": 3})
+        self.assertEqual(
+            filler.conn.execute("SELECT model, weight_g, raw_support FROM cameras WHERE rowid < 3").fetchall(),
+            [("EOS 850D", 515, 1), ("D750", 750, 1)],
+        )
+        self.assertEqual(
+            filler.conn.execute("SELECT COUNT(*) FROM cameras WHERE content_hash IS NULL").fetchone(), (0,)
+        )
+        self.assertEqual(
+            filler.conn.execute("SELECT camera_id, iso_min, iso_max, is_auto FROM camera_iso").fetchall(),
+            [(1, None, None, 1), (1, 100, 25600, 0), (2, None, None, 1), (2, 100, 12800, 0)],
+        )
+        self.assertEqual(
+            filler.conn.execute("SELECT type FROM camera_storage WHERE camera_id = 2").fetchall(), [("SD",), ("SDHC",)]
+        )
+        self.assertEqual(
+            filler.conn.execute("SELECT rowid FROM cameras_fts WHERE cameras_fts MATCH 'rebel'").fetchall(), [(1,)]
+        )
+        self.assertIn(
+            ("canon:eosrebelt8i", 1), filler.conn.execute("SELECT alias, camera_id FROM camera_aliases").fetchall()
+        )
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(filler.migrate_db(), {"columns": 0, "normalized": 0, "children": 0})
+
+            # The duplicate D750 goes, the feed is upserted, and cameras missing from it are kept by default
+            self.write_csv(CSV_LINES[:3])
+            counts = filler.upsert_csv()
+            filler.create_indexes()
+        self.assertEqual(counts, {"inserted": 0, "updated": 2, "unchanged": 0, "deleted": 0, "duplicate": 0})
+        self.write_csv([CSV_LINES[0], CSV_LINES[2]])
+        with contextlib.redirect_stdout(io.StringIO()):
+            counts = filler.upsert_csv()
+        self.assertEqual(counts, {"inserted": 0, "updated": 0, "unchanged": 1, "deleted": 0, "duplicate": 0})
+        self.assertEqual(filler.conn.execute("SELECT COUNT(*) FROM cameras").fetchone(), (2,))
+        filler.conn.close()
+
+    def test_upsert_into_migrated_bundled_database(self):
+        db_path = os.path.join(self.tmp_dir.name, "bundled.db")
+        shutil.copyfile(default_db_path(), db_path)
+        filler = CameraDBFiller(db_path, "cameras", self.csv_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            filler.connect_db()
+            filler.migrate_db()
+            count = filler.conn.execute("SELECT COUNT(DISTINCT brand || ':' || model) FROM cameras").fetchone()[0]
+            counts = filler.upsert_csv()
+
+        self.assertEqual(counts["inserted"] + counts["updated"] + counts["unchanged"], 3)
+        self.assertEqual(filler.conn.execute("SELECT COUNT(*) FROM cameras").fetchone()[0], count + counts["inserted"])
+        for table in ("camera_iso", "camera_storage", "camera_aliases", "cameras_fts"):
+            self.assertGreater(filler.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0], count)
+        filler.conn.close()
@@ -0,0 +1,41 @@
+from unittest import TestCase
+
+from cameras_db.exif import brand_key, brand_keys, camera_aliases, exif_key
+
+
+class TestExif(TestCase):
+
+    def test_brand_key(self):
+        self.assertEqual(brand_key("NIKON CORPORATION"), "nikon")
+        self.assertEqual(brand_key("Nikon"), "nikon")
+        self.assertEqual(brand_key("EASTMAN KODAK COMPANY"), "kodak")
+        self.assertEqual(brand_key("OLYMPUS IMAGING CORP."), "olympus")
+        self.assertEqual(brand_key("Konica-Minolta"), "konicaminolta")
+        self.assertEqual(brand_key("KONICA MINOLTA"), "konicaminolta")
+        self.assertEqual(brand_key(None), "")
+
+    def test_brand_keys(self):
+        self.assertEqual(
+            brand_keys(["Nikon", "Konica Minolta", "Pentax", "Nikon"]), {"nikon", "konicaminolta", "pentax"}
+        )
+
+    def test_exif_key(self):
+        self.assertEqual(exif_key("NIKON CORPORATION", "NIKON D750"), "nikon:d750")
+        self.assertEqual(exif_key("Canon", "Canon EOS 5D Mark IV"), "canon:eos5dmarkiv")
+        # Another brand in front of the model only wins when the database has it
+        self.assertEqual(exif_key("RICOH IMAGING COMPANY, LTD.", "PENTAX K-1", {"pentax", "ricoh"}), "pentax:k1")
+        self.assertEqual(exif_key("RICOH IMAGING COMPANY, LTD.", "PENTAX K-1"), "ricoh:pentaxk1")
+        self.assertEqual(exif_key("EASTMAN KODAK COMPANY", "KODAK Z990 DIGITAL CAMERA"), "kodak:z990")
+        self.assertEqual(exif_key("OM Digital Solutions", "OM-1"), "olympus:om1")
+
+    def test_camera_aliases(self):
+        self.assertEqual(
+            camera_aliases("Canon", "EOS 850D", "EOS Rebel T8i (US), EOS Kiss X10i (Japan)"),
+            [("canon:eos850d", 0), ("canon:eosrebelt8i", 2), ("canon:eoskissx10i", 2)],
+        )
+        self.assertEqual(
+            camera_aliases("Panasonic", "Lumix DC-G9", None),
+            [("panasonic:lumixdcg9", 0), ("panasonic:dcg9", 1)],
+        )
+        self.assertEqual(camera_aliases("Nikon", "D750", ""), [("nikon:d750", 0)])
+        self.assertEqual(camera_aliases("Ricoh", "Pentax K-1", "", {"pentax", "ricoh"}), [("pentax:k1", 0)])
@@ -0,0 +1,76 @@
+from unittest import TestCase
+
+from cameras_db.constants import CREATE_CAMERA_TABLE_QUERY
+from cameras_db.controllers import CamerasController
+from cameras_db.instrumentation import QueryMetrics
+
+
+class TestFacets(TestCase):
+
+    def setUp(self):
+        self.controller = CamerasController(":memory:")
+        self.controller.cursor.execute(CREATE_CAMERA_TABLE_QUERY)
+        self.controller.cursor.executemany(
+            "INSERT INTO cameras (brand, model, year, sensor_type, megapixels) VALUES (?, ?, ?, ?, ?)",
+            [
+                ("Canon", "EOS R6", 2020, "CMOS", 20.1),
+                ("Canon", "EOS 90D", 2019, "CMOS", 32.5),
+                ("Canon", "PowerShot A70", 2003, "CCD", 3.2),
+                ("Nikon", "D750", 2014, "CMOS", 24.3),
+                ("Nikon", "Coolpix 5700", 2002, "CCD", "5,0"),
+                ("Sony", "A7 III", 2018, None, None),
+            ],
+        )
+        self.controller.conn.commit()
+
+    def tearDown(self):
+        self.controller.close()
+
+    def test_unfiltered(self):
+        facets = self.controller.facets(facet_fields=["brand", "sensor_type"])
+        self.assertEqual(facets["count"], 6)
+        self.assertEqual(list(facets["facets"]["brand"].items()), [("Canon", 3), ("Nikon", 2), ("Sony", 1)])
+        self.assertEqual(facets["facets"]["sensor_type"], {"CMOS": 3, "CCD": 2, None: 1})
+        # Text left in a numeric column is not part of the range
+        self.assertEqual(facets["ranges"], {"megapixels": (3.2, 32.5)})
+
+    def test_filters(self):
+        facets = self.controller.facets(
+            [("brand", "=", "Canon"), ("year", ">=", 2010)], ["sensor_type", "year"], ["megapixels", "year"]
+        )
+        self.assertEqual(facets["count"], 2)
+        self.assertEqual(facets["facets"], {"sensor_type": {"CMOS": 2}, "year": {2019: 1, 2020: 1}})
+        self.assertEqual(facets["ranges"], {"megapixels": (20.1, 32.5), "year": (2019, 2020)})
+
+        facets = self.controller.facets([("brand", "=", "Sony"), ("year", "<", 2004)], ["brand"], [], "OR")
+        self.assertEqual(facets["facets"]["brand"], {"Canon": 1, "Nikon": 1, "Sony": 1})
+
+        facets = self.controller.facets([("brand", "=", "Leica")])
+        self.assertEqual((facets["count"], facets["facets"]["brand"]), (0, {}))
+        self.assertEqual(facets["ranges"], {"megapixels": (None, None)})
+
+    def test_limit(self):
+        facets = self.controller.facets(facet_fields=["brand"], limit=2)
+        self.assertEqual(facets["facets"]["brand"], {"Canon": 3, "Nikon": 2})
+
+    def test_cached_per_db_version(self):
+        self.controller.metrics = QueryMetrics()
+        first = self.controller.facets(facet_fields=["brand"])
+        calls = len(self.controller.metrics.events())
+        first["facets"]["brand"]["Canon"] = 0
+
+        self.assertEqual(self.controller.facets(facet_fields=["brand"])["facets"]["brand"]["Canon"], 3)
+        self.assertEqual(len(self.controller.metrics.events()), calls)
+
+        self.controller.conn.execute("INSERT INTO cameras (brand, model) VALUES ('Canon', 'EOS R5')")
+        self.controller.conn.commit()
+        self.assertEqual(self.controller.facets(facet_fields=["brand"])["facets"]["brand"]["Canon"], 4)
+        self.assertGreater(len(self.controller.metrics.events()), calls)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            self.controller.facets(facet_fields=["unknown"])
+        with self.assertRaises(ValueError):
+            self.controller.facets(range_fields=["megapixels; DROP TABLE cameras"])
+        with self.assertRaises(ValueError):
+            self.controller.facets([("brand", "~", "Canon")])
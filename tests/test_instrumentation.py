@@ -0,0 +1,123 @@
+import sqlite3
+from unittest import TestCase
+
+from cameras_db.constants import CREATE_CAMERA_TABLE_QUERY
+from cameras_db.controllers import CamerasController
+from cameras_db.instrumentation import QueryEvent, QueryMetrics
+from cameras_db.result_cache import ResultCache
+
+
+class TestQueryMetrics(TestCase):
+
+    def setUp(self):
+        self.events = []
+        self.metrics = QueryMetrics(callbacks=[self.events.append])
+        self.controller = CamerasController(":memory:", metrics=self.metrics)
+        self.controller.cursor.execute(CREATE_CAMERA_TABLE_QUERY)
+        self.controller.cursor.executemany(
+            "INSERT INTO cameras (brand, model, sensor_size_w, sensor_size_h) VALUES (?, ?, ?, ?)",
+            [("Canon", "EOS R6", 36, 24), ("Nikon", "D750", 36, 24), ("Canon", "EOS 90D", 22.3, 14.9)],
+        )
+        self.controller.conn.commit()
+
+    def tearDown(self):
+        self.controller.close()
+
+    def test_records_every_query(self):
+        cameras = self.controller.get_by_field("brand", "Canon")
+        self.assertEqual(len(cameras), 2)
+
+        event, = self.events
+        self.assertEqual(event.method, "get_by_field")
+        self.assertIn("WHERE", event.sql)
+        self.assertEqual((event.param_count, event.rows, event.cached), (1, 2, False))
+        self.assertGreaterEqual(min(event.execute_s, event.fetch_s, event.materialize_s), 0)
+        self.assertAlmostEqual(event.total_s, event.execute_s + event.fetch_s + event.materialize_s)
+        self.assertIsNone(event.plan)
+
+        self.controller.to_arrays(["brand"])
+        self.assertEqual((self.events[-1].method, self.events[-1].rows), ("to_arrays", 3))
+        self.assertEqual(self.metrics.events(), self.events)
+
+    def test_records_iterators_once_consumed_or_closed(self):
+        cameras = self.controller.iter_by_field_like("model", "EOS", batch_size=1)
+        self.assertEqual(self.events, [])
+        self.assertEqual(len(list(cameras)), 2)
+        self.assertEqual((self.events[-1].method, self.events[-1].rows), ("iter_by_field_like", 2))
+
+        cameras = self.controller.iter_by_field_like("model", "", batch_size=1)
+        next(cameras)
+        cameras.close()
+        self.assertEqual((self.events[-1].method, self.events[-1].rows), ("iter_by_field_like", 1))
+
+    def test_iterator_outliving_its_connection(self):
+        self.metrics.slow_query_s = 0
+        cameras = self.controller.iter_by_field_like("model", "", batch_size=1)
+        next(cameras)
+
+        # As a pool does on release, the controller drops its connection while the iterator is open
+        self.controller.close()
+        self.controller.conn = None
+        with self.assertRaisesRegex(sqlite3.ProgrammingError, "closed database"):
+            next(cameras)
+
+        self.assertIsNone(self.controller._conn)
+        self.assertEqual((self.events[-1].method, self.events[-1].rows), ("iter_by_field_like", 1))
+
+    def test_records_the_public_method(self):
+        self.controller.get_page(limit=2)
+        self.controller.facets(facet_fields=["brand"], range_fields=[])
+        self.controller.fetch_by_rowids([2, 1])
+        self.controller.fetch_cameras("SELECT * FROM cameras", [])
+        self.assertEqual(
+            [event.method for event in self.events],
+            ["get_page", "facets", "facets", "fetch_by_rowids", "fetch_cameras"],
+        )
+
+        # Wrapped in a helper of the caller, the query is still recorded under the controller method
+        def lookup():
+            return self.controller.get_by_field("model", "D750")
+        lookup()
+        self.assertEqual(self.events[-1].method, "get_by_field")
+
+    def test_records_cache_hits(self):
+        self.controller.result_cache = ResultCache()
+        self.controller.get_by_field("brand", "Nikon")
+        self.controller.get_by_field("brand", "Nikon")
+
+        self.assertEqual([event.cached for event in self.events], [False, True])
+        self.assertEqual(self.metrics.summary()["get_by_field"]["calls"], 2)
+        self.assertEqual(self.metrics.summary()["get_by_field"]["cached"], 1)
+        self.assertEqual(self.metrics.summary()["get_by_field"]["rows"], 2)
+
+    def test_slow_queries_are_logged_with_their_plan(self):
+        self.metrics.slow_query_s = 0
+        with self.assertLogs("cameras_db.slow_queries", "WARNING") as logs:
+            self.controller.get_by_field("brand", "Canon")
+        self.assertIn("full scan: SCAN cameras", logs.output[0])
+        self.assertEqual(QueryMetrics.full_scans(self.events[-1].plan), ["SCAN cameras"])
+
+        self.controller.conn.execute("CREATE INDEX idx_cameras_brand ON cameras (brand)")
+        with self.assertLogs("cameras_db.slow_queries", "WARNING") as logs:
+            self.controller.get_by_field("brand", "Canon")
+        self.assertNotIn("full scan", logs.output[0])
+        self.assertEqual(QueryMetrics.full_scans(self.events[-1].plan), [])
+        self.assertIn("USING INDEX idx_cameras_brand", "\n".join(self.events[-1].plan))
+
+    def test_explain_failure_is_reported(self):
+        plan = QueryMetrics.explain(self.controller.conn, "SELECT * FROM missing_table")
+        self.assertTrue(plan[0].startswith("EXPLAIN QUERY PLAN failed"))
+
+    def test_clear_and_disabled(self):
+        self.controller.get_by_field("brand", "Canon")
+        self.metrics.clear()
+        self.assertEqual((self.metrics.events(), self.metrics.summary()), ([], {}))
+
+        self.controller.metrics = None
+        self.assertEqual(len(self.controller.get_by_field("brand", "Canon")), 2)
+        self.assertEqual(self.metrics.events(), [])
+
+    def test_event_as_dict(self):
+        event = QueryEvent("search", "SELECT 1", 0, rows=1)
+        self.assertEqual(event.as_dict()["method"], "search")
+        self.assertEqual(event.as_dict()["rows"], 1)
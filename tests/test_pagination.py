@@ -0,0 +1,105 @@
+import random
+from unittest import TestCase
+
+from cameras_db.constants import CREATE_CAMERA_TABLE_QUERY, CREATE_CAMERA_UNIQUE_KEY_QUERY
+from cameras_db.controllers import CamerasController
+from cameras_db.pagination import Page, decode_page_token, encode_page_token, sort_key
+
+
+class TestPagination(TestCase):
+
+    def setUp(self):
+        self.controller = CamerasController(":memory:")
+        self.controller.cursor.execute(CREATE_CAMERA_TABLE_QUERY)
+        self.controller.cursor.execute(CREATE_CAMERA_UNIQUE_KEY_QUERY)
+
+        rng = random.Random(7)
+        self.rows = [
+            (brand, f"Model {number:03d}", rng.choice([None, 2010, 2015, 2020]), rng.choice([None, 12.0, 24.2]))
+            for brand in ("Canon", "Nikon", "Sony", None)
+            for number in range(25)
+        ]
+        self.controller.cursor.executemany(
+            "INSERT INTO cameras (brand, model, year, megapixels) VALUES (?, ?, ?, ?)", self.rows
+        )
+        self.controller.conn.commit()
+
+    def tearDown(self):
+        self.controller.close()
+
+    def all_pages(self, limit, **kwargs):
+        cameras, token, pages = [], None, 0
+        while True:
+            page = self.controller.get_page(limit=limit, after=token, fields=["brand", "model", "year"], **kwargs)
+            cameras.extend((camera.brand, camera.model, camera.year) for camera in page)
+            pages += 1
+            token = page.next_token
+            if token is None:
+                return cameras, pages
+
+    def expected(self, conditions=()):
+        query, params = self.controller.query_builder.where(
+            conditions, fields=["brand", "model", "year"], order_by=["brand", "model", "rowid"]
+        )
+        return [tuple(row) for row in self.controller.conn.execute(query, params)]
+
+    def test_default_order(self):
+        cameras, pages = self.all_pages(limit=7)
+        self.assertEqual(cameras, self.expected())
+        self.assertEqual(len(cameras), 100)
+        self.assertEqual(pages, 15)
+
+    def test_conditions(self):
+        conditions = [("brand", "=", "Canon"), ("year", ">=", 2015)]
+        cameras, _ = self.all_pages(limit=4, conditions=conditions)
+        self.assertEqual(cameras, self.expected(conditions))
+        self.assertTrue(cameras)
+
+    def test_descending_and_null_keys(self):
+        for order_by in (["-year", "model"], ["year", "-brand"], ["-brand", "-year"], ["-megapixels"]):
+            with self.subTest(order_by=order_by):
+                cameras, _ = self.all_pages(limit=3, order_by=order_by)
+                order = self.controller.query_builder.order_by_clause(sort_key(order_by))
+                rows = self.controller.conn.execute(f"SELECT brand, model, year FROM cameras {order}")
+                self.assertEqual(cameras, [tuple(row) for row in rows])
+
+    def test_last_page_has_no_token(self):
+        page = self.controller.get_page([("brand", "=", "Sony")], limit=25)
+        self.assertEqual((len(page), page.next_token), (25, None))
+        page = self.controller.get_page([("brand", "=", "Sony")], limit=24)
+        self.assertIsNotNone(page.next_token)
+        self.assertIsInstance(page, Page)
+
+    def test_uses_the_index_without_offset(self):
+        query, params = self.controller.query_builder.page(
+            [], "AND", None, sort_key(["brand", "model"]), ["Nikon", "Model 010", 36], 51
+        )
+        self.assertNotIn("OFFSET", query)
+        plan = " ".join(row[3] for row in self.controller.conn.execute(f"EXPLAIN QUERY PLAN {query}", params))
+        self.assertIn("idx_cameras_brand_model_key", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_invalid_tokens(self):
+        page = self.controller.get_page([("brand", "=", "Canon")], limit=5)
+        with self.assertRaises(ValueError):
+            self.controller.get_page([("brand", "=", "Nikon")], limit=5, after=page.next_token)
+        with self.assertRaises(ValueError):
+            self.controller.get_page([("brand", "=", "Canon")], order_by=["model"], after=page.next_token)
+        with self.assertRaises(ValueError):
+            self.controller.get_page(after="not a token")
+        with self.assertRaises(ValueError):
+            self.controller.get_page(limit=0)
+        with self.assertRaises(ValueError):
+            self.controller.get_page(order_by=["-unknown"])
+
+    def test_token_round_trip(self):
+        key = sort_key(["-year"])
+        self.assertEqual(key, (("year", True), ("rowid", True)))
+        token = encode_page_token(key, "digest", [None, 3])
+        self.assertEqual(decode_page_token(token, key, "digest"), [None, 3])
+
+    def test_order_by(self):
+        cameras = self.controller.get_by_fields_with_operators(
+            [("brand", "=", "Nikon")], fields=["model"], order_by=["-model"]
+        )
+        self.assertEqual([camera.model for camera in cameras][:2], ["Model 024", "Model 023"])
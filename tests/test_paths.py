@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+import cameras_db
+from cameras_db.controllers import CamerasController
+from cameras_db.paths import DB_FILENAME, default_db_path
+
+
+class TestDefaultDBPath(TestCase):
+
+    def test_default_db_path(self):
+        path = default_db_path()
+        self.assertEqual(os.path.basename(path), DB_FILENAME)
+        self.assertTrue(os.path.isfile(path))
+        self.assertEqual(os.path.dirname(path), os.path.dirname(cameras_db.__file__))
+
+    def test_controller_uses_default_db_path(self):
+        controller = CamerasController()
+        self.assertEqual(controller.db_path, default_db_path())
+        self.assertIsNone(controller._conn)
+
+        self.assertTrue(controller.get_by_field("brand", "Canon"))
+        self.assertIsNotNone(controller._conn)
+        controller.close()
+
+    def test_close_without_query(self):
+        controller = CamerasController()
+        controller.close()
+        self.assertIsNone(controller._conn)
+
+
+class TestLazyPackageImport(TestCase):
+
+    def run_python(self, code):
+        return subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        ).stdout.split()
+
+    def test_import_loads_no_submodule(self):
+        loaded = self.run_python(
+            "import sys, cameras_db; print(*sorted(name for name in sys.modules if name.startswith('cameras_db')))"
+        )
+        self.assertEqual(loaded, ["cameras_db"])
+        self.assertNotIn("sqlite3", self.run_python("import sys, cameras_db; print(*sys.modules)"))
+
+    def test_attribute_loads_its_submodule(self):
+        loaded = self.run_python(
+            "import sys, cameras_db; cameras_db.ResultCache; "
+            "print(*sorted(name for name in sys.modules if name.startswith('cameras_db')))"
+        )
+        self.assertIn("cameras_db.result_cache", loaded)
+        self.assertNotIn("cameras_db.controllers", loaded)
+
+    def test_exports(self):
+        self.assertIs(cameras_db.CamerasController, CamerasController)
+        self.assertEqual(cameras_db.default_db_path, default_db_path)
+        self.assertLessEqual(set(cameras_db.__all__), set(dir(cameras_db)))
+        with self.assertRaises(AttributeError):
+            cameras_db.missing_name
@@ -0,0 +1,97 @@
+import os
+import sqlite3
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from cameras_db.constants import CREATE_CAMERA_TABLE_QUERY
+from cameras_db.instrumentation import QueryMetrics
+from cameras_db.pool import CamerasControllerPool
+
+
+class TestCamerasControllerPool(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "cameras_db.db")
+
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(CREATE_CAMERA_TABLE_QUERY)
+        conn.executemany(
+            """
+            INSERT INTO cameras (brand, model, sensor_size_w, sensor_size_h, sensor_px_w, sensor_px_h)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [
+                ("Canon", "EOS R6", 36, 24, 6720, 4480),
+                ("Nikon", "D750", 36, 24, 6720, 4480),
+                ("Sony", "A7 III", 35.6, 23.8, 6000, 4000),
+            ],
+        )
+        conn.commit()
+        conn.close()
+
+        self.pool = CamerasControllerPool(self.db_path, size=4, timeout=5)
+
+    def tearDown(self):
+        self.pool.close()
+        self.tmp_dir.cleanup()
+
+    def test_threads(self):
+        brands = ["Canon", "Nikon", "Sony"] * 100
+
+        def lookup(brand):
+            with self.pool.acquire() as controller:
+                return [camera.brand for camera in controller.get_by_field("brand", brand)]
+
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            results = list(executor.map(lookup, brands))
+
+        self.assertEqual(results, [[brand] for brand in brands])
+        self.assertLessEqual(self.pool._idle.qsize(), 4)
+
+    def test_bounded_and_reused(self):
+        pool = CamerasControllerPool(self.db_path, size=1, timeout=0.01)
+        controller = pool.acquire()
+        conn = controller.conn
+
+        with self.assertRaises(TimeoutError):
+            pool.acquire()
+
+        controller.close()
+        controller.close()
+        with pool.acquire() as controller:
+            self.assertIs(controller.conn, conn)
+        pool.close()
+
+        with self.assertRaises(RuntimeError):
+            pool.acquire()
+
+    def test_read_only(self):
+        with self.pool.acquire() as controller:
+            with self.assertRaises(sqlite3.OperationalError):
+                controller.cursor.execute("DELETE FROM cameras")
+
+    def test_controller_settings(self):
+        metrics = QueryMetrics()
+        pool = CamerasControllerPool(self.db_path, size=1, metrics=metrics)
+        with pool.acquire() as controller:
+            self.assertEqual(controller.db_path, self.db_path)
+            self.assertIs(controller.metrics, metrics)
+            self.assertIsNone(controller.result_cache)
+            self.assertEqual(len(controller.get_by_field("brand", "Canon")), 1)
+        self.assertEqual(metrics.events()[-1].method, "get_by_field")
+        pool.close()
+
+    def test_release_after_close_closes_the_connection(self):
+        pool = CamerasControllerPool(self.db_path, size=2)
+        idle, checked_out = pool.acquire(), pool.acquire()
+        idle_conn, checked_out_conn = idle.conn, checked_out.conn
+        idle.close()
+        pool.close()
+        checked_out.close()
+
+        self.assertEqual(pool._idle.qsize(), 0)
+        for conn in (idle_conn, checked_out_conn):
+            with self.assertRaises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
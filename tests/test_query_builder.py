@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+from cameras_db.query_builder import QueryBuilder
+
+
+class TestQueryBuilder(TestCase):
+
+    def setUp(self):
+        self.builder = QueryBuilder(cache_size=2)
+
+    def test_where(self):
+        query, params = self.builder.where([("brand", "=", "Canon"), ("sensor_size_w", ">", 35)])
+
+        self.assertEqual(query, "SELECT cameras.* FROM cameras WHERE brand = ? AND sensor_size_w > ?")
+        self.assertEqual(params, ["Canon", 35])
+
+    def test_equivalent_shapes_share_sql(self):
+        first = self.builder.where([("model", "like", "%5D%"), ("brand", "==", "Canon")], fields=["model"])
+        second = self.builder.where([("brand", "=", "Nikon"), ("model", "LIKE", "%D7%")], fields=["model"])
+
+        self.assertEqual(first[0], second[0])
+        self.assertEqual(first[0], "SELECT cameras.model FROM cameras WHERE brand = ? AND model LIKE ?")
+        self.assertEqual(first[1], ["Canon", "%5D%"])
+        self.assertEqual(second[1], ["Nikon", "%D7%"])
+
+        # A single condition reads the same whatever the separator
+        self.assertEqual(
+            self.builder.where([("brand", "=", "Canon")], "OR")[0], self.builder.where([("brand", "=", "Canon")])[0]
+        )
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            self.builder.where([("brand = 'Canon' OR 1 = 1 --", "=", 1)])
+        with self.assertRaises(ValueError):
+            self.builder.where([("brand", "; DROP TABLE cameras", 1)])
+        with self.assertRaises(ValueError):
+            self.builder.where([("brand", "=", 1), ("model", "=", 2)], "UNION")
+        with self.assertRaises(ValueError):
+            self.builder.select(["brand", "password"])
+        with self.assertRaises(ValueError):
+            self.builder.select([])
+
+    def test_stats_and_eviction(self):
+        self.builder.where([("brand", "=", "Canon")])
+        self.builder.where([("brand", "=", "Nikon")])
+        self.assertEqual(self.builder.stats(), {"hits": 1, "misses": 2, "size": 2})
+
+        self.builder.where([("model", "=", "D750")])
+        self.builder.where([("year", ">", 2010)])
+        self.assertEqual(self.builder.stats()["size"], 2)
+
+        self.builder.clear()
+        self.assertEqual(self.builder.stats(), {"hits": 0, "misses": 0, "size": 0})
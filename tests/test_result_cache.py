@@ -0,0 +1,134 @@
+import os
+import sqlite3
+import tempfile
+from unittest import TestCase
+
+from cameras_db.constants import CREATE_CAMERA_TABLE_QUERY
+from cameras_db.controllers import CamerasController
+from cameras_db.result_cache import MISSING, ResultCache
+
+
+class TestResultCache(TestCase):
+
+    def test_lru(self):
+        cache = ResultCache(max_size=2)
+        cache.put("a", 1, ["A"])
+        cache.put("b", 1, ["B"])
+        self.assertEqual(cache.get("a", 1), ["A"])
+
+        cache.put("c", 1, ["C"])
+        self.assertIs(cache.get("b", 1), MISSING)
+        self.assertEqual(cache.get("a", 1), ["A"])
+        self.assertEqual(cache.stats(), {"hits": 2, "misses": 1, "evictions": 1, "size": 2})
+
+    def test_version_and_ttl(self):
+        cache = ResultCache()
+        cache.put("a", 1, ["A"])
+        self.assertIs(cache.get("a", 2), MISSING)
+        self.assertEqual(cache.stats()["size"], 0)
+
+        cache = ResultCache(ttl=0)
+        cache.put("a", 1, ["A"])
+        self.assertIs(cache.get("a", 1), MISSING)
+
+
+class TestControllerResultCache(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "cameras_db.db")
+
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(CREATE_CAMERA_TABLE_QUERY)
+        conn.executemany(
+            "INSERT INTO cameras (brand, model) VALUES (?, ?)",
+            [("Canon", "EOS R6"), ("Nikon", "D750"), ("Sony", "A7 III")],
+        )
+        conn.commit()
+        conn.close()
+
+        self.cache = ResultCache(max_size=16)
+        self.controller = CamerasController(self.db_path, result_cache=self.cache)
+
+    def tearDown(self):
+        self.controller.close()
+        self.tmp_dir.cleanup()
+
+    def test_hits(self):
+        first = self.controller.get_by_fields_like_and({"brand": "Can", "model": "EOS"})
+        second = self.controller.get_by_fields_like_and({"model": "EOS", "brand": "Can"})
+
+        self.assertEqual([camera.model for camera in second], ["EOS R6"])
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+        # Every call gets cameras of its own, changing them leaves the cache alone
+        self.assertIsNot(first[0], second[0])
+        second[0].model = "Changed"
+        second.clear()
+        third = self.controller.get_by_fields_like_and({"brand": "Can", "model": "EOS"})
+        self.assertEqual([camera.model for camera in third], ["EOS R6"])
+        self.assertEqual(first[0].model, "EOS R6")
+
+    def test_invalidated_by_own_writes(self):
+        self.assertEqual(len(self.controller.get_by_field("brand", "Canon")), 1)
+
+        self.controller.cursor.execute("INSERT INTO cameras (brand, model) VALUES ('Canon', 'EOS R5')")
+        self.controller.conn.commit()
+
+        self.assertEqual(len(self.controller.get_by_field("brand", "Canon")), 2)
+
+    def test_invalidated_by_other_connections(self):
+        self.assertEqual(len(self.controller.get_by_field("brand", "Canon")), 1)
+
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("DELETE FROM cameras WHERE brand = 'Canon'")
+        conn.commit()
+        conn.close()
+
+        self.assertEqual(self.controller.get_by_field("brand", "Canon"), [])
+        self.assertEqual(self.cache.stats()["hits"], 0)
+
+    def test_uncommitted_changes_are_not_cached(self):
+        self.controller.cursor.execute("INSERT INTO cameras (brand, model) VALUES ('Canon', 'EOS R5')")
+        self.assertIsNone(self.controller.db_version())
+        self.assertEqual(len(self.controller.get_by_field("brand", "Canon")), 2)
+
+        self.controller.conn.rollback()
+        self.assertEqual(len(self.controller.get_by_field("brand", "Canon")), 1)
+        self.assertEqual(self.cache.stats()["hits"], 0)
+
+    def test_shared_between_controllers(self):
+        other = CamerasController(self.db_path, result_cache=self.cache)
+        try:
+            self.assertEqual(self.controller.db_version(), other.db_version())
+            for controller in (self.controller, other, self.controller, other):
+                self.assertEqual(len(controller.get_by_field("brand", "Canon")), 1)
+            self.assertEqual(self.cache.stats(), {"hits": 3, "misses": 1, "evictions": 0, "size": 1})
+
+            other.cursor.execute("INSERT INTO cameras (brand, model) VALUES ('Canon', 'EOS R5')")
+            other.conn.commit()
+            self.assertEqual(len(self.controller.get_by_field("brand", "Canon")), 2)
+        finally:
+            other.close()
+
+    def test_snapshots_are_keyed_by_source(self):
+        other_path = os.path.join(self.tmp_dir.name, "other.db")
+        conn = sqlite3.connect(other_path)
+        conn.execute(CREATE_CAMERA_TABLE_QUERY)
+        conn.execute("INSERT INTO cameras (brand, model) VALUES ('Canon', 'EOS 5D')")
+        conn.commit()
+        conn.close()
+
+        snapshots = [
+            CamerasController.snapshot(path, result_cache=self.cache) for path in (self.db_path, other_path)
+        ]
+        try:
+            models = [[camera.model for camera in snapshot.get_by_field("brand", "Canon")] for snapshot in snapshots]
+            self.assertEqual(models, [["EOS R6"], ["EOS 5D"]])
+
+            # A snapshot shares the entries of the file it was copied from
+            self.assertEqual(len(self.controller.get_by_field("brand", "Canon")), 1)
+            self.assertEqual(self.cache.stats()["hits"], 1)
+        finally:
+            for snapshot in snapshots:
+                snapshot.close()
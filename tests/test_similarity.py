@@ -0,0 +1,61 @@
+import random
+from unittest import TestCase
+
+from cameras_db.similarity import SpecIndex
+
+
+class TestSpecIndex(TestCase):
+
+    def setUp(self):
+        generator = random.Random(42)
+        self.rows = [
+            [
+                generator.uniform(5, 40),
+                generator.uniform(4, 30),
+                generator.choice([None, generator.randint(1990, 2023)]),
+            ]
+            for _ in range(500)
+        ]
+        self.index = SpecIndex(
+            ("sensor_size_w", "sensor_size_h", "year"),
+            [rowid + 1 for rowid in range(len(self.rows))],
+            [f"camera {rowid}" for rowid in range(len(self.rows))],
+            self.rows,
+        )
+
+    def brute_force(self, values, k, weights, exclude=None):
+        target = self.index.normalize(values)
+        weights = self.index.weights(weights)
+        distances = sorted(
+            (sum(weight * (a - b) ** 2 for weight, a, b in zip(weights, point, target)), position)
+            for position, point in enumerate(self.index.points)
+            if self.index.keys[position] != exclude
+        )
+        return [self.index.ids[position] for _, position in distances[:k]]
+
+    def test_query_matches_brute_force(self):
+        for weights in (None, {"year": 0}, {"sensor_size_w": 4, "sensor_size_h": 0.5}):
+            for position in range(0, len(self.rows), 25):
+                result = self.index.query(self.rows[position], 7, weights, exclude=f"camera {position}")
+                expected = self.brute_force(self.rows[position], 7, weights, exclude=f"camera {position}")
+                self.assertEqual([rowid for _, rowid in result], expected)
+                self.assertNotIn(position + 1, expected)
+
+    def test_query_distances_are_sorted(self):
+        result = self.index.query([20, 15, 2010], 20)
+        distances = [distance for distance, _ in result]
+        self.assertEqual(distances, sorted(distances))
+        self.assertEqual(len(result), 20)
+
+    def test_missing_values_stand_at_the_mean(self):
+        self.assertEqual(self.index.normalize([None, "6,02", None]), (0.0, 0.0, 0.0))
+
+    def test_invalid_weights(self):
+        with self.assertRaises(ValueError):
+            self.index.query([20, 15, 2010], 5, {"weight": 1})
+        with self.assertRaises(ValueError):
+            self.index.query([20, 15, 2010], 5, {"year": -1})
+
+    def test_empty_index(self):
+        index = SpecIndex(("year",), [], [], [])
+        self.assertEqual(index.query([2010], 5), [])